@@ -0,0 +1,52 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from utils import throughput
+
+from torch_uncertainty.layers import BatchConv2d, BatchLinear
+from torch_uncertainty.models.resnet import batched_resnet18, batched_resnet50
+from torch_uncertainty.models.wideresnet import batched_wideresnet28x10
+
+# fmt: on
+models = {
+    "batched_resnet18": batched_resnet18,
+    "batched_resnet50": batched_resnet50,
+    "batched_wideresnet28x10": batched_wideresnet28x10,
+}
+
+
+def use_expanded_forward(model: torch.nn.Module) -> None:
+    """Force the BatchEnsemble layers to expand R, S and the bias."""
+    for module in model.modules():
+        if isinstance(module, (BatchConv2d, BatchLinear)):
+            module.forward = module._expanded_forward
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Throughput of the broadcast BatchEnsemble forward."
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--num-estimators", type=int, default=4)
+    parser.add_argument("--train", action="store_true")
+    args = parser.parse_args()
+
+    inputs = torch.rand(args.batch_size, 3, 32, 32)
+    print("model | expanded (samples/s) | broadcast (samples/s)")
+    for name, factory in models.items():
+        model = factory(
+            in_channels=3,
+            num_estimators=args.num_estimators,
+            groups=1,
+            num_classes=10,
+            style="cifar",
+        ).train(args.train)
+
+        def forward():
+            return model(inputs)
+
+        broadcast = throughput(forward, args.batch_size, warmup=2, repeats=5)
+        use_expanded_forward(model)
+        expanded = throughput(forward, args.batch_size, warmup=2, repeats=5)
+        print(f"{name} | {expanded:.1f} | {broadcast:.1f}")
@@ -0,0 +1,52 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from utils import latency
+
+from torch_uncertainty.models.resnet import batched_resnet18
+from torch_uncertainty.models.wideresnet import batched_wideresnet28x10
+
+# fmt: on
+models = {
+    "batched_resnet18": batched_resnet18,
+    "batched_wideresnet28x10": batched_wideresnet28x10,
+}
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="CPU latency of BatchEnsemble models before and after "
+        "folding their estimators for inference."
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--num-estimators", type=int, default=4)
+    args = parser.parse_args()
+
+    print("model | batch size | latency (ms) | fused latency (ms) | max diff")
+    for name, factory in models.items():
+        model = factory(
+            in_channels=3,
+            num_estimators=args.num_estimators,
+            groups=1,
+            num_classes=10,
+            style="cifar",
+        ).eval()
+        fused = factory(
+            in_channels=3,
+            num_estimators=args.num_estimators,
+            groups=1,
+            num_classes=10,
+            style="cifar",
+        )
+        fused.load_state_dict(model.state_dict())
+        fused.fuse_for_inference()
+
+        for batch_size in args.batch_sizes:
+            inputs = torch.rand(batch_size, 3, 32, 32)
+            with torch.no_grad():
+                diff = (model(inputs) - fused(inputs)).abs().max().item()
+            base = latency(lambda: model(inputs), warmup=2, repeats=5)
+            fast = latency(lambda: fused(inputs), warmup=2, repeats=5)
+            print(
+                f"{name} | {batch_size} | {base:.1f} | {fast:.1f} | {diff:.1e}"
+            )
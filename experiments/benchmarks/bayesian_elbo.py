@@ -0,0 +1,54 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from torch import nn
+from utils import latency
+
+from torch_uncertainty.losses import ELBOLoss
+from torch_uncertainty.models.lenet import bayesian_lenet
+from torch_uncertainty.models.mlp import bayesian_mlp
+
+# fmt: on
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="ELBO training step time vs num_samples of the Bayesian "
+        "LeNet and MLP with the sequential and the vectorized samples."
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument(
+        "--num-samples", type=int, nargs="+", default=[1, 2, 4, 8]
+    )
+    args = parser.parse_args()
+
+    models = {
+        "lenet": (
+            bayesian_lenet(1, 10),
+            torch.rand(args.batch_size, 1, 28, 28),
+        ),
+        "mlp": (
+            bayesian_mlp(784, 10, hidden_dims=[256, 256]),
+            torch.rand(args.batch_size, 784),
+        ),
+    }
+    targets = torch.randint(0, 10, (args.batch_size,))
+    print("model | num_samples | sequential ms/step | vectorized ms/step")
+    for name, (model, inputs) in models.items():
+        for num_samples in args.num_samples:
+            times = []
+            for vectorized in [False, True]:
+                loss = ELBOLoss(
+                    model,
+                    nn.CrossEntropyLoss(),
+                    kl_weight=1 / 50000,
+                    num_samples=num_samples,
+                    vectorized=vectorized,
+                )
+
+                def step():
+                    model.zero_grad()
+                    with torch.enable_grad():
+                        loss(inputs, targets).backward()
+
+                times.append(latency(step))
+            print(f"{name} | {num_samples} | {times[0]:.2f} | {times[1]:.2f}")
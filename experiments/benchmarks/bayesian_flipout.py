@@ -0,0 +1,67 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from bayesian_local_reparameterization import gradient_variance, make_data
+from torch import nn
+from utils import latency
+
+from torch_uncertainty.losses import ELBOLoss
+from torch_uncertainty.models.lenet import bayesian_lenet
+from torch_uncertainty.models.mlp import bayesian_mlp
+
+
+# fmt: on
+def make_model(name: str, estimator: str, sigma_init: float) -> nn.Module:
+    torch.manual_seed(0)
+    kwargs = {
+        "local_reparameterization": estimator == "local",
+        "flipout": estimator == "flipout",
+    }
+    if name == "lenet":
+        return bayesian_lenet(1, 10, sigma_init=sigma_init, **kwargs)
+    return bayesian_mlp(784, 10, hidden_dims=[256, 256], **kwargs)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Gradient variance and ELBO step time of the Bayesian "
+        "LeNet and MLP with the weight-sampling, Flipout and local "
+        "reparameterization estimators."
+    )
+    parser.add_argument("--models", nargs="+", default=["lenet", "mlp"])
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--num-samples", type=int, nargs="+", default=[1, 4])
+    parser.add_argument(
+        "--sigma-init",
+        type=float,
+        default=-3,
+        help="initial posterior rho of the LeNet",
+    )
+    args = parser.parse_args()
+
+    # the closed-form KL isolates the variance of the likelihood estimator
+    print("model | estimator | num_samples | grad variance | ms/step")
+    for name in args.models:
+        inputs, targets = make_data(name, 1, args.batch_size)[0]
+        for estimator in ["weight", "flipout", "local"]:
+            for num_samples in args.num_samples:
+                model = make_model(name, estimator, args.sigma_init)
+                loss = ELBOLoss(
+                    model,
+                    nn.CrossEntropyLoss(),
+                    kl_weight=1 / 50000,
+                    num_samples=num_samples,
+                    analytic_kl=True,
+                )
+
+                def step():
+                    model.zero_grad()
+                    with torch.enable_grad():
+                        loss(inputs, targets).backward()
+
+                variance = gradient_variance(model, loss, inputs, targets)
+                print(
+                    f"{name} | {estimator} | {num_samples} | "
+                    f"{variance:.2e} | {latency(step, repeats=10):.1f}"
+                )
@@ -0,0 +1,73 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from torch import distributions, nn
+from utils import latency
+
+from torch_uncertainty.layers.bayesian.sampler import PriorDistribution
+from torch_uncertainty.losses import ELBOLoss
+from torch_uncertainty.models.lenet import bayesian_lenet
+
+
+# fmt: on
+class UncachedPrior:
+    """Rebuild the mixture prior at each call, as it used to be done."""
+
+    def __enter__(self):
+        self.property = PriorDistribution.distribution
+
+        def distribution(prior):
+            mix = distributions.Categorical(prior.pi)
+            normals = distributions.Normal(prior.mus, prior.sigmas)
+            return distributions.MixtureSameFamily(mix, normals)
+
+        PriorDistribution.distribution = property(distribution)
+
+    def __exit__(self, *args):
+        PriorDistribution.distribution = self.property
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="ELBO training step time of the Bayesian LeNet with the "
+        "Monte-Carlo and the closed-form KL divergence."
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--num-samples", type=int, default=3)
+    parser.add_argument("--prior-pis", type=float, nargs="+", default=[1, 0.5])
+    args = parser.parse_args()
+
+    inputs = torch.rand(args.batch_size, 1, 28, 28)
+    targets = torch.randint(0, 10, (args.batch_size,))
+    print("prior_pi | KL | ms/step | ms/KL evaluation")
+    for prior_pi in args.prior_pis:
+        model = bayesian_lenet(1, 10, prior_pi=prior_pi)
+        configs = [("monte-carlo, uncached prior", False, True)]
+        configs.append(("monte-carlo", False, False))
+        if prior_pi == 1:
+            configs.append(("closed-form", True, False))
+        for name, analytic, uncached in configs:
+            loss = ELBOLoss(
+                model,
+                nn.CrossEntropyLoss(),
+                kl_weight=1 / 50000,
+                num_samples=args.num_samples,
+                analytic_kl=analytic,
+            )
+
+            def step():
+                model.zero_grad()
+                with torch.enable_grad():
+                    loss(inputs, targets).backward()
+
+            def kl():
+                return loss._kl_div()
+
+            model(inputs)
+            if uncached:
+                with UncachedPrior():
+                    times = latency(step), latency(kl)
+            else:
+                times = latency(step), latency(kl)
+            print(f"{prior_pi} | {name} | {times[0]:.2f} | {times[1]:.3f}")
@@ -0,0 +1,132 @@
+# fmt: off
+import time
+from argparse import ArgumentParser
+
+import torch
+from torch import nn, optim
+
+from torch_uncertainty.losses import ELBOLoss
+from torch_uncertainty.models.lenet import bayesian_lenet
+from torch_uncertainty.models.mlp import bayesian_mlp
+
+
+# fmt: on
+def make_model(name: str, local_reparameterization: bool) -> nn.Module:
+    torch.manual_seed(0)
+    if name == "lenet":
+        return bayesian_lenet(
+            1, 10, local_reparameterization=local_reparameterization
+        )
+    return bayesian_mlp(
+        784,
+        10,
+        hidden_dims=[256, 256],
+        local_reparameterization=local_reparameterization,
+    )
+
+
+def make_data(name: str, num_batches: int, batch_size: int):
+    """Synthetic task: the labels are given by a random linear teacher."""
+    torch.manual_seed(1)
+    teacher = torch.randn(784, 10)
+    batches = []
+    for _ in range(num_batches):
+        inputs = torch.rand(batch_size, 784)
+        targets = (inputs - 0.5).matmul(teacher).argmax(-1)
+        if name == "lenet":
+            inputs = inputs.view(batch_size, 1, 28, 28)
+        batches.append((inputs, targets))
+    return batches
+
+
+def gradient_variance(model, loss, inputs, targets, repeats: int = 20):
+    """Total variance of the gradient of the posterior means on one batch."""
+    grads = []
+    for _ in range(repeats):
+        model.zero_grad()
+        loss(inputs, targets).backward()
+        grads.append(
+            torch.cat(
+                [
+                    param.grad.flatten()
+                    for name, param in model.named_parameters()
+                    if name.endswith("weight_mu")
+                ]
+            )
+        )
+    return torch.stack(grads).var(0).sum().item()
+
+
+@torch.no_grad()
+def evaluate(model, batches) -> float:
+    """Cross-entropy of the posterior mean network on held-out batches."""
+    model.freeze()
+    nll = sum(
+        nn.functional.cross_entropy(model(inputs), targets).item()
+        for inputs, targets in batches
+    )
+    model.unfreeze()
+    return nll / len(batches)
+
+
+def train(model, loss, batches, test_batches, budget: float, points: int):
+    """Train for :attr:`budget` seconds and evaluate the held-out NLL
+    :attr:`points` times, excluding the evaluation from the budget.
+    """
+    optimizer = optim.Adam(model.parameters(), lr=1e-3)
+    curve, steps, elapsed = [], 0, 0.0
+    for point in range(1, points + 1):
+        start = time.perf_counter()
+        while elapsed + time.perf_counter() - start < budget * point / points:
+            inputs, targets = batches[steps % len(batches)]
+            optimizer.zero_grad()
+            loss(inputs, targets).backward()
+            optimizer.step()
+            steps += 1
+        elapsed += time.perf_counter() - start
+        curve.append(evaluate(model, test_batches))
+    return curve, steps
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="ELBO convergence vs wall-time of the Bayesian LeNet and "
+        "MLP with and without the local reparameterization."
+    )
+    parser.add_argument("--models", nargs="+", default=["mlp", "lenet"])
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--num-samples", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--budget", type=float, default=10.0)
+    parser.add_argument("--points", type=int, default=4)
+    args = parser.parse_args()
+
+    print(
+        "model | estimator | num_samples | grad variance | steps | "
+        "held-out NLL at regular wall-time intervals"
+    )
+    for name in args.models:
+        batches = make_data(name, 40, args.batch_size)
+        batches, test_batches = batches[:32], batches[32:]
+        for local in [False, True]:
+            for num_samples in args.num_samples:
+                model = make_model(name, local)
+                loss = ELBOLoss(
+                    model,
+                    nn.CrossEntropyLoss(),
+                    kl_weight=1 / 50000,
+                    num_samples=num_samples,
+                )
+                variance = gradient_variance(model, loss, *batches[0])
+                curve, steps = train(
+                    model,
+                    loss,
+                    batches,
+                    test_batches,
+                    args.budget,
+                    args.points,
+                )
+                print(
+                    f"{name} | {'local' if local else 'weight'} | "
+                    f"{num_samples} | {variance:.2e} | {steps} | "
+                    + " ".join(f"{nll:.3f}" for nll in curve)
+                )
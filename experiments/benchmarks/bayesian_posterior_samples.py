@@ -0,0 +1,63 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from utils import latency
+
+from torch_uncertainty.models.lenet import bayesian_lenet
+from torch_uncertainty.models.mlp import bayesian_mlp
+
+
+# fmt: on
+def sequential(model, x, samples, num_samples):
+    """Load each posterior sample in the frozen model and evaluate it."""
+    model.freeze()
+    outs = []
+    for i in range(num_samples):
+        model.load_state_dict(
+            {k + "_mu": v[i] for k, v in samples.items()}, strict=False
+        )
+        outs.append(model(x))
+    model.unfreeze()
+    return torch.stack(outs, dim=1)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Inference latency of S posterior samples of the Bayesian "
+        "LeNet and MLP with the sequential load_state_dict loop and the "
+        "vectorized forward_samples."
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument(
+        "--num-samples", type=int, nargs="+", default=[4, 16, 64]
+    )
+    args = parser.parse_args()
+
+    models = {
+        "lenet": (
+            bayesian_lenet(1, 10),
+            torch.rand(args.batch_size, 1, 32, 32),
+        ),
+        "mlp": (
+            bayesian_mlp(64, 10, hidden_dims=[256, 256]),
+            torch.rand(args.batch_size, 64),
+        ),
+    }
+    print("model | S | loop (ms) | vectorized (ms)")
+    for name, (model, x) in models.items():
+        model.eval()
+        for num_samples in args.num_samples:
+            with torch.no_grad():
+                samples = model.sample_posterior(num_samples)
+            torch.testing.assert_close(
+                sequential(model, x, samples, num_samples).detach(),
+                model.forward_samples(x, samples).detach(),
+            )
+            loop = latency(
+                lambda: sequential(model, x, samples, num_samples), 2, 10
+            )
+            vectorized = latency(
+                lambda: model.forward_samples(x, samples), 2, 10
+            )
+            print(f"{name} | {num_samples} | {loop:.2f} | {vectorized:.2f}")
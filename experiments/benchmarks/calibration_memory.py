@@ -0,0 +1,66 @@
+# fmt: off
+import time
+from argparse import ArgumentParser
+from typing import Tuple
+
+import torch
+from torchmetrics import Metric
+from torchmetrics.classification import MulticlassCalibrationError
+from utils import state_bytes
+
+from torch_uncertainty.metrics import BinnedCalibrationError
+
+
+# fmt: on
+def evaluate(
+    metric: Metric, num_samples: int, args
+) -> Tuple[float, float, float]:
+    generator = torch.Generator().manual_seed(0)
+    start = time.perf_counter()
+    for _ in range(num_samples // args.batch_size):
+        logits = torch.randn(
+            args.batch_size, args.num_classes, generator=generator
+        )
+        targets = torch.randint(
+            args.num_classes, (args.batch_size,), generator=generator
+        )
+        metric.update((logits * 3).softmax(dim=-1), targets)
+    size = state_bytes(metric) / 2**10
+    value = metric.compute().item()
+    elapsed = time.perf_counter() - start
+    return value, elapsed, size
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="State size, update and compute time, and value of the "
+        "ECE buffering the predictions and accumulated in bins, vs the number "
+        "of predictions."
+    )
+    parser.add_argument("--num-classes", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--num-samples",
+        type=int,
+        nargs="+",
+        default=[10000, 100000, 1000000],
+    )
+    args = parser.parse_args()
+
+    metrics = {
+        "torchmetrics": lambda: MulticlassCalibrationError(
+            args.num_classes, n_bins=15
+        ),
+        "binned": lambda: BinnedCalibrationError(num_bins=15),
+        "binned adaptive": lambda: BinnedCalibrationError(
+            num_bins=15, adaptive=True
+        ),
+    }
+    print("metric | predictions | state (KiB) | seconds | ECE")
+    for num_samples in args.num_samples:
+        for name, metric in metrics.items():
+            value, elapsed, size = evaluate(metric(), num_samples, args)
+            print(
+                f"{name} | {num_samples} | {size:.1f} | {elapsed:.2f} | "
+                f"{value:.4f}"
+            )
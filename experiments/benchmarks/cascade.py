@@ -0,0 +1,77 @@
+# fmt: off
+import time
+from argparse import ArgumentParser
+
+import torch
+import torch.nn.functional as F
+from torch.utils.data import TensorDataset
+from torchmetrics.classification import MulticlassCalibrationError
+from utils import count_flops, synthetic_classification, train_mlp
+
+from torch_uncertainty.models import cascade, deep_ensembles
+
+# fmt: on
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Escalated fraction, FLOPs per sample, accuracy, ECE, "
+        "NLL and throughput of a cascade of a small MLP and a Deep Ensembles "
+        "of larger MLPs, calibrated for budgets and target accuracies."
+    )
+    parser.add_argument("--num-estimators", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--num-test", type=int, default=10000)
+    args = parser.parse_args()
+
+    num_classes = 10
+    generator = torch.Generator().manual_seed(1)
+    train = synthetic_classification(20000, num_classes, generator)
+    calibration_set = TensorDataset(
+        *synthetic_classification(5000, num_classes, generator)
+    )
+    inputs, targets = synthetic_classification(
+        args.num_test, num_classes, generator
+    )
+    model = train_mlp(0, *train, num_classes, [64], args.steps)
+    ensemble = deep_ensembles(
+        [
+            train_mlp(seed, *train, num_classes, [256, 256], args.steps)
+            for seed in range(1, args.num_estimators + 1)
+        ]
+    ).eval()
+    casc = cascade(model, ensemble)
+    model_flops = count_flops(model, inputs[:1])
+    ensemble_flops = count_flops(ensemble, inputs[:1])
+
+    configs = [("single", None), ("ensemble", None)]
+    configs += [("budget", b) for b in [0.1, 0.2, 0.3, 0.5]]
+    configs += [("accuracy", a) for a in [0.77, 0.775, 0.78]]
+    print(
+        "mode | target | threshold | escalated | MFLOPs/sample | acc | ECE | "
+        "NLL | samples/s"
+    )
+    for mode, target in configs:
+        threshold = float("nan")
+        if mode == "single":
+            casc.threshold = float("inf")
+        elif mode == "ensemble":
+            casc.threshold = -float("inf")
+        elif mode == "budget":
+            threshold = casc.calibrate(calibration_set, budget=target)
+        else:
+            threshold = casc.calibrate(calibration_set, target_accuracy=target)
+        start = time.perf_counter()
+        with torch.no_grad():
+            probs, escalated = casc.predict(inputs)
+        elapsed = time.perf_counter() - start
+        fraction = escalated.float().mean().item()
+        flops = model_flops + fraction * ensemble_flops
+        if mode == "ensemble":  # the single model is not needed
+            flops = ensemble_flops
+        acc = (probs.argmax(-1) == targets).float().mean()
+        ece = MulticlassCalibrationError(num_classes, n_bins=15)(probs, targets)
+        nll = F.nll_loss(probs.log(), targets)
+        print(
+            f"{mode} | {target} | {threshold:.3f} | {fraction:.3f} | "
+            f"{flops / 1e6:.3f} | {acc:.4f} | {ece:.4f} | {nll:.4f} | "
+            f"{args.num_test / elapsed:.0f}"
+        )
@@ -0,0 +1,78 @@
+# fmt: off
+import time
+from argparse import ArgumentParser
+
+import torch
+from torchmetrics.classification import MulticlassCalibrationError
+from utils import synthetic_classification, train_mlp
+
+from torch_uncertainty.models import deep_ensembles
+
+# fmt: on
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Average members, accuracy, ECE and throughput of the "
+        "anytime inference of a Deep Ensembles of MLPs vs the stopping "
+        "threshold."
+    )
+    parser.add_argument("--num-estimators", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--num-test", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    num_classes = 10
+    generator = torch.Generator().manual_seed(1)
+    train_inputs, train_targets = synthetic_classification(
+        20000, num_classes, generator
+    )
+    test_inputs, test_targets = synthetic_classification(
+        args.num_test, num_classes, generator
+    )
+    de = deep_ensembles(
+        [
+            train_mlp(
+                seed,
+                train_inputs,
+                train_targets,
+                num_classes,
+                [256, 256],
+                args.steps,
+            )
+            for seed in range(args.num_estimators)
+        ]
+    ).eval()
+
+    configs = [("full", None)]
+    configs += [("confidence", t) for t in [0.99, 0.95, 0.9, 0.8]]
+    configs += [("disagreement", t) for t in [0.0, 0.2]]
+    configs += [("mutual_information", t) for t in [0.01, 0.05, 0.1]]
+    print("criterion | threshold | members | acc | ECE | samples/s")
+    batches = list(
+        zip(
+            test_inputs.split(args.batch_size),
+            test_targets.split(args.batch_size),
+        )
+    )
+    for criterion, threshold in configs:
+        ece = MulticlassCalibrationError(num_classes, n_bins=15)
+        correct, members = 0, 0
+        start = time.perf_counter()
+        with torch.no_grad():
+            for inputs, targets in batches:
+                if criterion == "full":
+                    probs = de(inputs).softmax(-1).mean(1)
+                    counts = torch.full_like(targets, args.num_estimators)
+                else:
+                    probs, counts = de.anytime_forward(
+                        inputs, criterion, threshold
+                    )
+                ece.update(probs, targets)
+                correct += (probs.argmax(-1) == targets).sum().item()
+                members += counts.sum().item()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{criterion} | {threshold} | {members / args.num_test:.2f} | "
+            f"{correct / args.num_test:.4f} | {ece.compute():.4f} | "
+            f"{args.num_test / elapsed:.0f}"
+        )
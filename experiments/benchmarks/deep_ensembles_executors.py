@@ -0,0 +1,57 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from utils import latency
+
+from torch_uncertainty.models import deep_ensembles
+from torch_uncertainty.models.mlp import mlp
+from torch_uncertainty.models.resnet import resnet18
+
+# fmt: on
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Latency and throughput of the Deep Ensembles executors "
+        "across member and core counts."
+    )
+    parser.add_argument(
+        "--num-estimators", type=int, nargs="+", default=[2, 4, 8]
+    )
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        nargs="+",
+        default=[torch.get_num_threads()],
+        help="total intra-op thread budgets",
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32])
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    backbones = {
+        "resnet18": (lambda: resnet18(3, 10, style="cifar"), (3, 32, 32)),
+        "mlp": (lambda: mlp(784, 10, hidden_dims=[256, 256]), (784,)),
+    }
+    print("backbone | M | threads | batch | executor | ms/batch | samples/s")
+    for name, (backbone, shape) in backbones.items():
+        for num_estimators in args.num_estimators:
+            models = [backbone() for _ in range(num_estimators)]
+            for num_threads in args.num_threads:
+                torch.set_num_threads(num_threads)
+                for executor in ["sequential", "threads", "processes"]:
+                    de = deep_ensembles(
+                        models,
+                        executor=executor,
+                        num_threads=max(1, num_threads // num_estimators),
+                    ).eval()
+                    for batch_size in args.batch_sizes:
+                        inputs = torch.rand(batch_size, *shape)
+                        time = latency(
+                            lambda: de(inputs), warmup=2, repeats=args.repeats
+                        )
+                        print(
+                            f"{name} | {num_estimators} | {num_threads} | "
+                            f"{batch_size} | {executor} | {time:.2f} | "
+                            f"{1000 * batch_size / time:.0f}"
+                        )
+                    de.close()
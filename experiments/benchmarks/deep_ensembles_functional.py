@@ -0,0 +1,54 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from utils import throughput
+
+from torch_uncertainty.models import deep_ensembles
+from torch_uncertainty.models.mlp import mlp
+from torch_uncertainty.models.resnet import resnet18
+
+# fmt: on
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Throughput of the Deep Ensembles with the loop over the "
+        "members and with the functional (vectorized) forward."
+    )
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument(
+        "--num-estimators", type=int, nargs="+", default=[2, 4, 8]
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    backbones = {
+        "resnet18": (
+            lambda: resnet18(3, 10, style="cifar"),
+            torch.rand(args.batch_size, 3, 32, 32),
+        ),
+        "mlp": (
+            lambda: mlp(784, 10, hidden_dims=[256, 256]),
+            torch.rand(args.batch_size, 784),
+        ),
+    }
+    print("backbone | M | loop samples/s | functional samples/s")
+    for name, (backbone, inputs) in backbones.items():
+        for num_estimators in args.num_estimators:
+            de = deep_ensembles(
+                [backbone() for _ in range(num_estimators)], functional=True
+            ).eval()
+            results = []
+            for functional in [False, True]:
+                de.functional = functional
+                results.append(
+                    throughput(
+                        lambda: de(inputs),
+                        args.batch_size,
+                        warmup=2,
+                        repeats=args.repeats,
+                    )
+                )
+            print(
+                f"{name} | {num_estimators} | {results[0]:.0f} | "
+                f"{results[1]:.0f}"
+            )
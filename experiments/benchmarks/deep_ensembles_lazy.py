@@ -0,0 +1,100 @@
+# fmt: off
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import SUPPRESS, ArgumentParser
+from pathlib import Path
+
+import torch
+
+from torch_uncertainty.models import deep_ensembles, lazy_deep_ensembles
+from torch_uncertainty.models.resnet import resnet18
+from torch_uncertainty.utils import checkpoint_to_mmap
+
+
+# fmt: on
+def evaluate(mode: str, root: Path, num_estimators: int, args) -> None:
+    """Evaluate the ensemble on a synthetic test set and print the wall-time
+    and the peak RSS of the process.
+    """
+    torch.manual_seed(0)
+    batches = [
+        torch.rand(args.batch_size, 3, 32, 32) for _ in range(args.num_batches)
+    ]
+    checkpoints = [root / f"member_{i}.ckpt" for i in range(num_estimators)]
+    start = time.perf_counter()
+    with torch.no_grad():
+        if mode == "eager":
+            models = []
+            for checkpoint in checkpoints:
+                model = resnet18(3, 10, style="cifar")
+                state_dict = torch.load(checkpoint, map_location="cpu")
+                model.load_state_dict(
+                    {k[6:]: v for k, v in state_dict["state_dict"].items()}
+                )
+                models.append(model)
+            de = deep_ensembles(models).eval()
+            probs = torch.cat([de(batch).softmax(-1) for batch in batches])
+        else:
+            de = lazy_deep_ensembles(
+                resnet18(3, 10, style="cifar"),
+                [checkpoint_to_mmap(checkpoint) for checkpoint in checkpoints],
+                max_resident=args.max_resident,
+            )
+            probs = de.predict(
+                batches, root / "probs.npy", len(batches) * args.batch_size
+            )
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode} | {num_estimators} | {elapsed:.2f} | {peak:.0f}")
+    assert probs.numel() == num_estimators * len(batches) * args.batch_size * 10
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Peak RSS and wall-time of the evaluation of eager and "
+        "lazy Deep Ensembles of ResNet-18 vs the number of members."
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--num-batches", type=int, default=8)
+    parser.add_argument(
+        "--num-estimators", type=int, nargs="+", default=[2, 4, 8, 16]
+    )
+    parser.add_argument("--max-resident", type=int, default=1)
+    parser.add_argument("--worker", nargs=3, help=SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        mode, root, num_estimators = args.worker
+        evaluate(mode, Path(root), int(num_estimators), args)
+        sys.exit()
+
+    with tempfile.TemporaryDirectory() as root:
+        for i in range(max(args.num_estimators)):
+            model = resnet18(3, 10, style="cifar")
+            torch.save(
+                {
+                    "state_dict": {
+                        f"model.{k}": v for k, v in model.state_dict().items()
+                    }
+                },
+                Path(root) / f"member_{i}.ckpt",
+            )
+        print("mode | M | seconds | peak RSS (MiB)")
+        for num_estimators in args.num_estimators:
+            for mode in ["eager", "lazy"]:
+                # one process per run to measure its own peak RSS
+                subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        *sys.argv[1:],
+                        "--worker",
+                        mode,
+                        root,
+                        str(num_estimators),
+                    ],
+                    check=True,
+                )
@@ -0,0 +1,68 @@
+# fmt: off
+import contextlib
+import io
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+import torch
+import yaml
+
+from torch_uncertainty.baselines import DeepEnsembles
+from torch_uncertainty.models.resnet import resnet18
+
+
+# fmt: on
+def write_logs(root: Path, num_estimators: int) -> None:
+    """Write Lightning-like checkpoints and hparams of ResNet-18 members."""
+    hparams = {
+        "num_classes": 10,
+        "in_channels": 3,
+        "version": "vanilla",
+        "arch": 18,
+        "style": "cifar",
+    }
+    for version in range(num_estimators):
+        folder = root / f"version_{version}" / "checkpoints"
+        folder.mkdir(parents=True)
+        model = resnet18(3, 10, style="cifar")
+        state_dict = {f"model.{k}": v for k, v in model.state_dict().items()}
+        torch.save({"state_dict": state_dict}, folder / "epoch=0-step=1.ckpt")
+        with open(root / f"version_{version}" / "hparams.yaml", "w") as f:
+            yaml.dump(hparams, f)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Construction time of the Deep Ensembles baseline of "
+        "ResNet-18 with the LightningModule and the state-dict loaders."
+    )
+    parser.add_argument(
+        "--num-estimators", type=int, nargs="+", default=[4, 8, 16]
+    )
+    parser.add_argument("--load-threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    print("M | loader | threads | seconds")
+    for num_estimators in args.num_estimators:
+        with tempfile.TemporaryDirectory() as root:
+            write_logs(Path(root), num_estimators)
+            configs = [("lightning", False, None)] + [
+                ("state dict", True, threads) for threads in args.load_threads
+            ]
+            for name, fast_load, threads in configs:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    DeepEnsembles(
+                        task="classification",
+                        log_path=root,
+                        checkpoint_ids=list(range(num_estimators)),
+                        backbone="resnet",
+                        in_channels=3,
+                        num_classes=10,
+                        fast_load=fast_load,
+                        load_threads=threads,
+                    )
+                elapsed = time.perf_counter() - start
+                print(f"{num_estimators} | {name} | {threads} | {elapsed:.2f}")
@@ -0,0 +1,114 @@
+# fmt: off
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+
+import pytorch_lightning as pl
+import torch
+from torch import nn, optim
+from torch.utils.data import DataLoader, TensorDataset
+from utils import synthetic_classification, train_mlp
+
+from torch_uncertainty.models import deep_ensembles
+from torch_uncertainty.models.mlp import mlp
+from torch_uncertainty.routines.classification import ClassificationSingle
+from torch_uncertainty.routines.distillation import (
+    ClassificationDistillation,
+    cache_teacher_targets,
+)
+
+
+# fmt: on
+def adam(model: nn.Module):
+    return optim.Adam(model.parameters(), lr=1e-3)
+
+
+def fit_and_test(routine, train_loader, test_loader, epochs: int):
+    """Train the routine and return its training time and test metrics."""
+    trainer = pl.Trainer(
+        max_epochs=epochs,
+        logger=False,
+        enable_checkpointing=False,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+        num_sanity_val_steps=0,
+    )
+    start = time.perf_counter()
+    trainer.fit(routine, train_loader)
+    elapsed = time.perf_counter() - start
+    (metrics,) = trainer.test(routine, test_loader, verbose=False)
+    return elapsed, metrics
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Training time and test metrics of an MLP trained on the "
+        "labels and distilled from a Deep Ensembles of MLPs, with the teacher "
+        "run online and cached on disk."
+    )
+    parser.add_argument("--num-estimators", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--epochs", type=int, default=5)
+    args = parser.parse_args()
+
+    num_classes = 10
+    generator = torch.Generator().manual_seed(1)
+    train = TensorDataset(
+        *synthetic_classification(20000, num_classes, generator)
+    )
+    test = TensorDataset(
+        *synthetic_classification(10000, num_classes, generator)
+    )
+    test_loader = DataLoader(test, batch_size=500)
+    teacher = deep_ensembles(
+        [
+            train_mlp(seed, *train.tensors, num_classes, [256, 256], args.steps)
+            for seed in range(1, args.num_estimators + 1)
+        ]
+    ).eval()
+    teacher_routine = ClassificationSingle(
+        num_classes, nn.Identity(), nn.CrossEntropyLoss, adam
+    )
+    teacher_routine.forward = lambda x: teacher(x).softmax(-1).mean(1).log()
+    (metrics,) = pl.Trainer(logger=False, enable_progress_bar=False).test(
+        teacher_routine, test_loader, verbose=False
+    )
+
+    def report(name: str, elapsed: float, metrics) -> None:
+        print(
+            f"{name} | {elapsed:.1f} | {metrics['hp/test_acc']:.4f} | "
+            f"{metrics['hp/test_nll']:.4f} | {metrics['hp/test_ece']:.4f} | "
+            f"{metrics['hp/test_brier']:.4f}"
+        )
+
+    print("model | train s | acc | NLL | ECE | Brier")
+    report("teacher", float("nan"), metrics)
+    with tempfile.TemporaryDirectory() as root:
+        configs = [
+            ("labels", None, {"distill_weight": 0.0}),
+            ("probs online", None, {}),
+            ("probs cached", "probs", {}),
+            ("logits cached", "logits", {"matching": "logits"}),
+        ]
+        for name, cached, kwargs in configs:
+            torch.manual_seed(0)
+            routine = ClassificationDistillation(
+                num_classes=num_classes,
+                model=mlp(32, num_classes, hidden_dims=[256, 256]),
+                teacher=teacher,
+                loss=nn.CrossEntropyLoss,
+                optimization_procedure=adam,
+                **kwargs,
+            )
+            start = time.perf_counter()
+            dataset = train
+            if cached is not None:
+                dataset = cache_teacher_targets(
+                    teacher, train, Path(root) / f"{name}.npy", matching=cached
+                )
+            loader = DataLoader(dataset, batch_size=128, shuffle=True)
+            elapsed, metrics = fit_and_test(
+                routine, loader, test_loader, args.epochs
+            )
+            report(name, time.perf_counter() - start, metrics)
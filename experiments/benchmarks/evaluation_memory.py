@@ -0,0 +1,100 @@
+# fmt: off
+import resource
+import subprocess
+import sys
+import time
+from argparse import SUPPRESS, ArgumentParser
+
+import pytorch_lightning as pl
+import torch
+from torch import nn
+from torch.utils.data import DataLoader, TensorDataset
+
+from torch_uncertainty.routines.classification import ClassificationEnsemble
+
+
+# fmt: on
+class RandomEnsemble(nn.Module):
+    """Return random logits of shape (B, N, C)."""
+
+    def __init__(self, num_estimators: int, num_classes: int) -> None:
+        super().__init__()
+        self.num_estimators = num_estimators
+        self.num_classes = num_classes
+        self.dummy = nn.Linear(1, 1)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return torch.randn(x.size(0), self.num_estimators, self.num_classes)
+
+
+class RetainingEnsemble(ClassificationEnsemble):
+    """The former behaviour: the test step returns the logits, which
+    Lightning keeps until the end of the epoch.
+    """
+
+    def test_step(self, batch, batch_idx, dataloader_idx=0):
+        super().test_step(batch, batch_idx, dataloader_idx)
+        return self.forward(batch[0])
+
+
+def evaluate(mode: str, num_samples: int, args) -> None:
+    routine = (
+        RetainingEnsemble if mode == "retained" else ClassificationEnsemble
+    )(
+        num_classes=args.num_classes,
+        model=RandomEnsemble(args.num_estimators, args.num_classes),
+        loss=nn.CrossEntropyLoss,
+        optimization_procedure=None,
+        num_estimators=args.num_estimators,
+        ood_detection=True,
+    )
+    dataset = TensorDataset(
+        torch.zeros(num_samples, 1),
+        torch.randint(args.num_classes, (num_samples,)),
+    )
+    loaders = [DataLoader(dataset, batch_size=args.batch_size)] * 2
+    trainer = pl.Trainer(
+        logger=False, enable_progress_bar=False, enable_model_summary=False
+    )
+    start = time.perf_counter()
+    trainer.test(routine, loaders, verbose=False)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode} | {num_samples} | {elapsed:.1f} | {peak:.0f}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Peak RSS of the test loop of ClassificationEnsemble with "
+        "OOD detection, retaining the logits of the test steps or streaming "
+        "the histograms, vs the number of test samples."
+    )
+    parser.add_argument("--num-classes", type=int, default=1000)
+    parser.add_argument("--num-estimators", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument(
+        "--num-samples", type=int, nargs="+", default=[5000, 10000, 20000]
+    )
+    parser.add_argument("--worker", nargs=2, help=SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        mode, num_samples = args.worker
+        evaluate(mode, int(num_samples), args)
+        sys.exit()
+
+    print("mode | samples per set | seconds | peak RSS (MiB)")
+    for num_samples in args.num_samples:
+        for mode in ["retained", "streamed"]:
+            # one process per run to measure its own peak RSS
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    *sys.argv[1:],
+                    "--worker",
+                    mode,
+                    str(num_samples),
+                ],
+                check=True,
+            )
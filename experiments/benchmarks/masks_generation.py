@@ -0,0 +1,39 @@
+# fmt: off
+import time
+from argparse import ArgumentParser
+
+from torch_uncertainty.models.resnet import masked_resnet50
+from torch_uncertainty.models.wideresnet import masked_wideresnet28x10
+
+# fmt: on
+models = {
+    "masked_resnet50": masked_resnet50,
+    "masked_wideresnet28x10": masked_wideresnet28x10,
+}
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Construction time of the Masksembles models with and "
+        "without the seeded masks cache. Set TORCH_UNCERTAINTY_CACHE to an "
+        "empty folder to measure a cold cache."
+    )
+    parser.add_argument("--num-estimators", type=int, default=4)
+    parser.add_argument("--scale", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("model | unseeded (s) | seeded, 1st (s) | seeded, 2nd (s)")
+    for name, factory in models.items():
+        timings = []
+        for seed in [None, args.seed, args.seed]:
+            start = time.perf_counter()
+            factory(
+                in_channels=3,
+                num_estimators=args.num_estimators,
+                scale=args.scale,
+                groups=1,
+                num_classes=10,
+                seed=seed,
+            )
+            timings.append(time.perf_counter() - start)
+        print(f"{name} | " + " | ".join(f"{t:.2f}" for t in timings))
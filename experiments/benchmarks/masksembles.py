@@ -0,0 +1,48 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from utils import count_ops, throughput
+
+from torch_uncertainty.layers import MaskedConv2d
+
+# fmt: on
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Copies per forward and throughput of MaskedConv2d."
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--num-estimators", type=int, default=4)
+    parser.add_argument("--channels", type=int, default=256)
+    parser.add_argument("--size", type=int, default=16)
+    parser.add_argument("--scales", type=float, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    inputs = torch.rand(
+        args.batch_size * args.num_estimators,
+        args.channels,
+        args.size,
+        args.size,
+    )
+    print("scale | density | mode | copies/forward | samples/s")
+    for scale in args.scales:
+        layer = MaskedConv2d(
+            args.channels,
+            args.channels,
+            kernel_size=3,
+            padding=1,
+            num_estimators=args.num_estimators,
+            scale=scale,
+        )
+        density = layer.mask.masks.mean().item()
+        for sparse in [False, True]:
+            layer.sparse = sparse
+
+            def forward():
+                return layer(inputs)
+
+            print(
+                f"{scale} | {density:.2f} | "
+                f"{'sparse' if sparse else 'dense'} | {count_ops(forward)} | "
+                f"{throughput(forward, inputs.size(0)):.0f}"
+            )
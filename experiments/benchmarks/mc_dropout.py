@@ -0,0 +1,62 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from utils import latency
+
+from torch_uncertainty.models import mc_dropout
+from torch_uncertainty.models.mlp import mlp
+from torch_uncertainty.models.resnet import resnet18
+from torch_uncertainty.models.utils import toggle_dropout
+from torch_uncertainty.models.vgg.std import vgg11
+
+# fmt: on
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Inference latency of Monte-Carlo Dropout with the "
+        "repeated input and with the cached deterministic prefix."
+    )
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--num-estimators", type=int, nargs="+", default=[10])
+    args = parser.parse_args()
+
+    backbones = {
+        "resnet18": (
+            lambda: resnet18(3, 10, dropout_rate=0.1, style="cifar"),
+            torch.rand(args.batch_size, 3, 32, 32),
+        ),
+        "vgg11": (
+            lambda: vgg11(3, 10, style="cifar"),
+            torch.rand(args.batch_size, 3, 32, 32),
+        ),
+        "mlp": (
+            lambda: mlp(784, 10, hidden_dims=[512, 512], dropout=0.1),
+            torch.rand(args.batch_size, 784),
+        ),
+    }
+    print("backbone | T | dropout | repeated ms | prefix-cached ms")
+    for name, (backbone, inputs) in backbones.items():
+        model = backbone().eval()
+        single = latency(lambda: model(inputs), warmup=2, repeats=5)
+        print(f"{name} | 1 | none | {single:.1f} | -")
+        for num_estimators in args.num_estimators:
+            for last_layer_dropout in [False, True]:
+                repeats = [num_estimators] + [1] * (inputs.dim() - 1)
+
+                def repeated():
+                    return model(inputs.repeat(*repeats))
+
+                toggle_dropout(model, last_layer_dropout)
+                repeated_ms = latency(repeated, warmup=2, repeats=5)
+                toggle_dropout(model, enable=False)
+                mc_model = mc_dropout(
+                    model, num_estimators, last_layer_dropout
+                ).eval()
+                cached_ms = latency(
+                    lambda: mc_model(inputs), warmup=2, repeats=5
+                )
+                print(
+                    f"{name} | {num_estimators} | "
+                    f"{'last' if last_layer_dropout else 'all'} | "
+                    f"{repeated_ms:.1f} | {cached_ms:.1f}"
+                )
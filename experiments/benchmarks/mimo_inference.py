@@ -0,0 +1,56 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from einops import rearrange
+from utils import count_ops, latency
+
+from torch_uncertainty.models.resnet import mimo_resnet50
+from torch_uncertainty.models.utils import mimo_shared_input_conv
+
+
+# fmt: on
+def repeated_input_conv(model, x):
+    """First convolution on the repeated and rearranged input, as it used to
+    be done at inference.
+    """
+    x = x.repeat(model.num_estimators, 1, 1, 1)
+    x = rearrange(x, "(m b) c h w -> b (m c) h w", m=model.num_estimators)
+    return model.conv1(x)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Inference latency of the first convolution and of the "
+        "whole MIMO ResNet-50 with the repeated and the shared input."
+    )
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--num-estimators", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--size", type=int, default=224)
+    args = parser.parse_args()
+
+    inputs = torch.rand(args.batch_size, 3, args.size, args.size)
+    print("M | input | copies | conv1 ms | model ms")
+    for num_estimators in args.num_estimators:
+        model = mimo_resnet50(3, 1000, num_estimators).eval()
+        for name, first_conv in [
+            ("repeated", lambda x: repeated_input_conv(model, x)),
+            (
+                "shared",
+                lambda x: mimo_shared_input_conv(
+                    model.conv1, x, num_estimators
+                ),
+            ),
+        ]:
+
+            def forward():
+                out = model._forward_after_conv1(first_conv(inputs))
+                return rearrange(out, "b (m d) -> (m b) d", m=num_estimators)
+
+            copies = count_ops(lambda: first_conv(inputs))
+            conv_ms = latency(lambda: first_conv(inputs))
+            model_ms = latency(forward, warmup=2, repeats=5)
+            print(
+                f"{num_estimators} | {name} | {copies} | {conv_ms:.1f} | "
+                f"{model_ms:.0f}"
+            )
@@ -0,0 +1,76 @@
+# fmt: off
+import time
+from argparse import ArgumentParser
+from typing import Dict, Tuple
+
+import torch
+from torchmetrics import MetricCollection
+from torchmetrics.classification import BinaryAUROC, BinaryAveragePrecision
+from utils import state_bytes
+
+from torch_uncertainty.metrics import FPR95, BinnedOODCurve, OODCurve
+
+
+# fmt: on
+def evaluate(
+    metrics: MetricCollection, num_samples: int, args
+) -> Tuple[Dict[str, float], float, float]:
+    """Stream ID and OOD MSP scores, half of each, into :attr:`metrics`."""
+    generator = torch.Generator().manual_seed(0)
+    for start in range(0, num_samples, args.batch_size):
+        ood = start >= num_samples // 2
+        logits = torch.randn(args.batch_size, 2, generator=generator)
+        logits[:, 0] += 2 if ood else 4
+        values = -logits.softmax(dim=-1).max(dim=-1)[0]
+        metrics.update(values, torch.full_like(values, ood, dtype=torch.long))
+    size = sum(state_bytes(metric) for metric in metrics.values()) / 2**20
+    start = time.perf_counter()
+    results = {name: value.item() for name, value in metrics.compute().items()}
+    return results, time.perf_counter() - start, size
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="State size, compute time and values of the FPR95, AUROC "
+        "and AUPR computed exactly by separate metrics and from one curve, "
+        "and approximated from histograms, vs the number of samples."
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--num-bins", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument(
+        "--num-samples",
+        type=int,
+        nargs="+",
+        default=[100000, 1000000, 4000000],
+    )
+    args = parser.parse_args()
+
+    configs = {
+        "separate": lambda: MetricCollection(
+            {
+                "fpr95": FPR95(pos_label=1),
+                "auroc": BinaryAUROC(),
+                "aupr": BinaryAveragePrecision(),
+            },
+            compute_groups=[["auroc", "aupr"], ["fpr95"]],
+        ),
+        "curve": lambda: MetricCollection({"ood": OODCurve()}),
+    }
+    for num_bins in args.num_bins:
+        configs[f"{num_bins} bins"] = lambda num_bins=num_bins: (
+            MetricCollection({"ood": BinnedOODCurve(num_bins, -1, 0)})
+        )
+
+    print(
+        "metrics | samples | state (MiB) | compute (s) | FPR95 | AUROC | AUPR"
+    )
+    for num_samples in args.num_samples:
+        for name, config in configs.items():
+            results, elapsed, size = evaluate(config(), num_samples, args)
+            print(
+                f"{name} | {num_samples} | {size:.2f} | {elapsed:.3f} | "
+                f"{results['fpr95']:.5f} | {results['auroc']:.5f} | "
+                f"{results['aupr']:.5f}"
+            )
@@ -0,0 +1,56 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+import torch.nn.functional as F
+from utils import latency
+
+from torch_uncertainty.metrics import (
+    MutualInformation,
+    VariationRatio,
+    ood_scores,
+)
+
+
+# fmt: on
+def separate(logits: torch.Tensor) -> dict:
+    """The OOD criteria computed one per test pass, as the former
+    ClassificationEnsemble.test_step, with a softmax and metric objects
+    for each.
+    """
+    scores = {}
+    probs_per_est = F.softmax(logits, dim=-1)
+    scores["msp"] = -probs_per_est.mean(dim=1).max(-1)[0]
+    scores["logit"] = -logits.mean(dim=1).max(dim=-1)[0]
+    probs_per_est = F.softmax(logits, dim=-1)
+    scores["expected_entropy"] = (
+        torch.special.entr(probs_per_est).sum(dim=-1).mean(dim=1)
+    )
+    probs_per_est = F.softmax(logits, dim=-1)
+    scores["mutual_information"] = MutualInformation(reduction="none")(
+        probs_per_est
+    )
+    probs_per_est = F.softmax(logits, dim=-1)
+    scores["variation_ratio"] = VariationRatio(
+        reduction="none", probabilistic=False
+    )(probs_per_est.transpose(0, 1))
+    return scores
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Latency of the computation of the OOD criteria of an "
+        "ensemble batch, one criterion at a time and fused."
+    )
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--num-estimators", type=int, default=4)
+    parser.add_argument("--num-classes", type=int, nargs="+", default=[10, 100])
+    args = parser.parse_args()
+
+    print("C | separate (ms) | fused (ms)")
+    for num_classes in args.num_classes:
+        logits = torch.randn(args.batch_size, args.num_estimators, num_classes)
+        print(
+            f"{num_classes} | {latency(lambda: separate(logits)):.3f} | "
+            f"{latency(lambda: ood_scores(logits)):.3f}"
+        )
@@ -0,0 +1,37 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from utils import count_ops, throughput
+
+from torch_uncertainty.models.mlp import packed_mlp
+
+# fmt: on
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Copies per forward and throughput of the packed layout."
+    )
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--num-estimators", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--width", type=int, default=256)
+    args = parser.parse_args()
+
+    inputs = torch.rand(args.batch_size, args.width)
+    print("packed_layout | copies/forward | samples/s")
+    for packed_layout in [False, True]:
+        model = packed_mlp(
+            args.width,
+            10,
+            hidden_dims=[args.width] * args.depth,
+            num_estimators=args.num_estimators,
+            packed_layout=packed_layout,
+        ).eval()
+
+        def forward():
+            return model(inputs)
+
+        print(
+            f"{str(packed_layout):>13} | {count_ops(forward):>14} | "
+            f"{throughput(forward, args.batch_size):.0f}"
+        )
@@ -0,0 +1,55 @@
+# fmt: off
+from argparse import ArgumentParser
+
+import torch
+from utils import throughput
+
+from torch_uncertainty.models import deep_ensembles
+from torch_uncertainty.models.resnet import (
+    packed_resnet_from_ensemble,
+    resnet18,
+)
+
+# fmt: on
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        description="Throughput of the Deep Ensembles of ResNet-18 with the "
+        "loop over the members and converted to a Packed-Ensembles ResNet."
+    )
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument(
+        "--num-estimators", type=int, nargs="+", default=[2, 4, 8]
+    )
+    parser.add_argument("--style", default="cifar")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    size = 32 if args.style == "cifar" else 224
+    inputs = torch.rand(args.batch_size, 3, size, size)
+    print("M | loop samples/s | packed samples/s | max abs. difference")
+    for num_estimators in args.num_estimators:
+        members = [
+            resnet18(3, 10, style=args.style).eval()
+            for _ in range(num_estimators)
+        ]
+        de = deep_ensembles(members).eval()
+        packed = packed_resnet_from_ensemble(members)
+        with torch.no_grad():
+            difference = (
+                (packed(inputs) - de(inputs).transpose(0, 1).flatten(0, 1))
+                .abs()
+                .max()
+            )
+        results = [
+            throughput(
+                lambda: model(inputs),
+                args.batch_size,
+                warmup=2,
+                repeats=args.repeats,
+            )
+            for model in [de, packed]
+        ]
+        print(
+            f"{num_estimators} | {results[0]:.0f} | {results[1]:.0f} | "
+            f"{difference:.1e}"
+        )
@@ -0,0 +1,137 @@
+# fmt: off
+import time
+from typing import Callable, List, Tuple
+
+import torch
+import torch.nn.functional as F
+from torch.profiler import ProfilerActivity, profile
+from torchmetrics import Metric
+
+from torch_uncertainty.models.mlp import mlp
+
+
+# fmt: on
+@torch.no_grad()
+def throughput(
+    fn: Callable[[], torch.Tensor],
+    batch_size: int,
+    warmup: int = 5,
+    repeats: int = 20,
+) -> float:
+    """Measure the number of samples processed per second by :attr:`fn`.
+
+    Args:
+        fn (Callable): Closure running one forward pass.
+        batch_size (int): Number of samples processed by each call.
+        warmup (int, optional): Number of untimed calls. Defaults to ``5``.
+        repeats (int, optional): Number of timed calls. Defaults to ``20``.
+
+    Returns:
+        float: The throughput in samples/s.
+    """
+    for _ in range(warmup):
+        fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return batch_size * repeats / (time.perf_counter() - start)
+
+
+@torch.no_grad()
+def latency(
+    fn: Callable[[], torch.Tensor], warmup: int = 5, repeats: int = 20
+) -> float:
+    """Measure the mean wall-clock time of a call to :attr:`fn` in ms."""
+    for _ in range(warmup):
+        fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return 1000 * (time.perf_counter() - start) / repeats
+
+
+@torch.no_grad()
+def count_ops(
+    fn: Callable[[], torch.Tensor],
+    names: Tuple[str, ...] = ("aten::copy_", "aten::cat"),
+) -> int:
+    """Count the calls to the operators :attr:`names` during a call to
+    :attr:`fn`, by default the number of materialized copies.
+    """
+    with profile(activities=[ProfilerActivity.CPU]) as prof:
+        fn()
+    return sum(evt.count for evt in prof.key_averages() if evt.key in names)
+
+
+def synthetic_classification(
+    num_samples: int, num_classes: int, generator: torch.Generator
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Noisy Gaussian clusters in 32 dimensions with a random noise level
+    per sample: most samples are easy, some overlap the other classes.
+    """
+    centers = torch.randn(
+        num_classes, 32, generator=torch.Generator().manual_seed(0)
+    )
+    targets = torch.randint(num_classes, (num_samples,), generator=generator)
+    noise = torch.randn(num_samples, 32, generator=generator)
+    scale = torch.rand(num_samples, 1, generator=generator) * 4
+    return centers[targets] + scale * noise, targets
+
+
+def train_mlp(
+    seed: int,
+    inputs: torch.Tensor,
+    targets: torch.Tensor,
+    num_classes: int,
+    hidden_dims: List[int],
+    steps: int,
+) -> torch.nn.Module:
+    """Train an MLP with Adam on mini-batches of 128 samples."""
+    torch.manual_seed(seed)
+    model = mlp(inputs.size(-1), num_classes, hidden_dims=hidden_dims)
+    optimizer = torch.optim.Adam(model.parameters(), lr=1e-3)
+    for _ in range(steps):
+        index = torch.randint(inputs.size(0), (128,))
+        loss = F.cross_entropy(model(inputs[index]), targets[index])
+        optimizer.zero_grad()
+        loss.backward()
+        optimizer.step()
+    return model.eval()
+
+
+@torch.no_grad()
+def count_flops(model: torch.nn.Module, x: torch.Tensor) -> float:
+    """Count the FLOPs per sample of the convolutions and linear layers of
+    :attr:`model` on :attr:`x`, as twice their multiply-accumulates.
+    """
+    flops = 0
+
+    def hook(module, inputs, output):
+        nonlocal flops
+        if isinstance(module, torch.nn.Linear):
+            flops += 2 * output.numel() * module.in_features
+        else:
+            kernel = module.weight[0].numel()
+            flops += 2 * output.numel() * kernel
+
+    handles = [
+        module.register_forward_hook(hook)
+        for module in model.modules()
+        if isinstance(module, (torch.nn.Linear, torch.nn.modules.conv._ConvNd))
+    ]
+    try:
+        model(x)
+    finally:
+        for handle in handles:
+            handle.remove()
+    return flops / x.size(0)
+
+
+def state_bytes(metric: Metric) -> int:
+    """The size of the states of :attr:`metric`, including the buffers."""
+    size = 0
+    for name in metric._defaults:
+        value = getattr(metric, name)
+        values = value if isinstance(value, list) else [value]
+        size += sum(v.numel() * v.element_size() for v in values)
+    return size
@@ -1,6 +1,7 @@
 # fmt:off
 import pytest
 import torch
+from torch import nn
 
 from torch_uncertainty.layers.batch_ensemble import BatchConv2d, BatchLinear
 
@@ -37,6 +38,25 @@ class TestBatchLinear:
         out = layer(feat_input)
         assert out.shape == torch.Size([4, 2])
 
+    def test_linear_broadcast_matches_expanded(self, feat_input: torch.Tensor):
+        layer = BatchLinear(6, 2, num_estimators=2)
+        assert torch.allclose(
+            layer(feat_input), layer._expanded_forward(feat_input), atol=1e-6
+        )
+
+    def test_linear_non_contiguous(self):
+        layer = BatchLinear(6, 2, num_estimators=2)
+        inputs = torch.rand((6, 4)).t()
+        assert torch.allclose(
+            layer(inputs), layer(inputs.contiguous()), atol=1e-6
+        )
+
+    def test_linear_fold(self, feat_input: torch.Tensor):
+        layer = BatchLinear(6, 2, num_estimators=2)
+        folded = layer.fold()
+        out = folded(feat_input.repeat(1, 2))
+        assert torch.allclose(out, layer(feat_input.repeat(2, 1)), atol=1e-6)
+
 
 class TestBatchConv2d:
     """Testing the BatchConv2d layer class."""
@@ -51,3 +71,26 @@ class TestBatchConv2d:
         layer = BatchConv2d(6, 2, num_estimators=2, kernel_size=1)
         out = layer(img_input)
         assert out.shape == torch.Size([5, 2, 3, 3])
+
+    def test_conv_broadcast_matches_expanded(self):
+        layer = BatchConv2d(6, 2, num_estimators=2, kernel_size=1)
+        img = torch.rand((4, 6, 3, 3))
+        assert torch.allclose(
+            layer(img), layer._expanded_forward(img), atol=1e-6
+        )
+
+    def test_conv_non_contiguous(self):
+        layer = BatchConv2d(6, 2, num_estimators=2, kernel_size=1)
+        img = torch.rand((4, 6, 3, 3)).to(memory_format=torch.channels_last)
+        assert torch.allclose(layer(img), layer(img.contiguous()), atol=1e-6)
+
+    def test_conv_fold(self):
+        layer = BatchConv2d(
+            6, 4, num_estimators=2, kernel_size=3, padding=1, groups=2
+        )
+        bn = nn.BatchNorm2d(4).eval()
+        nn.init.uniform_(bn.running_var, 0.5, 1.5)
+        img = torch.rand((3, 6, 4, 4))
+        out = layer.fold(bn)(img.repeat(1, 2, 1, 1))
+        out = torch.cat(out.chunk(2, dim=1))
+        assert torch.allclose(out, bn(layer(img.repeat(2, 1, 1, 1))), atol=1e-5)
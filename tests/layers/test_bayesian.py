@@ -1,14 +1,23 @@
 # fmt:off
 import pytest
 import torch
+import torch.nn.functional as F
 
 from torch_uncertainty.layers.bayesian import (
     BayesConv1d,
     BayesConv2d,
     BayesConv3d,
     BayesLinear,
+    FlipoutConv1d,
+    FlipoutConv2d,
+    FlipoutConv3d,
+    FlipoutLinear,
+    flipout,
+)
+from torch_uncertainty.layers.bayesian.sampler import (
+    PriorDistribution,
+    TrainableDistribution,
 )
-from torch_uncertainty.layers.bayesian.sampler import TrainableDistribution
 
 
 # fmt:on
@@ -71,6 +80,45 @@ class TestBayesLinear:
         layer.freeze()
         out = layer(feat_input_even)
 
+    def test_linear_local_reparameterization(self) -> None:
+        layer = BayesLinear(10, 2, sigma_init=-1, local_reparameterization=True)
+        feat = torch.rand((1, 10)).expand(20000, 10)
+        out = layer(feat)
+        assert torch.allclose(
+            out.mean(0), layer._frozen_forward(feat[0]), atol=0.05
+        )
+        weight_sigma = torch.log1p(torch.exp(layer.weight_sigma))
+        bias_sigma = torch.log1p(torch.exp(layer.bias_sigma))
+        var = (feat[0] ** 2) @ (weight_sigma**2).T + bias_sigma**2
+        assert torch.allclose(out.var(0), var, rtol=0.1)
+
+        posterior = torch.distributions.Normal(layer.weight_mu, weight_sigma)
+        prior = torch.distributions.Normal(0, layer.prior_sigma_1)
+        kl = torch.distributions.kl_divergence(posterior, prior).sum()
+        posterior = torch.distributions.Normal(layer.bias_mu, bias_sigma)
+        kl += torch.distributions.kl_divergence(posterior, prior).sum()
+        assert torch.allclose(layer.lvposterior - layer.lprior, kl)
+
+        layer = BayesLinear(
+            10, 2, prior_pi=0.5, bias=False, local_reparameterization=True
+        )
+        out = layer(torch.zeros((3, 10)))
+        out.sum().backward()
+        assert not layer.weight_sigma.grad.isnan().any()
+
+    def test_linear_batched_samples(self, feat_input_odd: torch.Tensor) -> None:
+        layer = BayesLinear(10, 2, sigma_init=0)
+        layer.num_samples = 3
+        out = layer(feat_input_odd.repeat(3, 1))
+        weights, biases = layer.weight_sampler.weight, layer.bias_sampler.weight
+        for i in range(3):
+            assert torch.allclose(
+                out[5 * i : 5 * (i + 1)],
+                F.linear(feat_input_odd, weights[i], biases[i]),
+                atol=1e-6,
+            )
+        assert layer.lvposterior.shape == torch.Size([])
+
 
 class TestBayesConv1d:
     """Testing the BayesConv1d layer class."""
@@ -131,6 +179,34 @@ class TestBayesConv2d:
         layer.freeze()
         out = layer(img_input_even)
 
+    def test_conv2_local_reparameterization(
+        self, img_input_even: torch.Tensor
+    ) -> None:
+        layer = BayesConv2d(
+            10,
+            2,
+            kernel_size=3,
+            padding=1,
+            sigma_init=-10,
+            local_reparameterization=True,
+        )
+        out = layer(img_input_even)
+        assert out.shape == torch.Size([8, 2, 3, 3])
+        layer.freeze()
+        assert torch.allclose(out, layer(img_input_even), atol=1e-3)
+
+    def test_conv2_batched_samples(self, img_input_odd: torch.Tensor) -> None:
+        layer = BayesConv2d(10, 4, kernel_size=3, padding=1, groups=2)
+        layer.num_samples = 2
+        out = layer(img_input_odd.repeat(2, 1, 1, 1))
+        weights, biases = layer.weight_sampler.weight, layer.bias_sampler.weight
+        for i in range(2):
+            assert torch.allclose(
+                out[5 * i : 5 * (i + 1)],
+                layer._conv_forward(img_input_odd, weights[i], biases[i]),
+                atol=1e-5,
+            )
+
 
 class TestBayesConv3d:
     """Testing the BayesConv3d layer class."""
@@ -158,6 +234,71 @@ class TestBayesConv3d:
         out = layer(cube_input_even)
 
 
+class TestFlipout:
+    """Testing the Flipout layer classes."""
+
+    def test_linear(self) -> None:
+        layer = FlipoutLinear(10, 2, sigma_init=-1, bias=False)
+        feat = torch.rand((1, 10)).expand(20000, 10)
+        out = layer(feat)
+        assert not torch.allclose(out[0], out[1])
+        assert torch.allclose(
+            out.mean(0), F.linear(feat[0], layer.weight_mu), atol=0.05
+        )
+        (out.sum() + layer.lvposterior - layer.lprior).backward()
+
+        layer.freeze()
+        assert torch.equal(layer(feat[:1]), F.linear(feat[:1], layer.weight_mu))
+
+    def test_conv(self, feat_input_odd, img_input_odd, cube_input_odd) -> None:
+        layer = FlipoutConv1d(5, 2, kernel_size=1)
+        assert layer(feat_input_odd).shape == torch.Size([2, 10])
+        layer = FlipoutConv2d(10, 2, kernel_size=3, padding=1)
+        assert layer(img_input_odd).shape == torch.Size([5, 2, 3, 3])
+        assert layer.lvposterior.shape == torch.Size([])
+        layer = FlipoutConv3d(10, 2, kernel_size=1, bias=False)
+        assert layer(cube_input_odd).shape == torch.Size([1, 2, 3, 3, 3])
+        layer.freeze()
+        assert torch.equal(
+            layer(cube_input_odd),
+            F.conv3d(cube_input_odd, layer.weight_mu),
+        )
+
+    def test_batched_samples(
+        self, feat_input_odd, img_input_odd, monkeypatch
+    ) -> None:
+        # without the sign flips, the tiles only differ by their weights
+        monkeypatch.setattr(
+            flipout,
+            "_random_signs",
+            lambda shape, like: torch.ones(shape).to(like),
+        )
+        layer = FlipoutLinear(10, 2, sigma_init=0)
+        layer.num_samples = 3
+        out = layer(feat_input_odd.repeat(3, 1))
+        assert not torch.allclose(out[:5], out[5:10])
+        weights, biases = layer.weight_sampler.weight, layer.bias_sampler.weight
+        for i in range(3):
+            assert torch.allclose(
+                out[5 * i : 5 * (i + 1)],
+                F.linear(feat_input_odd, weights[i], biases[i]),
+                atol=1e-5,
+            )
+        assert layer.lvposterior.shape == torch.Size([])
+
+        layer = FlipoutConv2d(10, 4, kernel_size=3, padding=1, groups=2)
+        layer.num_samples = 2
+        out = layer(img_input_odd.repeat(2, 1, 1, 1))
+        assert not torch.allclose(out[:5], out[5:])
+        weights, biases = layer.weight_sampler.weight, layer.bias_sampler.weight
+        for i in range(2):
+            assert torch.allclose(
+                out[5 * i : 5 * (i + 1)],
+                layer._conv_forward(img_input_odd, weights[i], biases[i]),
+                atol=1e-5,
+            )
+
+
 class TestTrainableDistribution:
     """Testing the TrainableDistribution class."""
 
@@ -165,3 +306,36 @@ class TestTrainableDistribution:
         sampler = TrainableDistribution(torch.ones(1), torch.ones(1))
         with pytest.raises(ValueError):
             sampler.log_posterior()
+
+
+class TestPriorDistribution:
+    """Testing the PriorDistribution class."""
+
+    def test_kl_divergence(self) -> None:
+        posterior = TrainableDistribution(torch.randn(10), torch.randn(10))
+        prior = PriorDistribution(0.5, 0.1, 1)
+        kl = torch.distributions.kl_divergence(
+            torch.distributions.Normal(
+                posterior.mu, torch.log1p(torch.exp(posterior.rho))
+            ),
+            torch.distributions.Normal(0, 0.5),
+        ).sum()
+        assert torch.allclose(prior.kl_divergence(posterior), kl)
+        assert torch.allclose(
+            posterior.expected_log_posterior()
+            - prior.expected_log_prior(posterior),
+            kl,
+        )
+
+        with pytest.raises(ValueError):
+            PriorDistribution(0.5, 0.1, 0.5).kl_divergence(posterior)
+
+    def test_cached_distribution(self) -> None:
+        prior = PriorDistribution(0.5, 0.1, 0.5)
+        assert prior.distribution is prior.distribution
+        assert prior.state_dict() == {}
+
+        distribution = prior.distribution
+        prior.double()
+        assert prior.distribution is not distribution
+        assert prior.log_prior(torch.zeros(2).double()).dtype == torch.double
@@ -2,7 +2,12 @@
 import pytest
 import torch
 
-from torch_uncertainty.layers.masksembles import MaskedConv2d, MaskedLinear
+from torch_uncertainty.layers import masksembles
+from torch_uncertainty.layers.masksembles import (
+    MaskedConv2d,
+    MaskedLinear,
+    generation_wrapper,
+)
 
 
 # fmt:on
@@ -82,3 +87,60 @@ class TestMaskedConv2d:
     def test_conv_s_lt_1(self):
         with pytest.raises(ValueError):
             _ = MaskedLinear(10, 2, num_estimators=1, scale=0)
+
+
+class TestMasksGeneration:
+    """Testing the generation of the masks."""
+
+    def test_masks_shape(self):
+        masks = generation_wrapper(32, 4, 2.0)
+        assert masks.shape == (4, 32)
+        assert masks.any(axis=0).all()
+
+    def test_seeded_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("TORCH_UNCERTAINTY_CACHE", str(tmp_path))
+        monkeypatch.setattr(masksembles, "_masks_cache", {})
+        masks = generation_wrapper(32, 4, 2.0, seed=1)
+        assert len(list((tmp_path / "masksembles").glob("*.npy"))) == 1
+
+        # the masks are loaded from the disk cache
+        monkeypatch.setattr(masksembles, "_masks_cache", {})
+        assert (generation_wrapper(32, 4, 2.0, seed=1) == masks).all()
+        # and memoized
+        assert (generation_wrapper(32, 4, 2.0, seed=1) == masks).all()
+
+    def test_seeded_layer(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("TORCH_UNCERTAINTY_CACHE", str(tmp_path))
+        layer = MaskedLinear(10, 2, num_estimators=2, scale=2, seed=0)
+        other = MaskedLinear(10, 2, num_estimators=2, scale=2, seed=0)
+        assert torch.equal(layer.mask.masks, other.mask.masks)
+
+    def test_sparse(self):
+        layer = MaskedLinear(10, 2, num_estimators=2, scale=2)
+        conv = MaskedConv2d(10, 2, num_estimators=2, kernel_size=3, scale=2)
+        feat = torch.rand((4, 10))
+        img = torch.rand((4, 10, 5, 5))
+        feat_out, img_out = layer(feat), conv(img)
+        layer.sparse, conv.sparse = True, True
+        assert torch.allclose(layer(feat), feat_out, atol=1e-6)
+        assert torch.allclose(conv(img), img_out, atol=1e-6)
+
+    def test_sparse_groups(self):
+        with pytest.raises(ValueError):
+            _ = MaskedConv2d(
+                10, 2, 1, num_estimators=2, scale=2, groups=2, sparse=True
+            )
+
+    def test_non_contiguous(self):
+        layer = MaskedLinear(10, 2, num_estimators=2, scale=2)
+        conv = MaskedConv2d(10, 2, num_estimators=2, kernel_size=3, scale=2)
+        seq = torch.rand((3, 4, 10)).transpose(0, 1)
+        img = torch.rand((4, 10, 5, 5)).to(memory_format=torch.channels_last)
+        for sparse in [False, True]:
+            layer.sparse, conv.sparse = sparse, sparse
+            assert torch.allclose(
+                layer(seq).reshape(4, 3, 2),
+                layer(seq.contiguous()).reshape(4, 3, 2),
+                atol=1e-6,
+            )
+            assert torch.allclose(conv(img), conv(img.contiguous()), atol=1e-6)
@@ -67,6 +67,20 @@ class TestPackedLinear:
         out = layer(feat)
         assert out.shape == torch.Size([6, 1])
 
+    def test_linear_packed_layout(self):
+        first = PackedLinear(5, 4, alpha=2, num_estimators=2, first=True)
+        last = PackedLinear(4, 3, alpha=2, num_estimators=2, last=True)
+        feat = torch.rand((3, 5))
+        ref = last(first(feat))
+
+        first.packed_layout = True
+        last.packed_layout = True
+        hidden = first(feat)
+        assert hidden.shape == torch.Size([3, 8])
+        out = last(hidden)
+        assert out.shape == torch.Size([6, 3])
+        assert torch.allclose(out, ref)
+
     def test_linear_extend(self):
         _ = PackedConv2d(
             5, 3, kernel_size=1, alpha=1, num_estimators=2, gamma=1
@@ -0,0 +1,73 @@
+# fmt: off
+import pytest
+import torch
+from torchmetrics.classification import (
+    BinaryCalibrationError,
+    MulticlassCalibrationError,
+)
+
+from torch_uncertainty.metrics import BinnedCalibrationError
+
+
+# fmt: on
+class TestBinnedCalibrationError:
+    """Testing the BinnedCalibrationError metric class."""
+
+    @pytest.mark.parametrize("norm", ["l1", "l2", "max"])
+    def test_multiclass(self, norm):
+        probs = torch.randn(500, 10).mul(3).softmax(dim=-1)
+        targets = torch.randint(0, 10, (500,))
+        metric = BinnedCalibrationError(norm=norm)
+        for batch in range(0, 500, 100):
+            metric.update(
+                probs[batch : batch + 100], targets[batch : batch + 100]
+            )
+        expected = MulticlassCalibrationError(10, n_bins=15, norm=norm)
+        assert torch.isclose(
+            metric.compute(), expected(probs, targets), atol=1e-5
+        )
+
+    def test_binary(self):
+        probs = torch.rand(500)
+        targets = torch.randint(0, 2, (500,))
+        metric = BinnedCalibrationError()
+        metric.update(probs, targets)
+        assert torch.isclose(
+            metric.compute(), BinaryCalibrationError()(probs, targets)
+        )
+
+    def test_adaptive(self):
+        # distinct bins of the sketch
+        probs = (torch.randperm(600) + 0.5) / 600
+        targets = torch.randint(0, 2, (600,))
+        metric = BinnedCalibrationError(num_bins=6, adaptive=True)
+        metric.update(probs, targets)
+        counts, _, _, edges = metric.bins()
+        assert counts.tolist() == [100] * 6
+        assert edges.size(0) == 7
+
+        # equal-mass bins of the sorted confidences
+        order = probs.argsort()
+        expected = sum(
+            (targets[ids].float().mean() - probs[ids].mean()).abs() / 6
+            for ids in order.tensor_split(6)
+        )
+        assert torch.isclose(metric.compute(), expected, atol=1e-5)
+
+    def test_adaptive_heavy_bin(self):
+        metric = BinnedCalibrationError(num_bins=4, adaptive=True)
+        metric.update(torch.as_tensor([0.1, 0.3, 1, 1, 1, 1]), torch.ones(6))
+        counts, _, _, edges = metric.bins()
+        assert counts.tolist() == [2, 4]
+        assert edges[0] == 0 and edges[-1] == 1
+
+        metric.reset()
+        assert metric.compute() == 0
+
+    def test_failures(self):
+        with pytest.raises(ValueError):
+            BinnedCalibrationError(num_bins=0)
+        with pytest.raises(ValueError):
+            BinnedCalibrationError(norm="l3")
+        with pytest.raises(ValueError):
+            BinnedCalibrationError(num_bins=10, adaptive=True, sketch_bins=5)
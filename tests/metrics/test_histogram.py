@@ -0,0 +1,33 @@
+# fmt: off
+import pytest
+import torch
+
+from torch_uncertainty.metrics import Histogram
+from torch_uncertainty.plotting_utils import plot_hist
+
+
+# fmt: on
+class TestHistogram:
+    """Testing the Histogram metric class."""
+
+    def test_main(self):
+        metric = Histogram(num_bins=4, min=0, max=2)
+        metric.update(torch.as_tensor([0.1, 0.6, 0.7]))
+        metric.update(torch.as_tensor([1.9, -1.0, 3.0]))
+        counts, edges = metric.compute()
+        assert counts.tolist() == [2, 2, 0, 2]
+        assert edges.tolist() == [0, 0.5, 1, 1.5, 2]
+
+        metric.reset()
+        assert metric.compute()[0].sum() == 0
+
+    def test_plot(self):
+        id_hist, ood_hist = Histogram(), Histogram()
+        id_hist.update(torch.rand(100) * 0.5 + 0.5)
+        plot_hist([id_hist.compute(), ood_hist.compute()], 20, "title")
+
+    def test_failures(self):
+        with pytest.raises(ValueError):
+            Histogram(num_bins=0)
+        with pytest.raises(ValueError):
+            Histogram(min=1, max=0)
@@ -0,0 +1,94 @@
+# fmt: off
+import pytest
+import torch
+from torchmetrics.classification import BinaryAUROC, BinaryAveragePrecision
+
+from torch_uncertainty.metrics import FPR95, BinnedOODCurve, OODCurve
+
+
+# fmt: on
+class TestOODCurve:
+    """Testing the OODCurve metric class."""
+
+    def test_main(self):
+        generator = torch.Generator().manual_seed(0)
+        values = torch.randint(0, 50, (500,), generator=generator) / 50
+        targets = torch.randint(0, 2, (500,), generator=generator)
+        metric = OODCurve()
+        for batch in range(0, 500, 100):
+            metric.update(
+                values[batch : batch + 100], targets[batch : batch + 100]
+            )
+        results = metric.compute()
+
+        fpr95 = FPR95(pos_label=1)
+        fpr95.update(values, targets)
+        assert results["fpr95"] == fpr95.compute()
+        assert torch.isclose(
+            results["auroc"], BinaryAUROC()(values, targets), atol=1e-6
+        )
+        assert torch.isclose(
+            results["aupr"],
+            BinaryAveragePrecision()(values, targets),
+            atol=1e-6,
+        )
+        assert torch.isclose(
+            results["aupr_in"],
+            BinaryAveragePrecision()(1 - values, 1 - targets),
+            atol=1e-6,
+        )
+
+    def test_detection_error(self):
+        metric = OODCurve(recall_level=0.5)
+        metric.update(torch.as_tensor([0.1, 0.2, 0.6, 0.3]), torch.zeros(4))
+        metric.update(torch.as_tensor([0.5, 0.7, 0.8, 0.9]), torch.ones(4))
+        results = metric.compute()
+        # the threshold 0.5 misses no OOD value and flags one ID value
+        assert results["detection_error"] == pytest.approx(1 / 8)
+        assert results["fpr50"] == 0
+        assert results["auroc"] == pytest.approx(15 / 16)
+
+
+class TestBinnedOODCurve:
+    """Testing the BinnedOODCurve metric class."""
+
+    def test_main(self):
+        # one value per bin, for which the metrics are exact
+        generator = torch.Generator().manual_seed(0)
+        values = (
+            torch.randint(0, 100, (500,), generator=generator) + 0.5
+        ) / 100
+        targets = torch.randint(0, 2, (500,), generator=generator)
+        metric = BinnedOODCurve(num_bins=100)
+        for batch in range(0, 500, 100):
+            metric.update(
+                values[batch : batch + 100], targets[batch : batch + 100]
+            )
+        results = metric.compute()
+
+        fpr95 = FPR95(pos_label=1)
+        fpr95.update(values, targets)
+        assert torch.isclose(results["fpr95"], fpr95.compute())
+        assert torch.isclose(
+            results["auroc"], BinaryAUROC()(values, targets), atol=1e-6
+        )
+        assert torch.isclose(
+            results["aupr"],
+            BinaryAveragePrecision()(values, targets),
+            atol=1e-6,
+        )
+
+    def test_ties(self):
+        metric = BinnedOODCurve(num_bins=2, min=-1, max=1)
+        metric.update(torch.as_tensor([-0.9, -0.8, 0.5]), torch.zeros(3))
+        metric.update(torch.as_tensor([0.1, 0.9, 5.0]), torch.ones(3))
+        results = metric.compute()
+        # one ID and the three OOD values share the upper bin
+        assert results["auroc"] == pytest.approx(5 / 6)
+        assert results["fpr95"] == pytest.approx(1 / 3)
+
+    def test_failures(self):
+        with pytest.raises(ValueError):
+            BinnedOODCurve(num_bins=0)
+        with pytest.raises(ValueError):
+            BinnedOODCurve(min=1, max=0)
@@ -0,0 +1,51 @@
+# fmt: off
+import torch
+
+from torch_uncertainty.metrics import (
+    MutualInformation,
+    VariationRatio,
+    ood_criteria,
+    ood_scores,
+)
+
+
+# fmt: on
+class TestOODScores:
+    """Testing the ood_scores function."""
+
+    def test_main(self):
+        logits = torch.randn(8, 3, 5)
+        scores = ood_scores(logits)
+        assert tuple(scores) == ood_criteria
+        assert all(score.shape == (8,) for score in scores.values())
+
+        probs_per_est = logits.softmax(-1)
+        probs = probs_per_est.mean(1)
+        torch.testing.assert_close(scores["msp"], -probs.max(-1)[0])
+        torch.testing.assert_close(scores["logit"], -logits.mean(1).max(-1)[0])
+        torch.testing.assert_close(
+            scores["entropy"], torch.special.entr(probs).sum(-1)
+        )
+        torch.testing.assert_close(
+            scores["expected_entropy"],
+            torch.special.entr(probs_per_est).sum(-1).mean(1),
+        )
+        torch.testing.assert_close(
+            scores["mutual_information"],
+            MutualInformation(reduction="none")(probs_per_est),
+        )
+        torch.testing.assert_close(
+            scores["variation_ratio"],
+            VariationRatio(reduction="none", probabilistic=False)(
+                probs_per_est.transpose(0, 1)
+            ),
+        )
+
+    def test_binary(self):
+        logits = torch.randn(8, 3, 1)
+        scores = ood_scores(logits)
+        probs = torch.sigmoid(logits).mean(1).squeeze(-1)
+        torch.testing.assert_close(
+            scores["msp"], -torch.maximum(probs, 1 - probs)
+        )
+        torch.testing.assert_close(scores["logit"], -logits.mean((1, 2)))
@@ -0,0 +1,72 @@
+# fmt: off
+import pytest
+import torch
+from torch.utils.data import TensorDataset
+
+from torch_uncertainty.models import cascade, deep_ensembles
+from torch_uncertainty.models.mlp import mlp, packed_mlp
+
+
+# fmt: on
+class TestCascade:
+    """Testing the cascade function."""
+
+    def test_main(self):
+        model = mlp(4, 3, hidden_dims=[8])
+        ensemble = deep_ensembles(
+            [mlp(4, 3, hidden_dims=[8]) for _ in range(2)]
+        )
+        inputs = torch.randn(10, 4)
+        with torch.no_grad():
+            single = model(inputs).softmax(-1)
+            full = ensemble(inputs).softmax(-1).mean(1)
+
+            casc = cascade(model, ensemble, threshold=float("inf")).eval()
+            probs, escalated = casc.predict(inputs)
+            assert not escalated.any()
+            assert torch.allclose(probs, single)
+
+            casc.threshold = -float("inf")
+            probs, escalated = casc.predict(inputs)
+            assert escalated.all()
+            assert torch.allclose(probs, full)
+            assert torch.allclose(casc(inputs).softmax(-1), full)
+
+        for criterion in ["entropy", "logit"]:
+            casc = cascade(model, ensemble, criterion=criterion)
+            assert casc(inputs).shape == (10, 3)
+
+        with pytest.raises(ValueError):
+            cascade(model, ensemble, criterion="variation_ratio")
+
+    def test_packed(self):
+        model = mlp(4, 3, hidden_dims=[8])
+        ensemble = packed_mlp(4, 3, hidden_dims=[8], num_estimators=2)
+        casc = cascade(model, ensemble, threshold=-float("inf")).eval()
+        assert casc(torch.randn(5, 4)).shape == (5, 3)
+
+    def test_calibrate(self):
+        torch.manual_seed(0)
+        model = mlp(4, 3, hidden_dims=[8])
+        ensemble = deep_ensembles(
+            [mlp(4, 3, hidden_dims=[8]) for _ in range(2)]
+        )
+        dataset = TensorDataset(torch.randn(100, 4), torch.randint(3, (100,)))
+        casc = cascade(model, ensemble)
+
+        casc.calibrate(dataset, budget=0.3)
+        with torch.no_grad():
+            _, escalated = casc.predict(dataset.tensors[0])
+        assert escalated.float().mean() == 0.3
+
+        casc.calibrate(dataset, target_accuracy=0)
+        with torch.no_grad():
+            _, escalated = casc.predict(dataset.tensors[0])
+        assert not escalated.any()
+
+        assert casc.calibrate(dataset, target_accuracy=1.1) == -float("inf")
+
+        with pytest.raises(ValueError):
+            casc.calibrate(dataset)
+        with pytest.raises(ValueError):
+            casc.calibrate(dataset, budget=0.1, target_accuracy=0.9)
@@ -1,8 +1,14 @@
 # fmt: off
+import copy
+import gc
+import threading
+
 import pytest
 import torch
 
-from torch_uncertainty.models import deep_ensembles
+from torch_uncertainty.models import deep_ensembles, lazy_deep_ensembles
+from torch_uncertainty.models.mlp import mlp
+from torch_uncertainty.utils import save_mmap_state_dict
 
 from .._dummies import dummy_model
 
@@ -44,3 +50,138 @@ class TestDeepEnsemblesModel:
 
         with pytest.raises(ValueError):
             deep_ensembles(model_1, num_estimators=1)
+
+    def test_functional(self):
+        models = [mlp(4, 3, hidden_dims=[8]).eval() for _ in range(3)]
+        de = deep_ensembles(models, functional=True).eval()
+        assert de.functional
+        inputs = torch.randn(5, 4)
+        with torch.no_grad():
+            out = de(inputs)
+            assert out.shape == (5, 3, 3)
+            assert torch.allclose(
+                out, torch.stack([m(inputs) for m in models], 1)
+            )
+
+            # the cached stacked parameters follow the in-place updates
+            models[1].layers[0].weight.add_(1)
+            assert torch.allclose(de(inputs)[:, 1], models[1](inputs))
+
+        de(inputs).sum().backward()
+        assert models[0].layers[0].weight.grad is not None
+
+    def test_functional_heterogeneous(self):
+        models = [mlp(4, 3, hidden_dims=[8]), mlp(4, 3, hidden_dims=[6])]
+        de = deep_ensembles(models, functional=True)
+        assert not de.functional
+        assert de(torch.randn(5, 4)).shape == (5, 2, 3)
+
+    def test_executors(self):
+        models = [mlp(4, 3, hidden_dims=[8]), mlp(4, 3, hidden_dims=[6])]
+        de = deep_ensembles(models, executor="threads").eval()
+        inputs = torch.randn(5, 4)
+        expected = torch.stack([m(inputs) for m in models], 1)
+        assert torch.allclose(de(inputs), expected)
+        pool = de._pool
+        copied = copy.deepcopy(de)
+        assert copied._pool is None
+        assert de._pool is pool
+        assert torch.allclose(de(inputs), expected)
+        de.close()
+
+        # the budget of the members does not leak to the other threads
+        num_threads = torch.get_num_threads()
+        torch.set_num_threads(3)
+        try:
+            de = deep_ensembles(models, executor="threads", num_threads=1)
+            assert torch.allclose(de.eval()(inputs), expected)
+            assert torch.get_num_threads() == 3
+            budgets = []
+            thread = threading.Thread(
+                target=lambda: budgets.append(torch.get_num_threads())
+            )
+            thread.start()
+            thread.join()
+            assert budgets == [3]
+        finally:
+            torch.set_num_threads(num_threads)
+        # and the pool is shut down with the ensemble
+        pool = de._pool
+        del de
+        gc.collect()
+        assert pool._shutdown
+
+        de = deep_ensembles(models, executor="processes").eval()
+        assert torch.allclose(de(inputs), expected)
+        workers = de._workers
+        copy.deepcopy(de)
+        assert de._workers is workers
+        assert all(process.is_alive() for process, _, _ in workers)
+        assert torch.allclose(de(inputs), expected)
+        models[0].layers[0].bias.data.add_(1)
+        assert torch.allclose(de(inputs)[:, 0], models[0](inputs))
+        del de
+        gc.collect()
+        assert not any(process.is_alive() for process, _, _ in workers)
+
+        with pytest.raises(ValueError):
+            deep_ensembles(models, executor="gpus")
+
+    def test_anytime(self):
+        models = [mlp(4, 3, hidden_dims=[8]) for _ in range(4)]
+        de = deep_ensembles(models).eval()
+        inputs = torch.randn(20, 4)
+        with torch.no_grad():
+            expected = de(inputs).softmax(-1).mean(1)
+            probs, counts = de.anytime_forward(inputs, threshold=0)
+            assert (counts == 2).all()
+            probs, counts = de.anytime_forward(inputs, threshold=1.1)
+            assert (counts == 4).all()
+            assert torch.allclose(probs, expected)
+
+            for criterion in ["disagreement", "mutual_information"]:
+                probs, counts = de.anytime_forward(
+                    inputs, criterion, threshold=0.05
+                )
+                assert probs.shape == (20, 3)
+                assert ((counts >= 2) & (counts <= 4)).all()
+                full = counts == 4
+                assert torch.allclose(probs[full], expected[full])
+
+        with pytest.raises(ValueError):
+            de.anytime_forward(inputs, criterion="entropy")
+        with pytest.raises(ValueError):
+            de.anytime_forward(inputs, "disagreement", min_estimators=1)
+        with pytest.raises(ValueError):
+            de.anytime_forward(inputs, min_estimators=5)
+
+    def test_lazy(self, tmp_path):
+        models = [mlp(4, 3, hidden_dims=[8]).eval() for _ in range(3)]
+        checkpoints = []
+        for i, model in enumerate(models):
+            checkpoints.append(tmp_path / f"member_{i}.mmap")
+            save_mmap_state_dict(model.state_dict(), checkpoints[-1])
+
+        de = lazy_deep_ensembles(
+            mlp(4, 3, hidden_dims=[8]), checkpoints, max_resident=2
+        ).eval()
+        inputs = torch.randn(5, 4)
+        with torch.no_grad():
+            expected = torch.stack([m(inputs) for m in models], 1)
+            assert torch.allclose(de(inputs), expected)
+            assert len(de.slots) == 2
+            assert list(de._resident) == [1, 2]
+
+            probs = de.predict(
+                [(inputs[:3], None), (inputs[3:], None)],
+                tmp_path / "probs.npy",
+                num_samples=5,
+            )
+            assert torch.allclose(probs, expected.softmax(-1).transpose(0, 1))
+
+        with pytest.raises(ValueError):
+            de.predict([], tmp_path / "empty.npy", num_samples=0)
+        with pytest.raises(ValueError):
+            lazy_deep_ensembles(models[0], [])
+        with pytest.raises(ValueError):
+            lazy_deep_ensembles(models[0], checkpoints, max_resident=0)
@@ -0,0 +1,25 @@
+# fmt: off
+import torch
+
+from torch_uncertainty.models.lenet import bayesian_lenet, lenet, packed_lenet
+
+
+# fmt: on
+class TestLeNetModel:
+    """Testing the lenet models."""
+
+    def test_std(self):
+        model = lenet(1, 10)
+        assert model(torch.rand(2, 1, 28, 28)).shape == torch.Size([2, 10])
+
+    def test_packed(self):
+        model = packed_lenet(1, 10, num_estimators=4)
+        assert model(torch.rand(2, 1, 28, 28)).shape == torch.Size([8, 10])
+
+    def test_bayesian(self):
+        model = bayesian_lenet(1, 10)
+        assert model(torch.rand(2, 1, 28, 28)).shape == torch.Size([2, 10])
+        model = bayesian_lenet(1, 10, local_reparameterization=True)
+        assert model(torch.rand(2, 1, 28, 28)).shape == torch.Size([2, 10])
+        model = bayesian_lenet(1, 10, flipout=True)
+        assert model(torch.rand(2, 1, 28, 28)).shape == torch.Size([2, 10])
@@ -1,4 +1,6 @@
 # fmt: off
+import torch
+
 from torch_uncertainty.models.mlp import bayesian_mlp, packed_mlp
 
 
@@ -9,5 +11,17 @@ class TestMLPModel:
     def test_packed(self):
         packed_mlp(1, 1, hidden_dims=[])
 
+    def test_packed_layout(self):
+        model = packed_mlp(5, 3, hidden_dims=[8, 8], packed_layout=False)
+        packed = packed_mlp(5, 3, hidden_dims=[8, 8])
+        packed.load_state_dict(model.state_dict())
+        inputs = torch.rand(2, 5)
+        assert packed(inputs).shape == torch.Size([8, 3])
+        assert torch.allclose(packed(inputs), model(inputs))
+
     def test_bayesian(self):
         bayesian_mlp(1, 1, hidden_dims=[1, 1, 1])
+        model = bayesian_mlp(
+            1, 1, hidden_dims=[2], local_reparameterization=True
+        )
+        assert model(torch.rand(3, 1)).shape == torch.Size([3, 1])
@@ -1,7 +1,15 @@
-from torch_uncertainty.models.resnet.std import resnet34
+import pytest
+import torch
+from torch import nn
+
+from torch_uncertainty.models import mc_dropout
+from torch_uncertainty.models.lenet import lenet
+from torch_uncertainty.models.mlp import mlp
+from torch_uncertainty.models.resnet.std import resnet18, resnet34
 from torch_uncertainty.models.utils import toggle_dropout
 from torch_uncertainty.models.vgg.std import vgg11
 from torch_uncertainty.models.wideresnet.std import wideresnet28x10
+from torch_uncertainty.routines.classification import ClassificationEnsemble
 
 
 class TestMonteCarloDropout:
@@ -50,3 +58,61 @@ class TestMonteCarloDropout:
                 assert m.training
 
         toggle_dropout(model, last_layer_dropout=True, enable=True)
+
+
+class TestMCDropoutWrapper:
+    """Testing the batched Monte-Carlo Dropout wrapper."""
+
+    def test_main(self):
+        models = [
+            (lenet(1, 10, dropout_rate=0.5), torch.rand(2, 1, 28, 28)),
+            (mlp(4, 10, [8, 8], dropout=0.5), torch.rand(2, 4)),
+            (resnet18(1, 10, dropout_rate=0.5, style="cifar"), None),
+            (vgg11(1, 10, style="cifar"), torch.rand(2, 1, 32, 32)),
+        ]
+        for model, inputs in models:
+            if inputs is None:
+                inputs = torch.rand(2, 1, 32, 32)
+            for last_layer_dropout in [False, True]:
+                mc_model = mc_dropout(model, 4, last_layer_dropout).eval()
+                with torch.no_grad():
+                    out = mc_model(inputs)
+                assert out.shape == (2, 4, 10)
+                assert not torch.allclose(out[:, 0], out[:, 1])
+                assert not any(m.training for m in model.modules())
+            assert mc_model.train()(inputs).shape == (2, 10)
+
+    def test_prefix_once(self):
+        model = resnet18(1, 10, dropout_rate=0.5, style="cifar")
+        batch_sizes = {}
+        for name in ["conv1", "layer4.0", "layer4.1", "linear"]:
+            model.get_submodule(name).register_forward_hook(
+                lambda m, i, o, name=name: batch_sizes.update({name: len(o)})
+            )
+        mc_model = mc_dropout(model, 3, last_layer_dropout=True).eval()
+        with torch.no_grad():
+            mc_model(torch.rand(2, 1, 32, 32))
+        assert batch_sizes == {
+            "conv1": 2,
+            "layer4.0": 2,
+            "layer4.1": 6,
+            "linear": 6,
+        }
+
+    def test_routine(self):
+        model = mc_dropout(mlp(4, 3, [8], dropout=0.5), 5)
+        routine = ClassificationEnsemble(
+            3, model, nn.CrossEntropyLoss, None, 5
+        ).eval()
+        inputs, targets = torch.rand(6, 4), torch.randint(0, 3, (6,))
+        routine.validation_step((inputs, targets), 0)
+        routine.test_step((inputs, targets), 0)
+        assert routine.test_id_ens_metrics.compute()["hp/test_id_ens_mi"] >= 0
+
+    def test_failures(self):
+        with pytest.raises(ValueError):
+            mc_dropout(mlp(4, 3, [8], dropout=0.5), 0)
+        with pytest.raises(ValueError):
+            mc_dropout(mlp(4, 3, [8]), 2)
+        with pytest.raises(ValueError):
+            mc_dropout(resnet18(1, 10, dropout_rate=0.5, num_estimators=2), 2)
@@ -1,11 +1,14 @@
+import pytest
 import torch
 
 from torch_uncertainty.models.resnet.batched import (
+    batched_resnet18,
     batched_resnet34,
     batched_resnet101,
     batched_resnet152,
 )
 from torch_uncertainty.models.resnet.masked import (
+    masked_resnet18,
     masked_resnet34,
     masked_resnet101,
 )
@@ -18,8 +21,10 @@ from torch_uncertainty.models.resnet.packed import (
     packed_resnet34,
     packed_resnet101,
     packed_resnet152,
+    packed_resnet_from_ensemble,
 )
 from torch_uncertainty.models.resnet.std import (
+    resnet18,
     resnet34,
     resnet50,
     resnet101,
@@ -66,6 +71,39 @@ class TestPackedResnet:
         )
         assert not out
 
+    def test_from_ensemble(self):
+        for model, style in [(resnet18, "cifar"), (resnet50, "imagenet")]:
+            members = [model(3, 10, groups=2, style=style) for _ in range(3)]
+            for member in members:
+                for module in member.modules():
+                    if isinstance(module, torch.nn.BatchNorm2d):
+                        module.running_mean.normal_()
+                        module.running_var.uniform_(0.5, 2)
+                member.eval()
+
+            packed = packed_resnet_from_ensemble(members)
+            assert not packed.training
+            inputs = torch.rand((2, 3, 32, 32))
+            with torch.no_grad():
+                expected = torch.cat([member(inputs) for member in members])
+                assert torch.allclose(packed(inputs), expected, atol=1e-5)
+
+        with pytest.raises(ValueError):
+            packed_resnet_from_ensemble([resnet18(3, 10), resnet34(3, 10)])
+        # same parameters, different configurations
+        with pytest.raises(ValueError):
+            packed_resnet_from_ensemble(
+                [resnet18(3, 10), resnet18(3, 10, dropout_rate=0.5)]
+            )
+        with pytest.raises(ValueError):
+            packed_resnet_from_ensemble(
+                [resnet18(3, 10), resnet18(3, 10, style="cifar")]
+            )
+        with pytest.raises(ValueError):
+            packed_resnet_from_ensemble([resnet18(3, 10, num_estimators=2)])
+        with pytest.raises(ValueError):
+            packed_resnet_from_ensemble([torch.nn.Linear(2, 2)])
+
 
 class TestMaskedResnet:
     """Testing the ResNet masked class."""
@@ -74,6 +112,17 @@ class TestMaskedResnet:
         masked_resnet34(1, 2, 2, 1, 10)
         masked_resnet101(1, 2, 2, 1, 10)
 
+    def test_seeded(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("TORCH_UNCERTAINTY_CACHE", str(tmp_path))
+        model = masked_resnet18(1, 2, 2, 1, 10, seed=0)
+        # the layers of the same width get different masks
+        block = model.layer1[0]
+        assert not torch.equal(block.conv1.mask.masks, block.conv2.mask.masks)
+        other = masked_resnet18(1, 2, 2, 1, 10, seed=0)
+        assert torch.equal(
+            model.layer1[0].conv2.mask.masks, other.layer1[0].conv2.mask.masks
+        )
+
 
 class TestBatchedResnet:
     """Testing the ResNet batched class."""
@@ -83,6 +132,14 @@ class TestBatchedResnet:
         batched_resnet101(1, 2, 1, 10)
         batched_resnet152(1, 2, 1, 10)
 
+    def test_fuse_for_inference(self):
+        model = batched_resnet18(3, 2, 1, 10, style="cifar").eval()
+        inputs = torch.rand((2, 3, 32, 32))
+        with torch.no_grad():
+            out = model(inputs)
+            model.fuse_for_inference()
+            assert torch.allclose(model(inputs), out, atol=1e-5)
+
 
 class TestMIMOResnet:
     """Testing the ResNet MIMO class."""
@@ -93,3 +150,16 @@ class TestMIMOResnet:
         model(torch.rand((2, 1, 28, 28)))
         mimo_resnet101(1, 10, 2)
         mimo_resnet152(1, 10, 2)
+
+    def test_inference(self):
+        model = mimo_resnet34(1, 10, 2, style="cifar").eval()
+        inputs = torch.rand((3, 1, 28, 28))
+        with torch.no_grad():
+            out = model(inputs)
+            # the training path on repeated inputs, with frozen layers
+            model.train()
+            for module in model.children():
+                module.eval()
+            expected = model(inputs.repeat(2, 1, 1, 1))
+        assert out.shape == (6, 10)
+        assert torch.allclose(out, expected, atol=1e-6)
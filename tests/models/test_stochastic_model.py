@@ -1,6 +1,8 @@
 import torch
 
 from torch_uncertainty.layers import BayesConv2d, BayesLinear
+from torch_uncertainty.models.lenet import bayesian_lenet
+from torch_uncertainty.models.mlp import bayesian_mlp
 from torch_uncertainty.models.utils import StochasticModel
 
 
@@ -68,3 +70,48 @@ class TestStochasticModel:
             "layer2.weight",
             "layer2.bias",
         ]
+
+    def test_sample_independent(self):
+        model = DummyModelMix()
+        states = model.sample(3)
+        assert states[0] is not states[1]
+        assert not torch.equal(
+            states[0]["layer.weight"], states[1]["layer.weight"]
+        )
+        assert states[0]["layer2.weight"] is states[1]["layer2.weight"]
+
+    def test_sample_nested(self):
+        model = bayesian_mlp(2, 3, hidden_dims=[4])
+        model.freeze()
+        assert all(layer.frozen for layer in model.layers)
+        model.unfreeze()
+        assert not any(layer.frozen for layer in model.layers)
+
+        samples = model.sample_posterior(5)
+        assert list(samples.keys()) == [
+            "layers.0.weight",
+            "layers.0.bias",
+            "layers.1.weight",
+            "layers.1.bias",
+        ]
+        assert samples["layers.0.weight"].shape == (5, 4, 2)
+        assert list(model.sample()[0].keys()) == list(samples.keys())
+
+    def test_forward_samples(self):
+        model = bayesian_lenet(1, 10).eval()
+        x = torch.rand(2, 1, 32, 32)
+        with torch.no_grad():
+            samples = model.sample_posterior(3)
+            out = model.forward_samples(x, samples)
+            assert out.shape == (2, 3, 10)
+            assert not model.conv1.frozen
+
+            model.freeze()
+            for i in range(3):
+                model.load_state_dict(
+                    {k + "_mu": v[i] for k, v in samples.items()}, strict=False
+                )
+                torch.testing.assert_close(out[:, i], model(x))
+
+            assert model.forward_samples(x, num_samples=4).shape == (2, 4, 10)
+            assert model.conv1.frozen
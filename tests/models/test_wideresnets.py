@@ -49,6 +49,14 @@ class TestBatchedWide:
     def test_main(self):
         batched_wideresnet28x10(1, 2, 1, 10, style="imagenet")
 
+    def test_fuse_for_inference(self):
+        model = batched_wideresnet28x10(1, 2, 1, 10, style="cifar").eval()
+        inputs = torch.rand((1, 1, 16, 16))
+        with torch.no_grad():
+            out = model(inputs)
+            model.fuse_for_inference()
+            assert torch.allclose(model(inputs), out, atol=1e-5)
+
 
 class TestMIMOWide:
     """Testing the WideResNet mimo class."""
@@ -56,3 +64,17 @@ class TestMIMOWide:
     def test_main(self):
         model = mimo_wideresnet28x10(1, 10, 2, style="cifar")
         model(torch.rand((2, 1, 28, 28)))
+
+    def test_inference(self):
+        for groups in [1, 2]:
+            model = mimo_wideresnet28x10(1, 10, 2, groups, "cifar").eval()
+            inputs = torch.rand((3, 1, 28, 28))
+            with torch.no_grad():
+                out = model(inputs)
+                # the training path on repeated inputs, frozen layers
+                model.train()
+                for module in model.children():
+                    module.eval()
+                expected = model(inputs.repeat(2, 1, 1, 1))
+            assert out.shape == (6, 10)
+            assert torch.allclose(out, expected, atol=1e-6)
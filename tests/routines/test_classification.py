@@ -8,6 +8,8 @@ from torch import nn
 
 from torch_uncertainty import cli_main, init_args
 from torch_uncertainty.losses import ELBOLoss
+from torch_uncertainty.metrics import ood_criteria
+from torch_uncertainty.models import lazy_deep_ensembles
 from torch_uncertainty.optimization_procedures import optim_cifar10_resnet18
 from torch_uncertainty.routines.classification import (
     ClassificationEnsemble,
@@ -93,6 +95,28 @@ class TestClassificationSingle:
 
             cli_main(model, dm, root, "dummy", args)
 
+        with ArgvContext("file.py", "--evaluate_ood", "--ood_bins", "1000"):
+            args = init_args(
+                DummyClassificationBaseline, DummyClassificationDataModule
+            )
+
+            # datamodule
+            args.root = str(root / "data")
+            dm = DummyClassificationDataModule(**vars(args))
+
+            model = DummyClassificationBaseline(
+                num_classes=dm.num_classes,
+                in_channels=dm.num_channels,
+                loss=nn.CrossEntropyLoss,
+                optimization_procedure=optim_cifar10_resnet18,
+                baseline_type="single",
+                **vars(args),
+            )
+
+            results = cli_main(model, dm, root, "dummy", args)
+            for metric in ["fpr95", "auroc", "aupr"]:
+                assert f"hp/test_{metric}" in results[0]
+
     def test_classification_failures(self):
         with pytest.raises(ValueError):
             ClassificationSingle(
@@ -215,6 +239,64 @@ class TestClassificationEnsemble:
 
             cli_main(model, dm, root, "dummy", args)
 
+        with ArgvContext(
+            "file.py",
+            "--evaluate_ood",
+            "--mutual_information",
+            "--all_ood_criteria",
+        ):
+            args = init_args(
+                DummyClassificationBaseline, DummyClassificationDataModule
+            )
+
+            # datamodule
+            args.root = str(root / "data")
+            dm = DummyClassificationDataModule(**vars(args))
+
+            model = DummyClassificationBaseline(
+                num_classes=dm.num_classes,
+                in_channels=dm.num_channels,
+                loss=nn.CrossEntropyLoss,
+                optimization_procedure=optim_cifar10_resnet18,
+                baseline_type="ensemble",
+                **vars(args),
+            )
+            assert len(model.test_criteria_ood_metrics) == 6
+
+            results = cli_main(model, dm, root, "dummy", args)
+            for criterion in ood_criteria:
+                assert f"hp/test_{criterion}_auroc" in results[0]
+
+        with ArgvContext(
+            "file.py",
+            "--evaluate_ood",
+            "--logits",
+            "--all_ood_criteria",
+            "--ood_bins",
+            "1000",
+        ):
+            args = init_args(
+                DummyClassificationBaseline, DummyClassificationDataModule
+            )
+
+            # datamodule
+            args.root = str(root / "data")
+            dm = DummyClassificationDataModule(**vars(args))
+
+            model = DummyClassificationBaseline(
+                num_classes=dm.num_classes,
+                in_channels=dm.num_channels,
+                loss=nn.CrossEntropyLoss,
+                optimization_procedure=optim_cifar10_resnet18,
+                baseline_type="ensemble",
+                **vars(args),
+            )
+
+            results = cli_main(model, dm, root, "dummy", args)
+            assert "hp/test_fpr95" in results[0]
+            for criterion in ood_criteria:
+                assert f"hp/test_{criterion}_aupr" in results[0]
+
     def test_classification_failures(self):
         with pytest.raises(ValueError):
             ClassificationEnsemble(
@@ -226,3 +308,7 @@ class TestClassificationEnsemble:
                 use_entropy=True,
                 use_variation_ratio=True,
             )
+
+        lazy = lazy_deep_ensembles(nn.Linear(1, 1), ["member.mmap"])
+        with pytest.raises(ValueError):
+            ClassificationEnsemble(10, lazy, None, None, 1)
@@ -0,0 +1,120 @@
+# fmt:off
+from argparse import ArgumentParser
+from pathlib import Path
+
+import pytest
+import pytorch_lightning as pl
+import torch
+from torch import nn
+from torch.utils.data import DataLoader
+
+from torch_uncertainty.models import deep_ensembles
+from torch_uncertainty.optimization_procedures import optim_cifar10_resnet18
+from torch_uncertainty.routines.distillation import (
+    ClassificationDistillation,
+    cache_teacher_targets,
+    teacher_targets,
+)
+
+from .._dummies import DummyClassificationDataModule, dummy_model
+
+
+# fmt:on
+def _routine(teacher: nn.Module, **kwargs) -> ClassificationDistillation:
+    return ClassificationDistillation(
+        num_classes=2,
+        model=dummy_model(1, 2, 1),
+        teacher=teacher,
+        loss=nn.CrossEntropyLoss,
+        optimization_procedure=optim_cifar10_resnet18,
+        **kwargs,
+    )
+
+
+def _datamodule() -> DummyClassificationDataModule:
+    root = Path(__file__).parent.absolute().parents[0]
+    return DummyClassificationDataModule(
+        root=str(root / "data"),
+        ood_detection=True,
+        batch_size=2,
+        num_workers=0,
+        persistent_workers=False,
+    )
+
+
+class TestClassificationDistillation:
+    """Testing the distillation routine."""
+
+    def test_teacher_targets(self):
+        logits = torch.randn(3, 2, 4)
+        probs = teacher_targets(logits, 3)
+        assert torch.allclose(probs, logits.softmax(-1).mean(1))
+        packed = logits.transpose(0, 1).flatten(0, 1)
+        assert torch.allclose(teacher_targets(packed, 3), probs)
+        assert torch.allclose(
+            teacher_targets(logits, 3, "logits"), logits.mean(1)
+        )
+
+    def test_fit(self):
+        teacher = deep_ensembles(dummy_model(1, 2, 1), num_estimators=2)
+        for matching in ["probs", "logits"]:
+            routine = _routine(
+                teacher, matching=matching, temperature=2, distill_weight=0.5
+            )
+            trainer = pl.Trainer(fast_dev_run=True, logger=False)
+            trainer.fit(routine, _datamodule())
+            trainer.test(routine, _datamodule())
+        assert not any(p.requires_grad for p in teacher.parameters())
+
+        # the teacher is neither optimized nor saved with the student
+        teacher_params = {id(p) for p in teacher.parameters()}
+        assert not teacher_params & {id(p) for p in routine.parameters()}
+        assert not any(k.startswith("teacher") for k in routine.state_dict())
+
+        routine = _routine(teacher, mixup_alpha=1.0)
+        trainer = pl.Trainer(fast_dev_run=True, logger=False)
+        trainer.fit(routine, _datamodule())
+
+    def test_cached(self, tmp_path):
+        teacher = dummy_model(1, 2, 2)
+        dm = _datamodule()
+        dm.setup("fit")
+        dataset = cache_teacher_targets(
+            teacher, dm.train, tmp_path / "teacher.npy", batch_size=3
+        )
+        input, target, teacher_target = dataset[1]
+        assert teacher_target.shape == (2,)
+        assert torch.allclose(
+            teacher_target,
+            teacher_targets(teacher(input.unsqueeze(0)), 1).squeeze(0),
+        )
+
+        routine = _routine(teacher)
+        trainer = pl.Trainer(fast_dev_run=True, logger=False)
+        trainer.fit(routine, DataLoader(dataset, batch_size=2))
+
+        routine = _routine(teacher, mixup_alpha=1.0)
+        trainer = pl.Trainer(fast_dev_run=True, logger=False)
+        with pytest.raises(ValueError):
+            trainer.fit(routine, DataLoader(dataset, batch_size=2))
+
+        with pytest.raises(ValueError):
+            cache_teacher_targets(teacher, [], tmp_path / "empty.npy")
+
+    def test_args(self):
+        parser = ClassificationDistillation.add_model_specific_args(
+            ArgumentParser()
+        )
+        args = parser.parse_args(["--mixup", "1", "--matching", "logits"])
+        assert args.mixup_alpha == 1
+        assert args.matching == "logits"
+        assert args.ood_bins is None
+
+    def test_errors(self):
+        teacher = dummy_model(1, 2, 2)
+        with pytest.raises(ValueError):
+            _routine(teacher, matching="features")
+        with pytest.raises(ValueError):
+            _routine(teacher, temperature=0)
+        with pytest.raises(ValueError):
+            _routine(teacher, distill_weight=2)
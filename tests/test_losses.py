@@ -6,7 +6,7 @@ import torch
 from torch import nn
 
 from torch_uncertainty.layers.bayesian import BayesLinear
-from torch_uncertainty.losses import ELBOLoss, NIGLoss
+from torch_uncertainty.losses import ELBOLoss, KLDiv, NIGLoss
 
 
 # fmt: on
@@ -33,6 +33,37 @@ class TestELBOLoss:
 
         loss(model(torch.randn(1, 1)), torch.randn(1, 1))
 
+    def test_analytic_kl(self):
+        model = BayesLinear(1, 1)
+        criterion = nn.BCEWithLogitsLoss()
+
+        loss = ELBOLoss(
+            model, criterion, kl_weight=1e-5, num_samples=2, analytic_kl=True
+        )
+        loss(torch.randn(1, 1), torch.randn(1, 1)).backward()
+
+        kl_div = KLDiv(model, analytic=True)
+        assert torch.allclose(kl_div(), model.kl_divergence())
+
+        with pytest.raises(ValueError):
+            KLDiv(BayesLinear(1, 1, prior_pi=0.5), analytic=True)()
+
+    def test_vectorized(self):
+        model = BayesLinear(2, 1)
+        criterion = nn.BCEWithLogitsLoss()
+        inputs, targets = torch.randn(3, 2), torch.rand(3, 1)
+
+        loss = ELBOLoss(model, criterion, 1e-5, num_samples=1, vectorized=True)
+        torch.manual_seed(0)
+        value = loss(inputs, targets)
+        loss.vectorized = False
+        torch.manual_seed(0)
+        assert torch.allclose(value, loss(inputs, targets))
+
+        loss = ELBOLoss(model, criterion, 1e-5, num_samples=4, vectorized=True)
+        loss(inputs, targets).backward()
+        assert model.num_samples == 1
+
     def test_no_bayes(self):
         model = nn.Linear(1, 1)
         criterion = nn.BCEWithLogitsLoss()
@@ -18,9 +18,72 @@ class TestUtils:
 
         _ = utils.get_version("tests/testlog", version=42, checkpoint=45)
 
+    def test_getversion_deterministic(self, tmp_path):
+        folder = tmp_path / "version_0" / "checkpoints"
+        folder.mkdir(parents=True)
+        (folder / "last.ckpt").touch()
+        file, _ = utils.get_version(tmp_path, version=0)
+        assert file.name == "last.ckpt"
+
+        for name in ["epoch=9-step=90", "epoch=10-step=100", "epoch=2"]:
+            (folder / f"{name}.ckpt").touch()
+        file, _ = utils.get_version(tmp_path, version=0)
+        assert file.name == "epoch=10-step=100.ckpt"
+
+        file, _ = utils.get_version("tests/testlog", version=42)
+        assert file.name == "epoch=45-step=17986.ckpt"
+
     def test_getversion_log_failure(self):
         with pytest.raises(Exception):
             _ = utils.get_version("tests/testlog", version=52)
+        with pytest.raises(Exception):
+            _ = utils.get_version("tests/testlog", version=42, checkpoint=52)
+
+    def test_load_state_dicts(self, tmp_path):
+        models = [torch.nn.Linear(2, 3) for _ in range(3)]
+        checkpoints = []
+        for i, model in enumerate(models):
+            checkpoints.append(tmp_path / f"{i}.ckpt")
+            state_dict = {
+                f"model.{k}": v for k, v in model.state_dict().items()
+            }
+            torch.save({"state_dict": state_dict}, checkpoints[-1])
+
+        loaded = [torch.nn.Linear(2, 3) for _ in range(3)]
+        times = utils.load_state_dicts(loaded, checkpoints, num_workers=2)
+        assert len(times) == 3
+        for model, loaded_model in zip(models, loaded):
+            assert torch.equal(model.weight, loaded_model.weight)
+
+        with pytest.raises(ValueError):
+            utils.load_state_dicts(loaded, checkpoints[:2])
+
+    def test_mmap_state_dict(self, tmp_path):
+        state_dict = {
+            "weight": torch.randn(3, 5),
+            "transposed": torch.randn(5, 2).t(),
+            "num_batches_tracked": torch.tensor(7),
+            "empty": torch.zeros(0, 3),
+        }
+        utils.save_mmap_state_dict(state_dict, tmp_path / "state.mmap")
+        loaded = utils.load_mmap_state_dict(tmp_path / "state.mmap")
+        assert loaded.keys() == state_dict.keys()
+        for name, tensor in state_dict.items():
+            assert loaded[name].dtype == tensor.dtype
+            assert torch.equal(loaded[name], tensor)
+
+    def test_checkpoint_to_mmap(self, tmp_path):
+        weight = torch.randn(2, 2)
+        torch.save(
+            {"state_dict": {"model.weight": weight, "loss.weight": weight}},
+            tmp_path / "last.ckpt",
+        )
+        path = utils.checkpoint_to_mmap(tmp_path / "last.ckpt")
+        assert path == tmp_path / "last.mmap"
+        assert utils.checkpoint_to_mmap(tmp_path / "last.ckpt") == path
+        loaded = utils.load_mmap_state_dict(path)
+        assert loaded.keys() == {"weight"}
+        assert torch.equal(loaded["weight"], weight)
 
 
 class TestHub:
@@ -40,8 +103,6 @@ class TestCalibrationPlot:
     def test_failures(self):
         with pytest.raises(Exception):
             _ = CalibrationPlot(mode="full")
-        with pytest.raises(Exception):
-            _ = CalibrationPlot(adaptive=True)
         with pytest.raises(Exception):
             _ = CalibrationPlot(num_bins=0)
         with pytest.raises(Exception):
@@ -53,3 +114,13 @@ class TestCalibrationPlot:
             torch.tensor([[0.5, 0.2, 0.3], [0.5, 0.5, 0.0]]),
             torch.tensor([0, 1]),
         )
+
+    def test_adaptive(self):
+        cal_plot = CalibrationPlot(adaptive=True, num_bins=5)
+        cal_plot.update(torch.rand(100, 3).softmax(dim=-1), torch.zeros(100))
+        cal_plot.update(torch.rand(100, 3).softmax(dim=-1), torch.ones(100))
+        cal_plot.compute()
+
+    def test_binary(self):
+        cal_plot = CalibrationPlot()
+        cal_plot(torch.rand(100), torch.randint(0, 2, (100,)))
@@ -1,4 +1,5 @@
 # fmt: off
+import copy
 from argparse import ArgumentParser
 from pathlib import Path
 from typing import List, Literal, Optional, Union
@@ -8,13 +9,24 @@ from pytorch_lightning import LightningModule
 from ..models import deep_ensembles
 from ..routines.classification import ClassificationEnsemble
 from ..routines.regression import RegressionEnsemble
-from ..utils import get_version
+from ..utils import get_version, load_state_dicts
 from .classification import VGG, ResNet, WideResNet
 from .regression import MLP
 
 
 # fmt: on
 class DeepEnsembles:
+    """Deep Ensembles baseline, built from the checkpoints of its members.
+
+    Note:
+        The members are all loaded in memory. To evaluate ensembles larger
+        than the memory, convert their checkpoints with
+        :func:`torch_uncertainty.utils.checkpoint_to_mmap` and
+        evaluate them member by member with
+        :func:`torch_uncertainty.models.lazy_deep_ensembles` and its
+        ``predict`` method, which the routines do not support.
+    """
+
     backbones = {
         "mlp": MLP,
         "resnet": ResNet,
@@ -35,6 +47,8 @@ class DeepEnsembles:
         use_logits: bool = False,
         use_mi: bool = False,
         use_variation_ratio: bool = False,
+        fast_load: bool = False,
+        load_threads: Optional[int] = None,
         **kwargs,
     ) -> LightningModule:
         if isinstance(log_path, str):
@@ -42,11 +56,15 @@ class DeepEnsembles:
 
         backbone_cls = cls.backbones[backbone]
 
-        models = []
+        models, checkpoints = [], []
         for version in checkpoint_ids:  # coverage: ignore
             ckpt_file, hparams_file = get_version(
                 root=log_path, version=version
             )
+            checkpoints.append(ckpt_file)
+            # the fast-loaded ensembles only build the first member
+            if models and fast_load:
+                continue
             trained_model = backbone_cls.load_from_checkpoint(
                 checkpoint_path=ckpt_file,
                 hparams_file=hparams_file,
@@ -55,6 +73,11 @@ class DeepEnsembles:
             ).eval()
             models.append(trained_model.model)
 
+        if fast_load and models:  # coverage: ignore
+            models += [copy.deepcopy(models[0]) for _ in checkpoints[1:]]
+            load_state_dicts(
+                models[1:], checkpoints[1:], num_workers=load_threads
+            )
         de = deep_ensembles(models=models)
 
         if task == "classification":
@@ -108,4 +131,16 @@ class DeepEnsembles:
             help="Root directory of the models",
             required=True,
         )
+        parser.add_argument(
+            "--fast_load",
+            action="store_true",
+            help="Load the state dicts of the members in parallel into "
+            "copies of the first one",
+        )
+        parser.add_argument(
+            "--load_threads",
+            type=int,
+            default=None,
+            help="Number of threads loading the members with --fast_load",
+        )
         return parser
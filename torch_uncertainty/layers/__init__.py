@@ -1,5 +1,14 @@
 # flake8: noqa
 from .batch_ensemble import BatchConv2d, BatchLinear
-from .bayesian import BayesConv1d, BayesConv2d, BayesConv3d, BayesLinear
+from .bayesian import (
+    BayesConv1d,
+    BayesConv2d,
+    BayesConv3d,
+    BayesLinear,
+    FlipoutConv1d,
+    FlipoutConv2d,
+    FlipoutConv3d,
+    FlipoutLinear,
+)
 from .masksembles import MaskedConv2d, MaskedLinear
 from .packed import PackedConv1d, PackedConv2d, PackedConv3d, PackedLinear
@@ -7,8 +7,26 @@ from torch import nn
 from torch.nn.common_types import _size_2_t
 from torch.nn.modules.utils import _pair
 
+from .packed import PackedConv2d, PackedLinear
+
 
 # fmt: on
+def _fold_batchnorm(
+    weight: torch.Tensor,
+    bias: Optional[torch.Tensor],
+    bn: nn.modules.batchnorm._BatchNorm,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Fold a BatchNorm layer in eval mode into the per-estimator weights of
+    shape :math:`(M, C_{out}, ...)` and biases of shape :math:`(M, C_{out})`.
+    """
+    scale = bn.weight / torch.sqrt(bn.running_var + bn.eps)
+    if bias is None:
+        bias = weight.new_zeros(weight.shape[:2])
+    weight = weight * scale.view(1, -1, *([1] * (weight.dim() - 2)))
+    bias = (bias - bn.running_mean) * scale + bn.bias
+    return weight, bias
+
+
 class BatchLinear(nn.Module):
     r"""Applies a linear transformation using BatchEnsemble method to the
     incoming data: :math:`y=(x\circ \hat{R})W^{T}\circ \hat{S} + \hat{b}`.
@@ -124,6 +142,11 @@ class BatchLinear(nn.Module):
             nn.init.uniform_(self.bias, -bound, bound)
 
     def forward(self, input: torch.Tensor) -> torch.Tensor:
+        if input.size(0) % self.num_estimators == 0:
+            return self._broadcast_forward(input)
+        return self._expanded_forward(input)
+
+    def _expanded_forward(self, input: torch.Tensor) -> torch.Tensor:
         batch_size = input.size(0)
         examples_per_estimator = torch.tensor(
             batch_size // self.num_estimators, device=input.device
@@ -147,6 +170,54 @@ class BatchLinear(nn.Module):
 
         return self.linear(input * R) * S + (bias if bias is not None else 0)
 
+    def _broadcast_forward(self, input: torch.Tensor) -> torch.Tensor:
+        # View the batch as (M, N/M, ...) and broadcast R, S and the bias
+        # along the examples instead of expanding them to the batch size.
+        x = input.reshape(self.num_estimators, -1, *input.shape[1:])
+        out = self.linear(x * self.R.unsqueeze(1))
+        if self.bias is not None:
+            out = torch.addcmul(
+                self.bias.unsqueeze(1), out, self.S.unsqueeze(1)
+            )
+        else:
+            out = out * self.S.unsqueeze(1)
+        return out.flatten(0, 1)
+
+    @torch.no_grad()
+    def fold(self) -> PackedLinear:
+        r"""Fold the estimators into a single grouped linear layer for
+        inference.
+
+        The :math:`M` weights :math:`W\circ(s_i r_i^T)` are materialized in a
+        :class:`~torch_uncertainty.layers.PackedLinear` layer using the
+        estimator-major packed layout: it takes inputs of shape
+        :math:`(N, M \times H_{in})` and returns outputs of shape
+        :math:`(M \times N, H_{out})`, ordered as the outputs of this layer.
+
+        Returns:
+            PackedLinear: The equivalent grouped linear layer.
+        """
+        weight = (
+            self.S.unsqueeze(-1)
+            * self.linear.weight.unsqueeze(0)
+            * self.R.unsqueeze(1)
+        )
+        folded = PackedLinear(
+            self.in_features,
+            self.out_features,
+            alpha=self.num_estimators,
+            num_estimators=self.num_estimators,
+            bias=self.bias is not None,
+            last=True,
+            packed_layout=True,
+            device=weight.device,
+            dtype=weight.dtype,
+        )
+        folded.weight.copy_(weight.reshape_as(folded.weight))
+        if self.bias is not None:
+            folded.bias.copy_(self.bias.flatten())
+        return folded
+
     def extra_repr(self) -> str:
         return (
             f"in_features={ self.in_features},"
@@ -337,6 +408,11 @@ class BatchConv2d(nn.Module):
             nn.init.uniform_(self.bias, -bound, bound)
 
     def forward(self, input: torch.Tensor) -> torch.Tensor:
+        if input.size(0) % self.num_estimators == 0:
+            return self._broadcast_forward(input)
+        return self._expanded_forward(input)
+
+    def _expanded_forward(self, input: torch.Tensor) -> torch.Tensor:
         batch_size = input.size(0)
         examples_per_estimator = batch_size // self.num_estimators
         extra = batch_size % self.num_estimators
@@ -392,6 +468,78 @@ class BatchConv2d(nn.Module):
 
         return self.conv(input * R) * S + (bias if bias is not None else 0)
 
+    def _broadcast_forward(self, input: torch.Tensor) -> torch.Tensor:
+        # View the batch as (M, N/M, C, H, W) and broadcast R, S and the bias
+        # along the examples instead of expanding them to the batch size.
+        x = input.reshape(self.num_estimators, -1, *input.shape[1:])
+        x = x * self.R[:, None, :, None, None]
+        out = self.conv(x.flatten(0, 1))
+        out = out.reshape(self.num_estimators, -1, *out.shape[1:])
+        if self.bias is not None:
+            out = torch.addcmul(
+                self.bias[:, None, :, None, None],
+                out,
+                self.S[:, None, :, None, None],
+            )
+        else:
+            out = out * self.S[:, None, :, None, None]
+        return out.flatten(0, 1)
+
+    @torch.no_grad()
+    def fold(self, bn: Optional[nn.BatchNorm2d] = None) -> PackedConv2d:
+        r"""Fold the estimators into a single grouped convolution for
+        inference.
+
+        The :math:`M` weights :math:`W\circ(s_i r_i^T)` are materialized in a
+        :class:`~torch_uncertainty.layers.PackedConv2d` layer with
+        :math:`M \times \text{groups}` groups. It takes inputs of shape
+        :math:`(N, M \times C_{in}, H_{in}, W_{in})` where the channels of
+        the :math:`i^{th}` estimator are contiguous and returns outputs in the
+        same layout.
+
+        Args:
+            bn (nn.BatchNorm2d, optional): BatchNorm layer following this
+                layer to fold in the convolution. It must be in eval mode.
+                Defaults to ``None``.
+
+        Returns:
+            PackedConv2d: The equivalent grouped convolution.
+        """
+        groups = self.conv.groups
+        weight = self.conv.weight
+        # input scaling of each output channel, given the group it belongs to
+        R = self.R.view(self.num_estimators, groups, 1, -1).expand(
+            -1, -1, self.out_channels // groups, -1
+        )
+        weight = (
+            self.S[:, :, None, None, None]
+            * weight.unsqueeze(0)
+            * R.reshape(self.num_estimators, self.out_channels, -1, 1, 1)
+        )
+        bias = self.bias
+        if bn is not None:
+            weight, bias = _fold_batchnorm(weight, bias, bn)
+
+        folded = PackedConv2d(
+            self.in_channels,
+            self.out_channels,
+            kernel_size=self.kernel_size,
+            alpha=self.num_estimators,
+            num_estimators=self.num_estimators,
+            stride=self.stride,
+            padding=self.padding,
+            dilation=self.dilation,
+            groups=groups,
+            bias=bias is not None,
+            padding_mode=self.conv.padding_mode,
+            device=weight.device,
+            dtype=weight.dtype,
+        )
+        folded.weight.copy_(weight.reshape_as(folded.weight))
+        if bias is not None:
+            folded.bias.copy_(bias.flatten())
+        return folded
+
     def extra_repr(self):
         s = (
             "{in_channels}, {out_channels}, kernel_size={kernel_size}"
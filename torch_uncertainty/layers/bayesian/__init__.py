@@ -1,5 +1,6 @@
 # flake8: noqa
 from .bayes_conv import BayesConv1d, BayesConv2d, BayesConv3d
 from .bayes_linear import BayesLinear
+from .flipout import FlipoutConv1d, FlipoutConv2d, FlipoutConv3d, FlipoutLinear
 
 bayesian_modules = (BayesConv1d, BayesConv2d, BayesConv3d, BayesLinear)
@@ -2,6 +2,7 @@
 from typing import List, Optional, Tuple, Union
 
 import torch
+from einops import rearrange
 from torch import Tensor
 from torch.nn import Module
 from torch.nn import functional as F
@@ -36,7 +37,11 @@ class _BayesConvNd(Module):
     __annotations__ = {"bias": Optional[torch.Tensor]}
 
     def _conv_forward(
-        self, input: Tensor, weight: Tensor, bias: Optional[Tensor]
+        self,
+        input: Tensor,
+        weight: Tensor,
+        bias: Optional[Tensor],
+        groups: Optional[int] = None,
     ) -> Tensor:  # coverage: ignore
         ...
 
@@ -52,14 +57,13 @@ class _BayesConvNd(Module):
     mu_init: float
     sigma_init: float
     frozen: bool
+    local_reparameterization: bool
     transposed: bool
     output_padding: Tuple[int, ...]
     groups: int
     padding_mode: str
     weight: Tensor
     bias: Optional[Tensor]
-    lprior: Tensor
-    lvposterior: Tensor
 
     def __init__(
         self,
@@ -80,6 +84,7 @@ class _BayesConvNd(Module):
         groups: int,
         bias: bool,
         padding_mode: str,
+        local_reparameterization: bool = False,
         device=None,
         dtype=None,
     ) -> None:
@@ -115,6 +120,8 @@ class _BayesConvNd(Module):
         self.output_padding = output_padding
         self.groups = groups
         self.padding_mode = padding_mode
+        self.local_reparameterization = local_reparameterization
+        self.num_samples = 1
 
         self._reversed_padding_repeated_twice = _reverse_repeat_tuple(
             self.padding, 2
@@ -171,6 +178,93 @@ class _BayesConvNd(Module):
             init.normal_(self.bias_mu, mean=self.mu_init, std=0.1)
             init.normal_(self.bias_sigma, mean=self.sigma_init, std=0.1)
 
+    def forward(self, input: Tensor) -> Tensor:
+        if self.frozen:
+            weight = self.weight_mu
+            bias = self.bias_mu
+        elif self.local_reparameterization:
+            return self._local_forward(input)
+        elif self.num_samples > 1:
+            return self._batched_forward(input)
+        else:
+            weight = self.weight_sampler.sample()
+
+            if self.bias_mu is not None:
+                bias = self.bias_sampler.sample()
+            else:
+                bias = None
+
+        return self._conv_forward(input, weight, bias)
+
+    def _batched_forward(self, input: Tensor) -> Tensor:
+        """Evaluate :attr:`num_samples` weight samples at once on an input
+        tiled :attr:`num_samples` times along the batch dimension, with one
+        convolution grouped by sample.
+        """
+        weight = self.weight_sampler.sample(self.num_samples)
+        if self.bias_mu is not None:
+            bias = self.bias_sampler.sample(self.num_samples).flatten()
+        else:
+            bias = None
+        input = rearrange(
+            input, "(s b) c ... -> b (s c) ...", s=self.num_samples
+        )
+        out = self._conv_forward(
+            input,
+            weight.flatten(0, 1),
+            bias,
+            groups=self.num_samples * self.groups,
+        )
+        return rearrange(out, "b (s c) ... -> (s b) c ...", s=self.num_samples)
+
+    def _local_forward(self, input: Tensor) -> Tensor:
+        weight_var = torch.log1p(torch.exp(self.weight_sigma)) ** 2
+        if self.bias_mu is not None:
+            bias_var = torch.log1p(torch.exp(self.bias_sigma)) ** 2
+        else:
+            bias_var = None
+
+        mean = self._conv_forward(input, self.weight_mu, self.bias_mu)
+        var = self._conv_forward(input**2, weight_var, bias_var)
+        return mean + var.clamp_min(1e-16).sqrt() * torch.randn_like(mean)
+
+    @property
+    def lvposterior(self) -> Tensor:
+        """Log-posterior of the weights of the last forward, computed on
+        demand. Its expectation in closed form with the local
+        reparameterization.
+        """
+        samplers = [self.weight_sampler]
+        if self.bias_mu is not None:
+            samplers.append(self.bias_sampler)
+        if self.local_reparameterization:
+            return sum(sampler.expected_log_posterior() for sampler in samplers)
+        return sum(sampler.log_posterior() for sampler in samplers)
+
+    @property
+    def lprior(self) -> Tensor:
+        """Log-prior of the weights of the last forward, computed on demand.
+        Its expectation with the local reparameterization.
+        """
+        pairs = [(self.weight_sampler, self.weight_prior_dist)]
+        if self.bias_mu is not None:
+            pairs.append((self.bias_sampler, self.bias_prior_dist))
+        if self.local_reparameterization:
+            return sum(prior.expected_log_prior(post) for post, prior in pairs)
+        return sum(
+            prior.log_prior(post.weight) / post.num_samples
+            for post, prior in pairs
+        )
+
+    def kl_divergence(self) -> Tensor:
+        """Closed-form KL divergence between the posterior and the Gaussian
+        prior of the layer.
+        """
+        kl = self.weight_prior_dist.kl_divergence(self.weight_sampler)
+        if self.bias_mu is not None:
+            kl = kl + self.bias_prior_dist.kl_divergence(self.bias_sampler)
+        return kl
+
     def freeze(self) -> None:
         """Freeze the layer by setting the frozen attribute to True."""
         self.frozen = True
@@ -179,11 +273,19 @@ class _BayesConvNd(Module):
         """Unfreeze the layer by setting the frozen attribute to False."""
         self.frozen = False
 
-    def sample(self) -> Tuple[Tensor, Optional[Tensor]]:
-        """Sample the bayesian layer's posterior."""
-        weight = self.weight_sampler.sample()
+    def sample(
+        self, num_samples: Optional[int] = None
+    ) -> Tuple[Tensor, Optional[Tensor]]:
+        """Sample the bayesian layer's posterior.
+
+        Args:
+            num_samples (int, optional): Number of samples stacked along a new
+                first dimension. Defaults to None, for a single sample with
+                the shape of the parameters.
+        """
+        weight = self.weight_sampler.sample(num_samples)
         if self.bias_mu is not None:
-            bias = self.bias_sampler.sample()
+            bias = self.bias_sampler.sample(num_samples)
         else:
             bias = None
         return weight, bias
@@ -235,6 +337,7 @@ class BayesConv1d(_BayesConvNd):
         groups: int = 1,
         bias: bool = True,
         padding_mode: str = "zeros",  # TODO: refine this type
+        local_reparameterization: bool = False,
         device=None,
         dtype=None,
     ) -> None:
@@ -261,12 +364,18 @@ class BayesConv1d(_BayesConvNd):
             groups,
             bias,
             padding_mode,
+            local_reparameterization,
             **factory_kwargs,
         )
 
     def _conv_forward(
-        self, input: Tensor, weight: Tensor, bias: Optional[Tensor]
+        self,
+        input: Tensor,
+        weight: Tensor,
+        bias: Optional[Tensor],
+        groups: Optional[int] = None,
     ) -> Tensor:
+        groups = groups or self.groups
         if self.padding_mode != "zeros":
             return F.conv1d(
                 F.pad(
@@ -279,7 +388,7 @@ class BayesConv1d(_BayesConvNd):
                 self.stride,
                 _single(0),
                 self.dilation,
-                self.groups,
+                groups,
             )
         return F.conv1d(
             input,
@@ -288,30 +397,9 @@ class BayesConv1d(_BayesConvNd):
             self.stride,
             self.padding,
             self.dilation,
-            self.groups,
+            groups,
         )
 
-    def forward(self, input: Tensor) -> Tensor:
-        if self.frozen:
-            weight = self.weight_mu
-            bias = self.bias_mu
-        else:
-            weight = self.weight_sampler.sample()
-
-            if self.bias_mu is not None:
-                bias = self.bias_sampler.sample()
-                bias_lposterior = self.bias_sampler.log_posterior()
-                bias_lprior = self.bias_prior_dist.log_prior(bias)
-            else:
-                bias, bias_lposterior, bias_lprior = None, 0, 0
-
-            self.lvposterior = (
-                self.weight_sampler.log_posterior() + bias_lposterior
-            )
-            self.lprior = self.weight_prior_dist.log_prior(weight) + bias_lprior
-
-        return self._conv_forward(input, weight, bias)
-
 
 class BayesConv2d(_BayesConvNd):
     """Bayesian Conv2d Layer with Mixture of Normals prior and Normal
@@ -335,6 +423,7 @@ class BayesConv2d(_BayesConvNd):
         groups: int = 1,
         bias: bool = True,
         padding_mode: str = "zeros",  # TODO: refine this type
+        local_reparameterization: bool = False,
         device=None,
         dtype=None,
     ) -> None:
@@ -361,12 +450,18 @@ class BayesConv2d(_BayesConvNd):
             groups,
             bias,
             padding_mode,
+            local_reparameterization,
             **factory_kwargs,
         )
 
     def _conv_forward(
-        self, input: Tensor, weight: Tensor, bias: Optional[Tensor]
+        self,
+        input: Tensor,
+        weight: Tensor,
+        bias: Optional[Tensor],
+        groups: Optional[int] = None,
     ) -> Tensor:
+        groups = groups or self.groups
         if self.padding_mode != "zeros":
             return F.conv2d(
                 F.pad(
@@ -379,7 +474,7 @@ class BayesConv2d(_BayesConvNd):
                 self.stride,
                 _pair(0),
                 self.dilation,
-                self.groups,
+                groups,
             )
         return F.conv2d(
             input,
@@ -388,30 +483,9 @@ class BayesConv2d(_BayesConvNd):
             self.stride,
             self.padding,
             self.dilation,
-            self.groups,
+            groups,
         )
 
-    def forward(self, input: Tensor) -> Tensor:
-        if self.frozen:
-            weight = self.weight_mu
-            bias = self.bias_mu
-        else:
-            weight = self.weight_sampler.sample()
-
-            if self.bias_mu is not None:
-                bias = self.bias_sampler.sample()
-                bias_lposterior = self.bias_sampler.log_posterior()
-                bias_lprior = self.bias_prior_dist.log_prior(bias)
-            else:
-                bias, bias_lposterior, bias_lprior = None, 0, 0
-
-            self.lvposterior = (
-                self.weight_sampler.log_posterior() + bias_lposterior
-            )
-            self.lprior = self.weight_prior_dist.log_prior(weight) + bias_lprior
-
-        return self._conv_forward(input, weight, bias)
-
 
 class BayesConv3d(_BayesConvNd):
     """Bayesian Conv3d Layer with Mixture of Normals prior and Normal
@@ -435,6 +509,7 @@ class BayesConv3d(_BayesConvNd):
         groups: int = 1,
         bias: bool = True,
         padding_mode: str = "zeros",
+        local_reparameterization: bool = False,
         device=None,
         dtype=None,
     ) -> None:
@@ -461,12 +536,18 @@ class BayesConv3d(_BayesConvNd):
             groups,
             bias,
             padding_mode,
+            local_reparameterization,
             **factory_kwargs,
         )
 
     def _conv_forward(
-        self, input: Tensor, weight: Tensor, bias: Optional[Tensor]
+        self,
+        input: Tensor,
+        weight: Tensor,
+        bias: Optional[Tensor],
+        groups: Optional[int] = None,
     ) -> Tensor:
+        groups = groups or self.groups
         if self.padding_mode != "zeros":
             return F.conv3d(
                 F.pad(
@@ -479,7 +560,7 @@ class BayesConv3d(_BayesConvNd):
                 self.stride,
                 _triple(0),
                 self.dilation,
-                self.groups,
+                groups,
             )
         return F.conv3d(
             input,
@@ -488,26 +569,5 @@ class BayesConv3d(_BayesConvNd):
             self.stride,
             self.padding,
             self.dilation,
-            self.groups,
+            groups,
         )
-
-    def forward(self, input: Tensor) -> Tensor:
-        if self.frozen:
-            weight = self.weight_mu
-            bias = self.bias_mu
-        else:
-            weight = self.weight_sampler.sample()
-
-            if self.bias_mu is not None:
-                bias = self.bias_sampler.sample()
-                bias_lposterior = self.bias_sampler.log_posterior()
-                bias_lprior = self.bias_prior_dist.log_prior(bias)
-            else:
-                bias, bias_lposterior, bias_lprior = None, 0, 0
-
-            self.lvposterior = (
-                self.weight_sampler.log_posterior() + bias_lposterior
-            )
-            self.lprior = self.weight_prior_dist.log_prior(weight) + bias_lprior
-
-        return self._conv_forward(input, weight, bias)
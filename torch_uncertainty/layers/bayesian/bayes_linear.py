@@ -28,20 +28,29 @@ class BayesLinear(nn.Module):
         frozen (bool, optional): Whether to freeze the posterior distribution.
             Defaults to False.
         bias (bool, optional): Whether to use a bias term. Defaults to True.
+        local_reparameterization (bool, optional): Whether to sample the
+            pre-activations from their Gaussian distribution instead of
+            sampling one weight for the whole batch. Defaults to False.
         device (optional): Device to use. Defaults to None.
         dtype (optional): Data type to use. Defaults to None.
 
+    Note:
+        Set :attr:`num_samples` to evaluate several weight samples in one
+        forward pass. The input batch must then be tiled :attr:`num_samples`
+        times, sample-major.
+
     Paper Reference:
         Blundell, Charles, et al. "Weight uncertainty in neural networks"
         ICML 2015.
+
+        Kingma, Durk P., et al. "Variational dropout and the local
+        reparameterization trick" NeurIPS 2015.
     """
 
     __constants__ = ["in_features", "out_features"]
     in_features: int
     out_features: int
     weight: Tensor
-    lprior: Tensor
-    lvposterior: Tensor
 
     def __init__(
         self,
@@ -54,6 +63,7 @@ class BayesLinear(nn.Module):
         sigma_init: float = -7.0,
         frozen: bool = False,
         bias: bool = True,
+        local_reparameterization: bool = False,
         device=None,
         dtype=None,
     ) -> None:
@@ -68,6 +78,8 @@ class BayesLinear(nn.Module):
         self.mu_init = mu_init
         self.sigma_init = sigma_init
         self.frozen = frozen
+        self.local_reparameterization = local_reparameterization
+        self.num_samples = 1
 
         self.weight_mu = nn.Parameter(
             torch.empty((out_features, in_features), **factory_kwargs)
@@ -116,6 +128,10 @@ class BayesLinear(nn.Module):
     def forward(self, input: Tensor) -> Tensor:
         if self.frozen:
             return self._frozen_forward(input)
+        elif self.local_reparameterization:
+            return self._local_forward(input)
+        elif self.num_samples > 1:
+            return self._batched_forward(input)
         else:
             return self._forward(input)
 
@@ -127,16 +143,74 @@ class BayesLinear(nn.Module):
 
         if self.bias_mu is not None:
             bias = self.bias_sampler.sample()
-            bias_lposterior = self.bias_sampler.log_posterior()
-            bias_lprior = self.bias_prior_dist.log_prior(bias)
         else:
-            bias, bias_lposterior, bias_lprior = None, 0, 0
-
-        self.lvposterior = self.weight_sampler.log_posterior() + bias_lposterior
-        self.lprior = self.weight_prior_dist.log_prior(weight) + bias_lprior
+            bias = None
 
         return F.linear(input, weight, bias)
 
+    def _batched_forward(self, input: Tensor) -> Tensor:
+        """Evaluate :attr:`num_samples` weight samples at once on an input
+        tiled :attr:`num_samples` times along the batch dimension.
+        """
+        weight = self.weight_sampler.sample(self.num_samples)
+        input_ = input.reshape(self.num_samples, -1, self.in_features)
+        if self.bias_mu is not None:
+            bias = self.bias_sampler.sample(self.num_samples)
+            out = torch.baddbmm(
+                bias.unsqueeze(1), input_, weight.transpose(1, 2)
+            )
+        else:
+            out = torch.bmm(input_, weight.transpose(1, 2))
+        return out.reshape(*input.shape[:-1], self.out_features)
+
+    def _local_forward(self, input: Tensor) -> Tensor:
+        weight_var = torch.log1p(torch.exp(self.weight_sigma)) ** 2
+        if self.bias_mu is not None:
+            bias_var = torch.log1p(torch.exp(self.bias_sigma)) ** 2
+        else:
+            bias_var = None
+
+        mean = F.linear(input, self.weight_mu, self.bias_mu)
+        var = F.linear(input**2, weight_var, bias_var)
+        return mean + var.clamp_min(1e-16).sqrt() * torch.randn_like(mean)
+
+    @property
+    def lvposterior(self) -> Tensor:
+        """Log-posterior of the weights of the last forward, computed on
+        demand. Its expectation in closed form with the local
+        reparameterization.
+        """
+        samplers = [self.weight_sampler]
+        if self.bias_mu is not None:
+            samplers.append(self.bias_sampler)
+        if self.local_reparameterization:
+            return sum(sampler.expected_log_posterior() for sampler in samplers)
+        return sum(sampler.log_posterior() for sampler in samplers)
+
+    @property
+    def lprior(self) -> Tensor:
+        """Log-prior of the weights of the last forward, computed on demand.
+        Its expectation with the local reparameterization.
+        """
+        pairs = [(self.weight_sampler, self.weight_prior_dist)]
+        if self.bias_mu is not None:
+            pairs.append((self.bias_sampler, self.bias_prior_dist))
+        if self.local_reparameterization:
+            return sum(prior.expected_log_prior(post) for post, prior in pairs)
+        return sum(
+            prior.log_prior(post.weight) / post.num_samples
+            for post, prior in pairs
+        )
+
+    def kl_divergence(self) -> Tensor:
+        """Closed-form KL divergence between the posterior and the Gaussian
+        prior of the layer.
+        """
+        kl = self.weight_prior_dist.kl_divergence(self.weight_sampler)
+        if self.bias_mu is not None:
+            kl = kl + self.bias_prior_dist.kl_divergence(self.bias_sampler)
+        return kl
+
     def freeze(self) -> None:
         """Freeze the layer by setting the frozen attribute to True."""
         self.frozen = True
@@ -145,11 +219,19 @@ class BayesLinear(nn.Module):
         """Unfreeze the layer by setting the frozen attribute to False."""
         self.frozen = False
 
-    def sample(self) -> Tuple[Tensor, Optional[Tensor]]:
-        """Sample the bayesian layer's posterior."""
-        weight = self.weight_sampler.sample()
+    def sample(
+        self, num_samples: Optional[int] = None
+    ) -> Tuple[Tensor, Optional[Tensor]]:
+        """Sample the bayesian layer's posterior.
+
+        Args:
+            num_samples (int, optional): Number of samples stacked along a new
+                first dimension. Defaults to None, for a single sample with
+                the shape of the parameters.
+        """
+        weight = self.weight_sampler.sample(num_samples)
         if self.bias_mu is not None:
-            bias = self.bias_sampler.sample()
+            bias = self.bias_sampler.sample(num_samples)
         else:
             bias = None
         return weight, bias
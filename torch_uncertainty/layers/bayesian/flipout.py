@@ -0,0 +1,151 @@
+# fmt: off
+from typing import Tuple
+
+import torch
+import torch.nn.functional as F
+from einops import rearrange
+from torch import Tensor
+
+from .bayes_conv import BayesConv1d, BayesConv2d, BayesConv3d
+from .bayes_linear import BayesLinear
+
+__all__ = ["FlipoutLinear", "FlipoutConv1d", "FlipoutConv2d", "FlipoutConv3d"]
+
+
+# fmt: on
+def _random_signs(shape: Tuple[int, ...], like: Tensor) -> Tensor:
+    """Draw a tensor of random signs with the dtype and device of
+    :attr:`like`.
+    """
+    signs = torch.empty(shape, dtype=like.dtype, device=like.device)
+    return signs.bernoulli_(0.5).mul_(2).sub_(1)
+
+
+class FlipoutLinear(BayesLinear):
+    """Bayesian Linear Layer trained with the Flipout estimator.
+
+    The weight perturbation sampled at each forward pass is shared by the
+    batch but multiplied by random sign vectors specific to each example,
+    which decorrelates the gradients of the examples for about twice the cost
+    of a deterministic layer. The arguments are the ones of
+    :class:`BayesLinear`; the local reparameterization is not used. With
+    :attr:`num_samples` > 1, each of the :attr:`num_samples` tiles of the
+    batch gets its own weight perturbation.
+
+    Paper Reference:
+        Wen, Yeming, et al. "Flipout: Efficient pseudo-independent weight
+        perturbations on mini-batches" ICLR 2018.
+    """
+
+    def forward(self, input: Tensor) -> Tensor:
+        if self.frozen:
+            return self._frozen_forward(input)
+        if self.num_samples > 1:
+            return self._batched_forward(input)
+
+        weight = self.weight_sampler.sample()
+        if self.bias_mu is not None:
+            bias = self.bias_sampler.sample()
+        else:
+            bias = None
+
+        out = F.linear(input, self.weight_mu, bias)
+        perturbation = F.linear(
+            input * _random_signs(input.shape, input),
+            weight - self.weight_mu,
+        )
+        return out + perturbation * _random_signs(out.shape, out)
+
+    def _batched_forward(self, input: Tensor) -> Tensor:
+        """Evaluate :attr:`num_samples` weight perturbations at once on an
+        input tiled :attr:`num_samples` times along the batch dimension.
+        """
+        weight, bias = self.sample(self.num_samples)
+        input_ = input.reshape(self.num_samples, -1, self.in_features)
+        out = F.linear(input_, self.weight_mu)
+        if bias is not None:
+            out = out + bias.unsqueeze(1)
+        perturbation = torch.bmm(
+            input_ * _random_signs(input_.shape, input_),
+            (weight - self.weight_mu).transpose(1, 2),
+        )
+        out = out + perturbation * _random_signs(out.shape, out)
+        return out.reshape(*input.shape[:-1], self.out_features)
+
+
+class _FlipoutConvMixin:
+    """Flipout forward shared by the Bayesian convolutions. The sign vectors
+    are drawn per example and per channel.
+    """
+
+    def forward(self, input: Tensor) -> Tensor:
+        if self.frozen:
+            return self._conv_forward(input, self.weight_mu, self.bias_mu)
+        if self.num_samples > 1:
+            return self._batched_forward(input)
+
+        weight = self.weight_sampler.sample()
+        if self.bias_mu is not None:
+            bias = self.bias_sampler.sample()
+        else:
+            bias = None
+
+        out = self._conv_forward(input, self.weight_mu, bias)
+        spatial = (1,) * (input.dim() - 2)
+        perturbation = self._conv_forward(
+            input * _random_signs((*input.shape[:2], *spatial), input),
+            weight - self.weight_mu,
+            None,
+        )
+        return out + perturbation * _random_signs(
+            (*out.shape[:2], *spatial), out
+        )
+
+    def _batched_forward(self, input: Tensor) -> Tensor:
+        """Evaluate :attr:`num_samples` weight perturbations at once on an
+        input tiled :attr:`num_samples` times along the batch dimension, with
+        one convolution grouped by sample.
+        """
+        weight, bias = self.sample(self.num_samples)
+        out = self._conv_forward(input, self.weight_mu, None)
+        spatial = (1,) * (input.dim() - 2)
+        input = rearrange(
+            input * _random_signs((*input.shape[:2], *spatial), input),
+            "(s b) c ... -> b (s c) ...",
+            s=self.num_samples,
+        )
+        perturbation = self._conv_forward(
+            input,
+            (weight - self.weight_mu).flatten(0, 1),
+            None,
+            groups=self.num_samples * self.groups,
+        )
+        perturbation = rearrange(
+            perturbation, "b (s c) ... -> (s b) c ...", s=self.num_samples
+        )
+        out = out + perturbation * _random_signs(
+            (*out.shape[:2], *spatial), out
+        )
+        if bias is not None:
+            out = out.reshape(self.num_samples, -1, *out.shape[1:])
+            out = out + bias.reshape(self.num_samples, 1, -1, *spatial)
+            out = out.flatten(0, 1)
+        return out
+
+
+class FlipoutConv1d(_FlipoutConvMixin, BayesConv1d):
+    """Bayesian Conv1d Layer trained with the Flipout estimator. See
+    :class:`FlipoutLinear`.
+    """
+
+
+class FlipoutConv2d(_FlipoutConvMixin, BayesConv2d):
+    """Bayesian Conv2d Layer trained with the Flipout estimator. See
+    :class:`FlipoutLinear`.
+    """
+
+
+class FlipoutConv3d(_FlipoutConvMixin, BayesConv3d):
+    """Bayesian Conv3d Layer trained with the Flipout estimator. See
+    :class:`FlipoutLinear`.
+    """
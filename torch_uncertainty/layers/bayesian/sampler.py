@@ -21,11 +21,21 @@ class TrainableDistribution(nn.Module):
         self.rho = rho
         self.sigma = None
         self.weight = None
+        self.num_samples = 1
 
-    def sample(self) -> Tensor:
-        w_sample = torch.normal(
-            mean=0, std=1, size=self.mu.shape, device=self.mu.device
-        )
+    def sample(self, num_samples: Optional[int] = None) -> Tensor:
+        """Sample the posterior.
+
+        Args:
+            num_samples (int, optional): Number of samples stacked along a new
+                first dimension. Defaults to None, for a single sample with
+                the shape of the parameters.
+        """
+        size = self.mu.shape
+        if num_samples is not None:
+            size = (num_samples, *size)
+        w_sample = torch.normal(mean=0, std=1, size=size, device=self.mu.device)
+        self.num_samples = num_samples or 1
         self.sigma = torch.log1p(torch.exp(self.rho)).to(self.mu.device)
         self.weight = self.mu + self.sigma * w_sample
         return self.weight
@@ -45,7 +55,14 @@ class TrainableDistribution(nn.Module):
             + (((weight - self.mu) ** 2) / (2 * self.sigma**2))
             + 0.5
         )
-        return -lposterior.sum()
+        return -lposterior.sum() / self.num_samples
+
+    def expected_log_posterior(self) -> Tensor:
+        """Closed-form expectation of the log posterior under the posterior,
+        i.e. its negative entropy. Also updates :attr:`sigma`.
+        """
+        self.sigma = torch.log1p(torch.exp(self.rho))
+        return -(self.lsqrt2pi + torch.log(self.sigma) + 0.5).sum()
 
 
 class PriorDistribution(nn.Module):
@@ -56,18 +73,72 @@ class PriorDistribution(nn.Module):
         pi: float,
     ) -> None:
         super().__init__()
-        self.pi = torch.tensor([pi, 1 - pi])
-        self.mus = torch.zeros(2)
-        self.sigmas = torch.tensor([sigma_1, sigma_2])
+        self.gaussian = pi == 1
+        self.sigma_1 = sigma_1
+        self.register_buffer("pi", torch.tensor([pi, 1 - pi]), False)
+        self.register_buffer("mus", torch.zeros(2), False)
+        self.register_buffer("sigmas", torch.tensor([sigma_1, sigma_2]), False)
+        self._distribution = None
+
+    @property
+    def distribution(self) -> distributions.Distribution:
+        """The prior distribution, built once and cached until the buffers
+        are moved or cast.
+        """
+        if self._distribution is None:
+            if self.gaussian:
+                self._distribution = distributions.Normal(
+                    self.mus[0], self.sigmas[0]
+                )
+            else:
+                mix = distributions.Categorical(self.pi)
+                normals = distributions.Normal(self.mus, self.sigmas)
+                self._distribution = distributions.MixtureSameFamily(
+                    mix, normals
+                )
+        return self._distribution
 
     def log_prior(self, weight: Tensor) -> Tensor:
-        self.convert(weight.device)
-        mix = distributions.Categorical(self.pi)
-        normals = distributions.Normal(self.mus, self.sigmas)
-        self.distribution = distributions.MixtureSameFamily(mix, normals)
         return self.distribution.log_prob(weight).sum()
 
+    def expected_log_prior(self, posterior: TrainableDistribution) -> Tensor:
+        """Expectation of the log prior under :attr:`posterior`. It is exact
+        for a Gaussian prior and estimated from one sample of the posterior
+        for the mixture prior.
+        """
+        if not self.gaussian:
+            return self.log_prior(posterior.sample())
+        sigma = torch.log1p(torch.exp(posterior.rho))
+        lprior = (
+            posterior.lsqrt2pi
+            + np.log(self.sigma_1)
+            + (posterior.mu**2 + sigma**2) / (2 * self.sigma_1**2)
+        )
+        return -lprior.sum()
+
+    def kl_divergence(self, posterior: TrainableDistribution) -> Tensor:
+        """Closed-form KL divergence between :attr:`posterior` and the prior.
+
+        Raises:
+            ValueError: If the prior is a mixture of Gaussians.
+        """
+        if not self.gaussian:
+            raise ValueError(
+                "The KL divergence to a mixture prior has no closed form. Set "
+                "prior_pi to 1 or use the Monte-Carlo estimate."
+            )
+        sigma = torch.log1p(torch.exp(posterior.rho))
+        kl = (
+            np.log(self.sigma_1)
+            - torch.log(sigma)
+            + (posterior.mu**2 + sigma**2) / (2 * self.sigma_1**2)
+            - 0.5
+        )
+        return kl.sum()
+
     def convert(self, device) -> None:
-        self.pi = self.pi.to(device)
-        self.mus = self.mus.to(device)
-        self.sigmas = self.sigmas.to(device)
+        self.to(device)
+
+    def _apply(self, *args, **kwargs):
+        self._distribution = None
+        return super()._apply(*args, **kwargs)
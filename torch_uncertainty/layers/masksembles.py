@@ -1,6 +1,10 @@
 """ Modified from https://github.com/nikitadurasov/masksembles/ """
 # fmt: off
-from typing import Any, Union
+import hashlib
+import itertools
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
 
 import torch
 from torch import Tensor, nn
@@ -8,9 +12,37 @@ from torch.nn.common_types import _size_2_t
 
 import numpy as np
 
-
 # fmt: on
-def _generate_masks(m: int, n: int, s: float) -> np.ndarray:
+_masks_cache: Dict[Tuple[int, int, float, int], np.ndarray] = {}
+
+
+def _get_rng(seed: Optional[int]) -> Any:
+    # without seed, use numpy's global random state to remain reproducible
+    # with np.random.seed
+    return np.random if seed is None else np.random.default_rng(seed)
+
+
+def _sample_masks(
+    m: int, n: int, s: float, num_draws: int, rng: Any
+) -> np.ndarray:
+    """Draws :attr:`num_draws` sets of :attr:`n` binary masks with :attr:`m`
+    ones among ``int(m * s)`` positions at once.
+
+    Returns:
+        np.ndarray: Array of shape (num_draws, n, int(m * s)).
+    """
+    total_positions = int(m * s)
+    scores = rng.random((num_draws, n, total_positions))
+    # the positions of the m smallest scores are a uniform random subset
+    idx = np.argpartition(scores, m - 1, axis=-1)[..., :m]
+    masks = np.zeros((num_draws, n, total_positions))
+    np.put_along_axis(masks, idx, 1, axis=-1)
+    return masks
+
+
+def _generate_masks(
+    m: int, n: int, s: float, rng: Optional[Any] = None
+) -> np.ndarray:
     """Generates set of binary masks with properties defined by n, m, s params.
     Results of this function are stochastic, that is, calls with the same sets
     of arguments might generate outputs of different shapes. Check
@@ -21,49 +53,64 @@ def _generate_masks(m: int, n: int, s: float) -> np.ndarray:
         m (int): Number of ones in each mask.
         n (int): Number of masks in the set.
         s (float): Scale param controls overlap of generated masks.
+        rng (Any, optional): Random generator. Defaults to numpy's global
+            random state.
 
     Returns:
         np.ndarray: Matrix of binary vectors.
     """
-    total_positions = int(m * s)
-    masks = []
-
-    for _ in range(n):
-        new_vector = np.zeros([total_positions])
-        idx = np.random.choice(range(total_positions), m, replace=False)
-        new_vector[idx] = 1
-        masks.append(new_vector)
-
-    masks = np.array(masks)
+    masks = _sample_masks(m, n, s, 1, rng if rng is not None else np.random)[0]
     # drop useless positions
-    masks = masks[:, ~np.all(masks == 0, axis=0)]
-    return masks
+    return masks[:, masks.any(axis=0)]
 
 
-def generate_masks(m: int, n: int, s: float) -> np.ndarray:
+def generate_masks(
+    m: int, n: int, s: float, rng: Optional[Any] = None, num_draws: int = 16
+) -> np.ndarray:
     """Generates set of binary masks with properties defined by n, m, s params
     Resulting masks are required to have fixed features size.
     Since process of masks generation is stochastic therefore function
-    evaluates _generate_masks multiple times till expected size is acquired.
+    draws candidate sets by batches of :attr:`num_draws` till one of them
+    has the expected size.
 
     Args:
         m (int): number of ones in each mask
         n (int): number of masks in the set
         s (float): scale param controls overlap of generated masks
+        rng (Any, optional): Random generator. Defaults to numpy's global
+            random state.
+        num_draws (int, optional): Number of candidate sets drawn at once.
+            Defaults to ``16``.
 
     Returns:
         np.ndarray: matrix of binary vectors
     """
-
-    masks = _generate_masks(m, n, s)
+    rng = rng if rng is not None else np.random
     # hardcoded formula for expected size, check reference
     expected_size = int(m * s * (1 - (1 - 1 / s) ** n))
-    while masks.shape[1] != expected_size:
-        masks = _generate_masks(m, n, s)
-    return masks
+    while True:
+        masks = _sample_masks(m, n, s, num_draws, rng)
+        used = masks.any(axis=1)
+        valid = np.flatnonzero(used.sum(axis=-1) == expected_size)
+        if valid.size:
+            # drop useless positions
+            return masks[valid[0]][:, used[valid[0]]]
+
+
+def _cache_path(c: int, n: int, scale: float, seed: int) -> Path:
+    root = Path(
+        os.environ.get(
+            "TORCH_UNCERTAINTY_CACHE",
+            Path.home() / ".cache" / "torch_uncertainty",
+        )
+    )
+    key = f"masksembles-{c}-{n}-{float(scale)!r}-{seed}".encode()
+    return root / "masksembles" / f"{hashlib.sha256(key).hexdigest()}.npy"
 
 
-def generation_wrapper(c: int, n: int, scale: float) -> np.ndarray:
+def generation_wrapper(
+    c: int, n: int, scale: float, seed: Optional[int] = None
+) -> np.ndarray:
     """Generates set of binary masks with properties defined by c, n, scale
     params. Allows to generate masks sets with predefined features number c.
     Particularly convenient to use in torch-like layers where one need to
@@ -73,6 +120,10 @@ def generation_wrapper(c: int, n: int, scale: float) -> np.ndarray:
         c (int): number of channels in generated masks.
         n (int): number of masks in the set.
         scale (float): scale param controls overlap of generated masks.
+        seed (int, optional): seed of the generation. If set, the masks are
+            memoized and cached on disk, in the ``masksembles`` folder of
+            ``$TORCH_UNCERTAINTY_CACHE`` (``~/.cache/torch_uncertainty`` by
+            default), so that later calls are lookups. Defaults to ``None``.
 
     Raises:
         ValueError: If :attr:`c` < 10.
@@ -98,17 +149,28 @@ def generation_wrapper(c: int, n: int, scale: float) -> np.ndarray:
             f"(scale={scale})."
         )
 
+    if seed is not None:
+        key = (c, n, float(scale), seed)
+        if key in _masks_cache:
+            return _masks_cache[key].copy()
+        path = _cache_path(*key)
+        if path.exists():
+            masks = np.load(path).astype(np.float64)
+            _masks_cache[key] = masks
+            return masks.copy()
+
+    rng = _get_rng(seed)
+
     # inverse formula for number of active features in masks
     active_features = int(int(c) / (scale * (1 - (1 - 1 / scale) ** n)))
 
     # Use binary search to find the correct value of the scale
-    masks = generate_masks(active_features, n, scale)
     up = 4 * scale
     down = max(0.2 * scale, 1.0)
     s = (down + up) / 2
     im_s = -1
     while im_s != c:
-        masks = generate_masks(active_features, n, s)
+        masks = generate_masks(active_features, n, s, rng)
         im_s = masks.shape[-1]
         if im_s < c:
             down = s
@@ -117,51 +179,100 @@ def generation_wrapper(c: int, n: int, scale: float) -> np.ndarray:
             up = s
             s = (down + up) / 2
 
+    if seed is not None:
+        _masks_cache[key] = masks
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, masks.astype(np.uint8))
+            os.replace(tmp_path, path)
+        except OSError:  # read-only cache, the masks stay memoized
+            pass
+        masks = masks.copy()
     return masks
 
 
+def layer_seeds(seed: Optional[int]) -> Iterator[Optional[int]]:
+    """The seeds of the successive masked layers of a model, drawn in their
+    order of construction.
+
+    Args:
+        seed (int, optional): The base seed of the model.
+
+    Returns:
+        Iterator[Optional[int]]: :attr:`seed` plus the index of each layer, so
+            that layers of the same width get different masks, or ``None``
+            for every layer if :attr:`seed` is ``None``.
+    """
+    if seed is None:
+        return itertools.repeat(None)
+    return itertools.count(seed)
+
+
 class Mask1D(nn.Module):
     def __init__(
-        self, channels: int, num_masks: int, scale: float, **factory_kwargs
+        self,
+        channels: int,
+        num_masks: int,
+        scale: float,
+        seed: Optional[int] = None,
+        **factory_kwargs,
     ):
         super().__init__()
         self.num_masks = num_masks
 
-        masks = generation_wrapper(channels, num_masks, scale)
-        masks = torch.from_numpy(masks)
-        self.masks = torch.nn.Parameter(masks, requires_grad=False).to(
-            device=factory_kwargs["device"]
+        masks = generation_wrapper(channels, num_masks, scale, seed)
+        masks = torch.from_numpy(masks).to(
+            device=factory_kwargs["device"],
+            dtype=factory_kwargs["dtype"] or torch.get_default_dtype(),
         )
+        self.masks = torch.nn.Parameter(masks, requires_grad=False)
+
+    def active_channels(self) -> Tensor:
+        """Indices of the channels kept by each mask, of shape
+        (num_masks, active_channels).
+        """
+        return self.masks.nonzero()[:, 1].view(self.num_masks, -1)
 
     def forward(self, inputs: Tensor) -> Tensor:
-        batch = inputs.shape[0]
-        x = torch.split(inputs.unsqueeze(1), batch // self.num_masks, dim=0)
-        x = torch.cat(x, dim=1).permute([1, 0, 2])
-        x = x * self.masks.unsqueeze(1)
-        x = torch.cat(torch.split(x, 1, dim=0), dim=1)
-        return torch.as_tensor(x, dtype=inputs.dtype).squeeze(0)
+        # view the batch as (num_masks, batch / num_masks, C) and broadcast
+        x = inputs.reshape(self.num_masks, -1, *inputs.shape[1:])
+        x = x * self.masks.to(inputs.dtype).unsqueeze(1)
+        return x.flatten(0, 1)
 
 
 class Mask2D(nn.Module):
     def __init__(
-        self, channels: int, num_masks: int, scale: float, **factory_kwargs
+        self,
+        channels: int,
+        num_masks: int,
+        scale: float,
+        seed: Optional[int] = None,
+        **factory_kwargs,
     ):
         super().__init__()
         self.num_masks = num_masks
 
-        masks = generation_wrapper(channels, num_masks, scale)
-        masks = torch.from_numpy(masks)
-        self.masks = torch.nn.Parameter(masks, requires_grad=False).to(
-            device=factory_kwargs["device"]
+        masks = generation_wrapper(channels, num_masks, scale, seed)
+        masks = torch.from_numpy(masks).to(
+            device=factory_kwargs["device"],
+            dtype=factory_kwargs["dtype"] or torch.get_default_dtype(),
         )
+        self.masks = torch.nn.Parameter(masks, requires_grad=False)
+
+    def active_channels(self) -> Tensor:
+        """Indices of the channels kept by each mask, of shape
+        (num_masks, active_channels).
+        """
+        return self.masks.nonzero()[:, 1].view(self.num_masks, -1)
 
     def forward(self, inputs: Tensor) -> Tensor:
-        batch = inputs.shape[0]
-        x = torch.split(inputs.unsqueeze(1), batch // self.num_masks, dim=0)
-        x = torch.cat(x, dim=1).permute([1, 0, 2, 3, 4])
-        x = x * self.masks.unsqueeze(1).unsqueeze(-1).unsqueeze(-1)
-        x = torch.cat(torch.split(x, 1, dim=0), dim=1)
-        return torch.as_tensor(x, dtype=inputs.dtype).squeeze(0)
+        # view the batch as (num_masks, batch / num_masks, C, H, W) and
+        # broadcast
+        x = inputs.reshape(self.num_masks, -1, *inputs.shape[1:])
+        x = x * self.masks.to(inputs.dtype)[:, None, :, None, None]
+        return x.flatten(0, 1)
 
 
 class MaskedLinear(nn.Module):
@@ -177,8 +288,11 @@ class MaskedLinear(nn.Module):
         scale (float): The scale parameter for the masks.
         bias (bool, optional): It ``True``, adds a learnable bias to the
             output. Defaults to ``True``.
-        groups (int, optional): Number of blocked connections from input
-            channels to output channels. Defaults to ``1``.
+        seed (int, optional): Seed of the masks generation. If set, the masks
+            are cached on disk. Defaults to ``None``.
+        sparse (bool, optional): If ``True``, each estimator only gathers and
+            processes its active input features instead of multiplying the
+            masked-out features by zero. Defaults to ``False``.
 
     Warning:
         Be sure to apply a repeat on the batch at the start of the training
@@ -196,6 +310,8 @@ class MaskedLinear(nn.Module):
         num_estimators: int,
         scale: float,
         bias: bool = True,
+        seed: Optional[int] = None,
+        sparse: bool = False,
         device: Union[Any, None] = None,
         dtype: Union[Any, None] = None,
     ) -> None:
@@ -205,8 +321,13 @@ class MaskedLinear(nn.Module):
         if scale < 1:
             raise ValueError(f"Attribute `scale` should be >= 1, not {scale}.")
 
+        self.sparse = sparse
         self.mask = Mask1D(
-            in_features, num_masks=num_estimators, scale=scale, **factory_kwargs
+            in_features,
+            num_masks=num_estimators,
+            scale=scale,
+            seed=seed,
+            **factory_kwargs,
         )
         self.linear = nn.Linear(
             in_features=in_features,
@@ -215,7 +336,20 @@ class MaskedLinear(nn.Module):
             **factory_kwargs,
         )
 
+    def _sparse_forward(self, input: Tensor) -> Tensor:
+        idx = self.mask.active_channels()
+        x = input.reshape(self.mask.num_masks, -1, input.size(-1))
+        x = torch.gather(x, 2, idx.unsqueeze(1).expand(-1, x.size(1), -1))
+        # (num_masks, out_features, active_features)
+        weight = self.linear.weight[:, idx].transpose(0, 1)
+        out = torch.bmm(x, weight.transpose(1, 2))
+        if self.linear.bias is not None:
+            out = out + self.linear.bias
+        return out.flatten(0, 1)
+
     def forward(self, input: Tensor) -> Tensor:
+        if self.sparse:
+            return self._sparse_forward(input)
         return self.linear(self.mask(input))
 
 
@@ -238,6 +372,12 @@ class MaskedConv2d(nn.Module):
             channels to output channels for each estimator. Defaults to ``1``.
         bias (bool, optional): If ``True``, adds a learnable bias to the
             output. Defaults to ``True``.
+        seed (int, optional): Seed of the masks generation. If set, the masks
+            are cached on disk. Defaults to ``None``.
+        sparse (bool, optional): If ``True``, each estimator only gathers and
+            convolves its active input channels instead of convolving the
+            masked-out channels set to zero. Only available with
+            :attr:`groups` ``= 1``. Defaults to ``False``.
 
     Warning:
         Be sure to apply a repeat on the batch at the start of the training
@@ -260,6 +400,8 @@ class MaskedConv2d(nn.Module):
         dilation: _size_2_t = 1,
         groups: int = 1,
         bias: bool = True,
+        seed: Optional[int] = None,
+        sparse: bool = False,
         device: Union[Any, None] = None,
         dtype: Union[Any, None] = None,
     ) -> None:
@@ -268,9 +410,18 @@ class MaskedConv2d(nn.Module):
 
         if scale < 1:
             raise ValueError(f"Attribute `scale` should be >= 1, not {scale}.")
+        if sparse and groups != 1:
+            raise ValueError(
+                f"The sparse mode requires `groups` to be 1, not {groups}."
+            )
 
+        self.sparse = sparse
         self.mask = Mask2D(
-            in_channels, num_masks=num_estimators, scale=scale, **factory_kwargs
+            in_channels,
+            num_masks=num_estimators,
+            scale=scale,
+            seed=seed,
+            **factory_kwargs,
         )
         self.conv = nn.Conv2d(
             in_channels=in_channels,
@@ -285,5 +436,20 @@ class MaskedConv2d(nn.Module):
             **factory_kwargs,
         )
 
+    def _sparse_forward(self, input: Tensor) -> Tensor:
+        idx = self.mask.active_channels()
+        inputs = input.reshape(self.mask.num_masks, -1, *input.shape[1:])
+        out = [
+            self.conv._conv_forward(
+                x.index_select(1, channels),
+                self.conv.weight.index_select(1, channels),
+                self.conv.bias,
+            )
+            for x, channels in zip(inputs, idx)
+        ]
+        return torch.cat(out)
+
     def forward(self, input: Tensor) -> Tensor:
+        if self.sparse:
+            return self._sparse_forward(input)
         return self.conv(self.mask(input))
@@ -57,6 +57,11 @@ class PackedLinear(nn.Module):
             channels to output channels. Defaults to ``1``.
         rearrange (bool, optional): Rearrange the input and outputs for
             compatibility with previous and later layers. Defaults to ``True``.
+        packed_layout (bool, optional): Keep the activations in the
+            estimator-major (`batch_size`, `num_estimators * features`)
+            layout shared by consecutive packed layers. Only the last layer
+            converts its output to (`num_estimators * batch_size`,
+            `features`). Overrides :attr:`rearrange`. Defaults to ``False``.
 
     Explanation Note:
         Increasing :attr:`alpha` will increase the number of channels of the
@@ -77,6 +82,11 @@ class PackedLinear(nn.Module):
         The input should be of size (`batch_size`, :attr:`in_features`, 1,
         1). The (often) necessary rearrange operation is executed by
         default.
+
+    Note:
+        With :attr:`packed_layout`, the input should be of size
+        (`batch_size`, :attr:`in_features`) and no copy of the activations
+        is made, except by the layer built with :attr:`last` set to ``True``.
     """
 
     def __init__(
@@ -90,6 +100,7 @@ class PackedLinear(nn.Module):
         rearrange: bool = True,
         first: bool = False,
         last: bool = False,
+        packed_layout: bool = False,
         device=None,
         dtype=None,
     ) -> None:
@@ -99,8 +110,10 @@ class PackedLinear(nn.Module):
         check_packed_parameters_consistency(alpha, num_estimators, gamma)
 
         self.first = first
+        self.last = last
         self.num_estimators = num_estimators
         self.rearrange = rearrange
+        self.packed_layout = packed_layout
 
         # Define the number of features of the underlying convolution
         extended_in_features = int(in_features * (1 if first else alpha))
@@ -143,7 +156,16 @@ class PackedLinear(nn.Module):
         x = rearrange(x, "e (m c) h -> (m e) c h", m=self.num_estimators)
         return x.squeeze(-1)
 
+    def _packed_layout_forward(self, x: Tensor) -> Tensor:
+        # unsqueeze and squeeze are views: the activations are not copied
+        x = self.conv1x1(x.unsqueeze(-1)).squeeze(-1)
+        if self.last:
+            x = rearrange(x, "e (m c) -> (m e) c", m=self.num_estimators)
+        return x
+
     def forward(self, input: Tensor) -> Tensor:
+        if self.packed_layout:
+            return self._packed_layout_forward(input)
         if self.rearrange:
             return self._rearrange_forward(input)
         else:
@@ -14,11 +14,16 @@ class KLDiv(nn.Module):
 
     Args:
         model (nn.Module): Bayesian Neural Network
+        analytic (bool, optional): Whether to compute the KL divergence in
+            closed form from the posterior parameters instead of estimating it
+            from the weights sampled in the last forward pass. Requires
+            Gaussian priors (``prior_pi=1``). Defaults to False.
     """
 
-    def __init__(self, model: nn.Module) -> None:
+    def __init__(self, model: nn.Module, analytic: bool = False) -> None:
         super().__init__()
         self.model = model
+        self.analytic = analytic
 
     def forward(self) -> Tensor:
         return self._kl_div()
@@ -28,10 +33,12 @@ class KLDiv(nn.Module):
         kl_divergence = torch.zeros(1)
         for module in self.model.modules():
             if isinstance(module, bayesian_modules):
-                kl_divergence = kl_divergence.to(
-                    device=module.lvposterior.device
-                )
-                kl_divergence += module.lvposterior - module.lprior
+                if self.analytic:
+                    module_kl = module.kl_divergence()
+                else:
+                    module_kl = module.lvposterior - module.lprior
+                kl_divergence = kl_divergence.to(device=module_kl.device)
+                kl_divergence += module_kl
         return kl_divergence
 
 
@@ -44,6 +51,14 @@ class ELBOLoss(nn.Module):
         criterion (nn.Module): The loss function to use during training
         kl_weight (float): The weight of the KL divergence term
         num_samples (int): The number of samples to use for the ELBO loss
+        analytic_kl (bool, optional): Whether to compute the KL divergence in
+            closed form, once per call. Requires Gaussian priors. Defaults to
+            False.
+        vectorized (bool, optional): Whether to evaluate the
+            :attr:`num_samples` weight samples in a single forward pass on the
+            inputs tiled along the batch dimension. The batch statistics of
+            normalization layers are then shared by the samples. Defaults to
+            False.
     """
 
     def __init__(
@@ -52,10 +67,12 @@ class ELBOLoss(nn.Module):
         criterion: nn.Module,
         kl_weight: float,
         num_samples: int,
+        analytic_kl: bool = False,
+        vectorized: bool = False,
     ) -> None:
         super().__init__()
         self.model = model
-        self._kl_div = KLDiv(model)
+        self._kl_div = KLDiv(model, analytic=analytic_kl)
 
         if isinstance(criterion, type):
             raise ValueError(
@@ -81,6 +98,7 @@ class ELBOLoss(nn.Module):
                 f"Got {type(num_samples)}."
             )
         self.num_samples = num_samples
+        self.vectorized = vectorized
 
     def forward(self, inputs: Tensor, targets: Tensor) -> Tensor:
         """Gather the kl divergence from the bayesian modules and aggregate
@@ -93,12 +111,44 @@ class ELBOLoss(nn.Module):
         Returns:
             Tensor: The aggregated ELBO loss
         """
+        if self.vectorized:
+            return self._vectorized_forward(inputs, targets)
+
         aggregated_elbo = torch.zeros(1, device=inputs.device)
         for _ in range(self.num_samples):
             logits = self.model(inputs)
             aggregated_elbo += self.criterion(logits, targets)
+            if not self._kl_div.analytic:
+                aggregated_elbo += self.kl_weight * self._kl_div()
+        aggregated_elbo /= self.num_samples
+        if self._kl_div.analytic:
+            # the closed-form KL does not depend on the sampled weights
             aggregated_elbo += self.kl_weight * self._kl_div()
-        return aggregated_elbo / self.num_samples
+        return aggregated_elbo
+
+    def _vectorized_forward(self, inputs: Tensor, targets: Tensor) -> Tensor:
+        modules = [
+            module
+            for module in self.model.modules()
+            if isinstance(module, bayesian_modules)
+        ]
+        for module in modules:
+            module.num_samples = self.num_samples
+        try:
+            logits = self.model(
+                inputs.repeat(self.num_samples, *[1] * (inputs.dim() - 1))
+            )
+        finally:
+            for module in modules:
+                module.num_samples = 1
+
+        # the KL terms of the layers are already averaged over the samples
+        aggregated_elbo = self.kl_weight * self._kl_div()
+        for sample_logits in logits.chunk(self.num_samples):
+            aggregated_elbo += (
+                self.criterion(sample_logits, targets) / self.num_samples
+            )
+        return aggregated_elbo
 
 
 class NIGLoss(nn.Module):
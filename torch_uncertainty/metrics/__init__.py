@@ -1,8 +1,12 @@
 # flake8: noqa
 from .brier_score import BrierScore
+from .calibration import BinnedCalibrationError
 from .disagreement import Disagreement
 from .entropy import Entropy
 from .fpr95 import FPR95
+from .histogram import Histogram
 from .mutual_information import MutualInformation
 from .nll import GaussianNegativeLogLikelihood, NegativeLogLikelihood
+from .ood_curve import BinnedOODCurve, OODCurve
+from .ood_scores import ood_criteria, ood_scores
 from .variation_ratio import VariationRatio
@@ -0,0 +1,156 @@
+# fmt: off
+from typing import Any, Literal, Tuple
+
+import torch
+from torch import Tensor
+from torchmetrics import Metric
+
+
+# fmt: on
+class BinnedCalibrationError(Metric):
+    """Streaming calibration error of classifiers, computed from per-bin
+    counts, sums of confidences and sums of accuracies, in memory
+    independent of the number of predictions.
+
+    Args:
+        num_bins (int, optional): The number of bins. Defaults to ``15``.
+        norm (str, optional): ``"l1"`` for the Expected Calibration Error,
+            ``"l2"`` for its root-mean-square counterpart, or ``"max"`` for
+            the Maximum Calibration Error. Defaults to ``"l1"``.
+        adaptive (bool, optional): Whether to use bins of equal mass instead
+            of equal width, e.g. for the adaptive ECE. Defaults to ``False``.
+        sketch_bins (int, optional): The number of equal-width bins of the
+            sketch merged into the adaptive bins. Defaults to ``10000``.
+        kwargs: Additional keyword arguments, see `Advanced metric settings
+            <https://torchmetrics.readthedocs.io/en/stable/pages/overview.html#metric-kwargs>`_.
+
+    Inputs:
+        - :attr:`probs`: :math:`(B, C)` or :math:`(B,)` for binary
+          classification.
+        - :attr:`targets`: :math:`(B,)`
+
+    Note:
+        The binary inputs follow torchmetrics' ``BinaryCalibrationError``:
+        the confidence is the probability of the positive class and the
+        accuracy is the target. The multiclass inputs use the top-label
+        confidence and its correctness.
+
+    Note:
+        The adaptive bins are merged from a fine equal-width histogram, its
+        sketch: their masses are equal up to that of the heaviest bin of the
+        sketch, and the error is exact up to the width of its bins.
+
+    Raises:
+        ValueError: If :attr:`num_bins` is not strictly positive.
+        ValueError: If :attr:`norm` is not ``"l1"``, ``"l2"`` or ``"max"``.
+        ValueError: If :attr:`sketch_bins` is lower than :attr:`num_bins`.
+    """
+
+    is_differentiable: bool = False
+    higher_is_better: bool = False
+    full_state_update: bool = False
+
+    def __init__(
+        self,
+        num_bins: int = 15,
+        norm: Literal["l1", "l2", "max"] = "l1",
+        adaptive: bool = False,
+        sketch_bins: int = 10000,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        if num_bins < 1:
+            raise ValueError(
+                f"num_bins should be strictly positive. Got {num_bins}."
+            )
+        if norm not in ("l1", "l2", "max"):
+            raise ValueError(f"norm should be 'l1', 'l2' or 'max'. Got {norm}.")
+        if adaptive and sketch_bins < num_bins:
+            raise ValueError(
+                "sketch_bins should be at least num_bins. Got "
+                f"{sketch_bins} < {num_bins}."
+            )
+
+        self.num_bins = num_bins
+        self.norm = norm
+        self.adaptive = adaptive
+        self.sketch_bins = sketch_bins
+
+        states = sketch_bins if adaptive else num_bins
+        for state in ("counts", "conf_sums", "acc_sums"):
+            self.add_state(
+                state, default=torch.zeros(states), dist_reduce_fx="sum"
+            )
+
+    def update(self, probs: Tensor, targets: Tensor) -> None:  # type: ignore
+        probs, targets = probs.detach(), targets.detach()
+        if probs.dim() == 1 or probs.size(-1) == 1:  # binary classification
+            confidences = probs.flatten().float()
+            accuracies = targets.flatten().float()
+        else:
+            confidences, preds = probs.float().max(dim=-1)
+            accuracies = (preds == targets).float()
+
+        # reduce to (B,) before moving, the plots keep the states on the CPU
+        confidences = confidences.to(self.counts.device)
+        accuracies = accuracies.to(self.counts.device)
+        size = self.counts.numel()
+        ids = (confidences * size).long().clamp(0, size - 1)
+        self.counts += torch.bincount(ids, minlength=size).to(self.counts)
+        self.conf_sums += torch.bincount(
+            ids, weights=confidences, minlength=size
+        ).to(self.conf_sums)
+        self.acc_sums += torch.bincount(
+            ids, weights=accuracies, minlength=size
+        ).to(self.acc_sums)
+
+    def bins(self) -> Tuple[Tensor, Tensor, Tensor, Tensor]:
+        """Return the statistics of the bins, e.g. for reliability diagrams.
+
+        Returns:
+            Tuple[Tensor, Tensor, Tensor, Tensor]: The counts, mean
+                confidences and mean accuracies of shape :math:`(K,)` and the
+                edges of shape :math:`(K + 1,)` of the :math:`K` bins. The
+                empty adaptive bins are dropped.
+        """
+        size = self.counts.numel()
+        edges = torch.linspace(0, 1, size + 1).to(self.counts)
+        counts, conf_sums, acc_sums = self.counts, self.conf_sums, self.acc_sums
+        if self.adaptive:
+            # the bins of the sketch preceding a fraction k / num_bins of the
+            # predictions start the k-th adaptive bin
+            before = counts.cumsum(0) - counts
+            total = counts.sum().clamp(min=1)
+            groups = (before * self.num_bins / total).long()
+            last = counts.nonzero()
+            if last.numel():
+                groups = groups.clamp(max=groups[last[-1, 0]].item())
+            starts = torch.ones_like(groups, dtype=torch.bool)
+            starts[1:] = groups[1:] != groups[:-1]
+            # renumber the non-empty groups contiguously
+            groups = starts.cumsum(0) - 1
+            num_groups = int(starts.sum().item())
+            counts, conf_sums, acc_sums = (
+                value.new_zeros(num_groups).index_add_(0, groups, value)
+                for value in (counts, conf_sums, acc_sums)
+            )
+            edges = torch.cat([edges[:-1][starts], edges[-1:]])
+
+        nonempty = counts.clamp(min=1)
+        return counts, conf_sums / nonempty, acc_sums / nonempty, edges
+
+    def compute(self) -> Tensor:
+        """Compute the calibration error from the bins.
+
+        Returns:
+            Tensor: The calibration error.
+        """
+        counts, confidences, accuracies, _ = self.bins()
+        gaps = (accuracies - confidences).abs()
+        weights = counts / counts.sum().clamp(min=1)
+        if self.norm == "max":
+            return gaps.max()
+        if self.norm == "l2":
+            return (weights * gaps**2).sum().sqrt()
+        return (weights * gaps).sum()
@@ -0,0 +1,79 @@
+# fmt: off
+from typing import Any, Tuple
+
+import torch
+from torch import Tensor
+from torchmetrics import Metric
+
+
+# fmt: on
+class Histogram(Metric):
+    """Streaming fixed-bin histogram of scalar values, such as the maximum
+    logits or probabilities of the predictions, in memory independent of
+    the number of values.
+
+    Args:
+        num_bins (int, optional): The number of bins. Defaults to ``1000``.
+        min (float, optional): The lower edge of the first bin. Defaults to
+            ``0.0``.
+        max (float, optional): The upper edge of the last bin. Defaults to
+            ``1.0``.
+        kwargs: Additional keyword arguments, see `Advanced metric settings
+            <https://torchmetrics.readthedocs.io/en/stable/pages/overview.html#metric-kwargs>`_.
+
+    Inputs:
+        - :attr:`values`: :math:`(B,)`
+
+    Note:
+        The values outside of :math:`[min, max]` are counted in the first or
+        the last bin.
+
+    Raises:
+        ValueError: If :attr:`num_bins` is not strictly positive.
+        ValueError: If :attr:`min` is not lower than :attr:`max`.
+    """
+
+    is_differentiable: bool = False
+    higher_is_better = None
+    full_state_update: bool = False
+
+    def __init__(
+        self,
+        num_bins: int = 1000,
+        min: float = 0.0,
+        max: float = 1.0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        if num_bins < 1:
+            raise ValueError(
+                f"num_bins should be strictly positive. Got {num_bins}."
+            )
+        if min >= max:
+            raise ValueError(f"min should be lower than max. Got {min, max}.")
+
+        self.num_bins = num_bins
+        self.min = min
+        self.max = max
+        self.add_state(
+            "counts", default=torch.zeros(num_bins), dist_reduce_fx="sum"
+        )
+
+    def update(self, values: Tensor) -> None:  # type: ignore
+        values = values.detach().flatten().float()
+        values = values.clamp(self.min, self.max)
+        self.counts += torch.histc(
+            values, bins=self.num_bins, min=self.min, max=self.max
+        ).to(self.counts)
+
+    def compute(self) -> Tuple[Tensor, Tensor]:
+        """Return the counts and the edges of the bins.
+
+        Returns:
+            Tuple[Tensor, Tensor]: The counts of shape :math:`(K,)` and the
+                edges of shape :math:`(K + 1,)`, where :math:`K` is the
+                number of bins.
+        """
+        edges = torch.linspace(self.min, self.max, self.num_bins + 1)
+        return self.counts, edges.to(self.counts)
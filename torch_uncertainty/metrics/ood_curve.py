@@ -0,0 +1,225 @@
+# fmt: off
+from typing import Any, Dict, List, Tuple
+
+import torch
+from torch import Tensor
+from torchmetrics import Metric
+from torchmetrics.utilities.data import dim_zero_cat
+
+
+# fmt: on
+def _average_precision(tps: Tensor, fps: Tensor) -> Tensor:
+    """The area under the precision-recall curve of the cumulative counts of
+    true and false positives above the distinct thresholds, in decreasing
+    order, as the average precision.
+    """
+    recall = tps / tps[-1]
+    increments = recall - torch.cat([recall.new_zeros(1), recall[:-1]])
+    return (increments * tps / (tps + fps)).sum()
+
+
+def _curve_metrics(
+    tps: Tensor, fps: Tensor, recall_level: float = 0.95
+) -> Dict[str, Tensor]:
+    """The OOD metrics of the cumulative counts of true and false positives
+    above the distinct thresholds, in decreasing order.
+    """
+    tpr, fpr = tps / tps[-1], fps / fps[-1]
+    zero = tps.new_zeros(1)
+    auroc = torch.trapz(torch.cat([zero, tpr]), torch.cat([zero, fpr]))
+
+    # the in-distribution samples as positives below the same thresholds
+    in_tps = (fps[-1] - torch.cat([zero, fps[:-1]])).flip(0)
+    in_fps = (tps[-1] - torch.cat([zero, tps[:-1]])).flip(0)
+
+    # the threshold whose recall is the closest to the level, the highest
+    # recall winning ties, up to the first threshold of full recall
+    last = int(torch.searchsorted(tps, tps[-1]).item())
+    gaps = (tpr[: last + 1] - recall_level).abs()
+    cutoff = last - int(gaps.flip(0).argmin().item())
+
+    # flagging no sample errs on half of the balanced samples
+    errors = torch.cat([zero + 1, 1 - tpr + fpr]) / 2
+    return {
+        f"fpr{round(recall_level * 100)}": fpr[cutoff].float(),
+        "auroc": auroc.float(),
+        "aupr": _average_precision(tps, fps).float(),
+        "aupr_in": _average_precision(in_tps, in_fps).float(),
+        "detection_error": errors.min().float(),
+    }
+
+
+def _sorted_curve(values: Tensor, positives: Tensor) -> Tuple[Tensor, Tensor]:
+    """Sort the values once and return the cumulative counts of true and
+    false positives above their distinct values, in decreasing order.
+    """
+    values, order = values.sort(descending=True)
+    tps = positives[order].double().cumsum(0)
+    # the last sample of each run of tied values
+    distinct = torch.ones_like(values, dtype=torch.bool)
+    distinct[:-1] = values[1:] != values[:-1]
+    ids = distinct.nonzero().flatten()
+    tps = tps[ids]
+    return tps, (ids + 1).double() - tps
+
+
+class OODCurve(Metric):
+    """Exact OOD detection metrics of an OOD criterion, all derived from a
+    single curve of the true and false positives: its values are buffered
+    once and sorted once at compute time.
+
+    Args:
+        pos_label (int, optional): The label of the OOD samples, the
+            positives. Defaults to ``1``.
+        recall_level (float, optional): The recall of the OOD samples at
+            which to compute the FPR. Defaults to ``0.95``.
+        kwargs: Additional keyword arguments, see `Advanced metric settings
+            <https://torchmetrics.readthedocs.io/en/stable/pages/overview.html#metric-kwargs>`_.
+
+    Inputs:
+        - :attr:`values`: :math:`(B,)`, higher meaning more likely OOD.
+        - :attr:`targets`: :math:`(B,)`
+
+    Warning:
+        The metric stores all the values. For large datasets, consider
+        :class:`BinnedOODCurve`.
+    """
+
+    is_differentiable: bool = False
+    higher_is_better = None
+    full_state_update: bool = False
+
+    values: List[Tensor]
+    positives: List[Tensor]
+
+    def __init__(
+        self, pos_label: int = 1, recall_level: float = 0.95, **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+
+        self.pos_label = pos_label
+        self.recall_level = recall_level
+        self.add_state("values", [], dist_reduce_fx="cat")
+        self.add_state("positives", [], dist_reduce_fx="cat")
+
+    def update(self, values: Tensor, targets: Tensor) -> None:  # type: ignore
+        self.values.append(values.detach().flatten())
+        # one byte per sample, gathered by all the backends
+        self.positives.append(
+            (targets.flatten() == self.pos_label).to(torch.uint8)
+        )
+
+    def compute(self) -> Dict[str, Tensor]:
+        """Compute the metrics from the curve of the sorted values.
+
+        Returns:
+            Dict[str, Tensor]: The FPR at :attr:`recall_level`, e.g.
+                ``"fpr95"``, the ``"auroc"``, the ``"aupr"`` of the OOD
+                samples as positives, the ``"aupr_in"`` of the ID samples as
+                positives and the ``"detection_error"``, the minimum mean of
+                the FNR and the FPR.
+        """
+        tps, fps = _sorted_curve(
+            dim_zero_cat(self.values), dim_zero_cat(self.positives)
+        )
+        return _curve_metrics(tps, fps, self.recall_level)
+
+
+class BinnedOODCurve(Metric):
+    """Approximate OOD detection metrics of an OOD criterion, as those of
+    :class:`OODCurve`, computed from fixed-resolution histograms of its
+    values on the in-distribution and out-of-distribution samples, in memory
+    independent of their number.
+
+    Args:
+        num_bins (int, optional): The number of bins. Defaults to ``10000``.
+        min (float, optional): The lower edge of the first bin. Defaults to
+            ``0.0``.
+        max (float, optional): The upper edge of the last bin. Defaults to
+            ``1.0``.
+        pos_label (int, optional): The label of the OOD samples, the
+            positives. Defaults to ``1``.
+        recall_level (float, optional): The recall of the OOD samples at
+            which to compute the FPR. Defaults to ``0.95``.
+        kwargs: Additional keyword arguments, see `Advanced metric settings
+            <https://torchmetrics.readthedocs.io/en/stable/pages/overview.html#metric-kwargs>`_.
+
+    Inputs:
+        - :attr:`values`: :math:`(B,)`, higher meaning more likely OOD.
+        - :attr:`targets`: :math:`(B,)`
+
+    Note:
+        The metrics are exact for the values rounded down to the edges of
+        the bins, i.e. they are tied within a bin of width
+        :math:`(max - min) / num\\_bins`, which sets the error bound. For
+        instance, the AUROC differs from the exact one by at most half the
+        fraction of the pairs of ID and OOD values sharing a bin. The values
+        outside of :math:`[min, max]` are counted in the first or the last
+        bin.
+
+    Raises:
+        ValueError: If :attr:`num_bins` is not strictly positive.
+        ValueError: If :attr:`min` is not lower than :attr:`max`.
+    """
+
+    is_differentiable: bool = False
+    higher_is_better = None
+    full_state_update: bool = False
+
+    def __init__(
+        self,
+        num_bins: int = 10000,
+        min: float = 0.0,
+        max: float = 1.0,
+        pos_label: int = 1,
+        recall_level: float = 0.95,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        if num_bins < 1:
+            raise ValueError(
+                f"num_bins should be strictly positive. Got {num_bins}."
+            )
+        if min >= max:
+            raise ValueError(f"min should be lower than max. Got {min, max}.")
+
+        self.num_bins = num_bins
+        self.min = min
+        self.max = max
+        self.pos_label = pos_label
+        self.recall_level = recall_level
+        for state in ("pos_counts", "neg_counts"):
+            self.add_state(
+                state,
+                default=torch.zeros(num_bins, dtype=torch.long),
+                dist_reduce_fx="sum",
+            )
+
+    def update(self, values: Tensor, targets: Tensor) -> None:  # type: ignore
+        values = values.detach().flatten().float()
+        positives = targets.flatten() == self.pos_label
+        ids = (values - self.min) / (self.max - self.min) * self.num_bins
+        ids = ids.long().clamp(0, self.num_bins - 1)
+        self.pos_counts += torch.bincount(
+            ids[positives], minlength=self.num_bins
+        )
+        self.neg_counts += torch.bincount(
+            ids[~positives], minlength=self.num_bins
+        )
+
+    def compute(self) -> Dict[str, Tensor]:
+        """Compute the metrics from the histograms.
+
+        Returns:
+            Dict[str, Tensor]: The metrics of :meth:`OODCurve.compute`.
+        """
+        # the bins are the distinct thresholds, in decreasing order
+        pos_counts = self.pos_counts.flip(0).double()
+        neg_counts = self.neg_counts.flip(0).double()
+        nonempty = (pos_counts + neg_counts) > 0
+        return _curve_metrics(
+            pos_counts[nonempty].cumsum(0),
+            neg_counts[nonempty].cumsum(0),
+            self.recall_level,
+        )
@@ -0,0 +1,60 @@
+# fmt: off
+from typing import Dict
+
+import torch
+import torch.nn.functional as F
+from torch import Tensor
+
+# fmt: on
+ood_criteria = (
+    "msp",
+    "logit",
+    "entropy",
+    "expected_entropy",
+    "mutual_information",
+    "variation_ratio",
+)
+
+
+def ood_scores(logits: Tensor) -> Dict[str, Tensor]:
+    """Compute all the OOD criteria of an ensemble from its logits in a
+    single pass, sharing one softmax and one logarithm of the probabilities.
+
+    Args:
+        logits (Tensor): The logits of shape :math:`(B, N, C)`, where
+            :math:`B` is the batch size, :math:`N` is the number of
+            estimators and :math:`C` is the number of classes. A single
+            class is treated as the logit of a sigmoid.
+
+    Returns:
+        Dict[str, Tensor]: The scores of shape :math:`(B,)` of each criterion
+            of :data:`ood_criteria`, higher meaning more likely OOD:
+
+            - ``"msp"``: the opposite of the maximum mean probability,
+            - ``"logit"``: the opposite of the maximum mean logit,
+            - ``"entropy"``: the entropy of the mean probabilities,
+            - ``"expected_entropy"``: the mean entropy of the estimators,
+            - ``"mutual_information"``: the entropy minus the expected
+              entropy, clamped at zero,
+            - ``"variation_ratio"``: the fraction of estimators whose
+              prediction differs from the ensemble's.
+    """
+    max_logits = logits.mean(dim=1).max(dim=-1)[0]
+    if logits.size(-1) == 1:
+        logits = torch.cat([torch.zeros_like(logits), logits], dim=-1)
+    log_probs = F.log_softmax(logits, dim=-1)
+    probs = log_probs.exp()
+    ens_probs = probs.mean(dim=1)
+    confs, preds = ens_probs.max(dim=-1)
+
+    entropy = torch.special.entr(ens_probs).sum(dim=-1)
+    expected_entropy = -(probs * log_probs).sum(dim=-1).mean(dim=1)
+    agreement = (probs.argmax(dim=-1) == preds.unsqueeze(1)).float()
+    return {
+        "msp": -confs,
+        "logit": -max_logits,
+        "entropy": entropy,
+        "expected_entropy": expected_entropy,
+        "mutual_information": (entropy - expected_entropy).clamp(min=0),
+        "variation_ratio": 1 - agreement.mean(dim=1),
+    }
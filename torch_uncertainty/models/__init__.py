@@ -1,2 +1,4 @@
 # flake8: noqa
-from .deep_ensembles import deep_ensembles
+from .cascade import cascade
+from .deep_ensembles import deep_ensembles, lazy_deep_ensembles
+from .mc_dropout import mc_dropout
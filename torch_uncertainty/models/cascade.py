@@ -0,0 +1,188 @@
+# fmt: off
+from typing import Literal, Optional, Tuple
+
+import torch
+import torch.nn.functional as F
+from einops import rearrange
+from torch import Tensor, nn
+from torch.utils.data import DataLoader, Dataset
+
+# fmt: on
+__all__ = ["cascade"]
+
+cascade_criteria = ("msp", "entropy", "logit")
+
+
+def _uncertainty(logits: Tensor, criterion: str) -> Tensor:
+    """The uncertainty of the predictions of a single model, as the OOD
+    values of :class:`ClassificationSingle`: the opposite of the maximum
+    softmax probability, the entropy, or the opposite of the maximum logit.
+    """
+    if criterion == "logit":
+        return -logits.max(dim=-1)[0]
+    probs = F.softmax(logits, dim=-1)
+    if criterion == "entropy":
+        return torch.special.entr(probs).sum(dim=-1)
+    return -probs.max(dim=-1)[0]
+
+
+class _Cascade(nn.Module):
+    def __init__(
+        self,
+        model: nn.Module,
+        ensemble: nn.Module,
+        criterion: Literal["msp", "entropy", "logit"],
+        threshold: float,
+    ) -> None:
+        super().__init__()
+        self.model = model
+        self.ensemble = ensemble
+        self.criterion = criterion
+        self.threshold = threshold
+
+    def _ensemble_probs(self, x: Tensor) -> Tensor:
+        """The mean probabilities of the ensemble, whose logits are either
+        :math:`(B, N, C)` or :math:`((N B), C)`.
+        """
+        logits = self.ensemble(x)
+        if logits.dim() == 2:
+            logits = rearrange(logits, "(n b) c -> b n c", b=x.size(0))
+        return F.softmax(logits, dim=-1).mean(dim=1)
+
+    def predict(self, x: Tensor) -> Tuple[Tensor, Tensor]:
+        """Predict with the single model and escalate the inputs whose
+        uncertainty exceeds :attr:`threshold` to the ensemble.
+
+        Args:
+            x (Tensor): The input of the models.
+
+        Returns:
+            Tuple[Tensor, Tensor]: The probabilities of shape :math:`(B, C)`
+                and the mask of the escalated inputs of shape :math:`(B,)`.
+        """
+        logits = self.model(x)
+        escalated = _uncertainty(logits, self.criterion) > self.threshold
+        probs = F.softmax(logits, dim=-1)
+        if escalated.any():
+            probs = probs.index_put(
+                (escalated,), self._ensemble_probs(x[escalated]).to(probs)
+            )
+        return probs, escalated
+
+    def forward(self, x: Tensor) -> Tensor:
+        """Return the log-probabilities of the cascade, such that their
+        softmax is the probabilities of :meth:`predict`.
+
+        Args:
+            x (Tensor): The input of the models.
+
+        Returns:
+            Tensor: The log-probabilities of shape :math:`(B, C)`.
+        """
+        return self.predict(x)[0].log()
+
+    @torch.no_grad()
+    def calibrate(
+        self,
+        calibration_set: Dataset,
+        budget: Optional[float] = None,
+        target_accuracy: Optional[float] = None,
+        batch_size: int = 32,
+    ) -> float:
+        """Set :attr:`threshold` from a calibration set, either to escalate
+        at most a fraction :attr:`budget` of the inputs, or to escalate the
+        fewest inputs reaching the accuracy :attr:`target_accuracy`.
+
+        Args:
+            calibration_set (Dataset): The calibration dataset.
+            budget (float, optional): The maximum fraction of the inputs
+                escalated to the ensemble. Defaults to None.
+            target_accuracy (float, optional): The accuracy of the cascade to
+                reach. All the inputs are escalated if the target is out of
+                reach. Defaults to None.
+            batch_size (int, optional): The batch size. Defaults to 32.
+
+        Returns:
+            float: The new threshold.
+
+        Raises:
+            ValueError: If not exactly one of :attr:`budget` and
+                :attr:`target_accuracy` is specified.
+        """
+        if (budget is None) == (target_accuracy is None):
+            raise ValueError(
+                "Specify exactly one of budget and target_accuracy."
+            )
+        self.eval()
+        uncertainties, model_correct, ensemble_correct = [], [], []
+        dataloader = DataLoader(calibration_set, batch_size=batch_size)
+        for inputs, targets in dataloader:
+            logits = self.model(inputs)
+            uncertainties.append(_uncertainty(logits, self.criterion))
+            model_correct.append(logits.argmax(-1) == targets)
+            if target_accuracy is not None:
+                probs = self._ensemble_probs(inputs)
+                ensemble_correct.append(probs.argmax(-1) == targets)
+
+        # escalating the k most uncertain inputs, for k = 0, ..., n
+        uncertainties, order = torch.cat(uncertainties).sort(descending=True)
+        num_samples = uncertainties.numel()
+        if budget is not None:
+            num_escalated = int(budget * num_samples)
+        else:
+            model_correct = torch.cat(model_correct)[order].float()
+            ensemble_correct = torch.cat(ensemble_correct)[order].float()
+            zero = model_correct.new_zeros(1)
+            correct = torch.cat([zero, ensemble_correct.cumsum(0)]) + torch.cat(
+                [model_correct.flip(0).cumsum(0).flip(0), zero]
+            )
+            reached = (correct / num_samples >= target_accuracy).nonzero()
+            num_escalated = (
+                reached[0].item() if reached.numel() else num_samples
+            )
+
+        if num_escalated >= num_samples:
+            self.threshold = -float("inf")
+        else:
+            self.threshold = uncertainties[num_escalated].item()
+        return self.threshold
+
+
+def cascade(
+    model: nn.Module,
+    ensemble: nn.Module,
+    criterion: Literal["msp", "entropy", "logit"] = "msp",
+    threshold: float = -0.9,
+) -> nn.Module:
+    """
+    Builds a cascade serving a single model and escalating its most
+    uncertain inputs to an ensemble at inference.
+
+    Args:
+        model (nn.Module): The single model, returning logits of shape
+            :math:`(B, C)`.
+        ensemble (nn.Module): The ensemble, returning logits of shape
+            :math:`(B, N, C)` like Deep Ensembles or :math:`((N B), C)` like
+            Packed-Ensembles.
+        criterion (str, optional): The uncertainty of the single model, as in
+            :class:`ClassificationSingle`: ``"msp"`` for the opposite of the
+            maximum softmax probability, ``"entropy"``, or ``"logit"`` for the
+            opposite of the maximum logit. Defaults to ``"msp"``.
+        threshold (float, optional): The uncertainty above which an input is
+            escalated. Defaults to -0.9, i.e. a confidence under 0.9. Use
+            :meth:`calibrate` to set it for a budget or a target accuracy.
+
+    Returns:
+        nn.Module: The cascade, returning log-probabilities of shape
+            :math:`(B, C)`.
+
+    Raises:
+        ValueError: If :attr:criterion is not a valid criterion.
+    """
+    if criterion not in cascade_criteria:
+        raise ValueError(
+            f"criterion must be one of {cascade_criteria}. Got {criterion}."
+        )
+    return _Cascade(
+        model=model, ensemble=ensemble, criterion=criterion, threshold=threshold
+    )
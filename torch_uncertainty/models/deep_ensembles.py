@@ -1,23 +1,95 @@
 # fmt: off
 import copy
-from typing import List, Optional, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Literal, Optional, Tuple, Union
 
 import torch
-from torch import nn
+import torch.multiprocessing as mp
+from torch import Tensor, nn
+from torch.func import functional_call, vmap
 
+import numpy as np
+
+from ..utils.checkpoints import load_mmap_state_dict
 
 # fmt: on
+executors = ("sequential", "threads", "processes")
+stopping_criteria = ("confidence", "disagreement", "mutual_information")
+
+
+def _member_worker(
+    model: nn.Module, num_threads: int, inputs: mp.Queue, outputs: mp.Queue
+) -> None:
+    """Serve the forward passes of one member of a Deep Ensembles in a worker
+    process, until a ``None`` input is received.
+    """
+    torch.set_num_threads(num_threads)
+    model.eval()
+    with torch.no_grad():
+        while True:
+            x = inputs.get()
+            if x is None:
+                break
+            try:
+                outputs.put(model(x))
+            except Exception as error:  # coverage: ignore
+                outputs.put(error)
+
+
+def _is_homogeneous(models: List[nn.Module]) -> bool:
+    """Check that the models share the same architecture, i.e. the same
+    module types and configurations, as given by their ``extra_repr``, and
+    the same parameter and buffer names and shapes.
+    """
+
+    def signature(model: nn.Module) -> List[Tuple]:
+        return (
+            [
+                (name, type(module), module.extra_repr())
+                for name, module in model.named_modules()
+            ]
+            + [(n, p.shape, p.dtype) for n, p in model.named_parameters()]
+            + [(n, b.shape, b.dtype) for n, b in model.named_buffers()]
+        )
+
+    if not models:
+        return False
+    reference = signature(models[0])
+    return all(signature(model) == reference for model in models[1:])
+
+
 class _DeepEnsembles(nn.Module):
     def __init__(
         self,
         models: List[nn.Module],
+        functional: bool = False,
+        executor: Literal["sequential", "threads", "processes"] = "sequential",
+        num_threads: Optional[int] = None,
     ) -> None:
         super().__init__()
 
+        if executor not in executors:
+            raise ValueError(
+                f"executor must be one of {executors}. Got {executor}."
+            )
+
         self.models = nn.ModuleList(models)
         self.num_estimators = len(models)
+        self.functional = functional and _is_homogeneous(models)
+        self.executor = executor
+        if num_threads is None:
+            num_threads = torch.get_num_threads() // max(1, len(models))
+            num_threads = max(1, num_threads)
+        self.num_threads = num_threads
+        self._stacked_state = None
+        self._stacked_versions = None
+        self._pool = None
+        self._workers = None
+        self._shared_input = None
 
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def forward(self, x: Tensor) -> Tensor:
         """Return the logits of the ensemble
 
         Args:
@@ -28,15 +100,367 @@ class _DeepEnsembles(nn.Module):
                 where :math:`B` is the batch size, :math:`N` is the number of
                 estimators, and :math:`C` is the number of classes.
         """
+        if not self.training:
+            if self.functional:
+                return self._functional_forward(x)
+            if self.executor == "threads":
+                return self._threads_forward(x)
+            if self.executor == "processes":
+                return self._processes_forward(x)
         predictions = []
         for model in self.models:
             predictions.append(model.forward(x))
         return torch.stack(predictions, dim=1)
 
+    def anytime_forward(
+        self,
+        x: Tensor,
+        criterion: Literal[
+            "confidence", "disagreement", "mutual_information"
+        ] = "confidence",
+        threshold: float = 0.9,
+        min_estimators: int = 2,
+    ) -> Tuple[Tensor, Tensor]:
+        """Evaluate the members one after the other and stop for each sample
+        as soon as the members evaluated so far are decided enough. Only the
+        undecided samples are fed to the next members.
+
+        Args:
+            x (Tensor): The input of the model.
+            criterion (str, optional): The stopping criterion, computed on the
+                probabilities of the members evaluated so far:
+                ``"confidence"`` stops when the maximum of their mean is at
+                least :attr:`threshold`, ``"disagreement"`` and
+                ``"mutual_information"`` when the disagreement of their
+                predictions or their mutual information is at most
+                :attr:`threshold`. Defaults to ``"confidence"``.
+            threshold (float, optional): The threshold of the criterion.
+                Defaults to 0.9.
+            min_estimators (int, optional): The number of members evaluated
+                on every sample. Defaults to 2.
+
+        Returns:
+            Tuple[Tensor, Tensor]: The mean probabilities of the members
+                evaluated on each sample, with shape :math:`(B, C)`, and the
+                number of members evaluated on each sample, with shape
+                :math:`(B,)`.
+
+        Raises:
+            ValueError: If :attr:criterion is not a valid stopping criterion.
+            ValueError: If :attr:min_estimators is not between 1 (2 for the
+                disagreement and the mutual information) and the number of
+                members.
+        """
+        if criterion not in stopping_criteria:
+            raise ValueError(
+                f"criterion must be one of {stopping_criteria}. Got "
+                f"{criterion}."
+            )
+        lowest = 1 if criterion == "confidence" else 2
+        if not lowest <= min_estimators <= self.num_estimators:
+            raise ValueError(
+                f"min_estimators must be between {lowest} and "
+                f"{self.num_estimators} with the {criterion} criterion. Got "
+                f"{min_estimators}."
+            )
+        active = torch.arange(x.size(0), device=x.device)
+        probs_sum, votes, entropy_sum, counts = None, None, None, None
+        for k, model in enumerate(self.models, start=1):
+            probs = model.forward(x[active]).softmax(-1)
+            if probs_sum is None:
+                probs_sum = torch.zeros(x.size(0), probs.size(-1)).to(probs)
+                votes = torch.zeros_like(probs_sum)
+                entropy_sum = probs_sum.new_zeros(x.size(0))
+                counts = torch.zeros(
+                    x.size(0), dtype=torch.long, device=x.device
+                )
+            # running statistics of the members evaluated on each sample
+            probs_sum[active] += probs
+            votes[active] += nn.functional.one_hot(
+                probs.argmax(-1), probs.size(-1)
+            ).to(votes)
+            entropy_sum[active] += torch.special.entr(probs).sum(-1)
+            counts[active] += 1
+            if k < min_estimators or k == self.num_estimators:
+                continue
+
+            mean = probs_sum[active] / k
+            if criterion == "confidence":
+                done = mean.max(-1).values >= threshold
+            elif criterion == "disagreement":
+                pairs = votes[active] * (votes[active] - 1) / 2
+                done = 1 - pairs.sum(-1) / (k * (k - 1) / 2) <= threshold
+            else:
+                entropy = torch.special.entr(mean).sum(-1)
+                done = entropy - entropy_sum[active] / k <= threshold
+            active = active[~done]
+            if active.numel() == 0:
+                break
+        return probs_sum / counts.unsqueeze(-1), counts
+
+    def _threads_forward(self, x: Tensor) -> Tensor:
+        """Run each member in its own thread, with an intra-op budget of
+        :attr:`num_threads` threads. The budget of PyTorch being partly
+        process-wide, that of the calling thread is restored afterwards.
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.num_estimators)
+
+        def member_forward(model: nn.Module) -> Tensor:
+            torch.set_num_threads(self.num_threads)
+            return model.forward(x)
+
+        num_threads = torch.get_num_threads()
+        try:
+            futures = [
+                self._pool.submit(member_forward, model)
+                for model in self.models
+            ]
+            predictions = [future.result() for future in futures]
+        finally:
+            torch.set_num_threads(num_threads)
+        return torch.stack(predictions, dim=1)
+
+    def _processes_forward(self, x: Tensor) -> Tensor:
+        """Run each member in its own worker process. The members' tensors
+        and the inputs are shared with the workers through shared memory and
+        the outputs are not differentiable.
+        """
+        if self._workers is None:
+            self._start_workers()
+        # the shared input buffer is reused while the input shape is unchanged
+        shared = self._shared_input
+        if shared is None or shared.shape != x.shape or shared.dtype != x.dtype:
+            shared = torch.empty_like(x).share_memory_()
+            self._shared_input = shared
+        shared.copy_(x)
+        for _, inputs, _ in self._workers:
+            inputs.put(shared)
+        predictions = [outputs.get() for _, _, outputs in self._workers]
+        for prediction in predictions:
+            if isinstance(prediction, Exception):  # coverage: ignore
+                raise prediction
+        return torch.stack(predictions, dim=1)
+
+    def _start_workers(self) -> None:
+        context = mp.get_context("spawn")
+        self._workers = []
+        for model in self.models:
+            model.share_memory()
+            inputs, outputs = context.Queue(), context.Queue()
+            process = context.Process(
+                target=_member_worker,
+                args=(model, self.num_threads, inputs, outputs),
+                daemon=True,
+            )
+            process.start()
+            self._workers.append((process, inputs, outputs))
+
+    def close(self) -> None:
+        """Shut down the threads and the worker processes of the executor.
+        They are started again by the next forward pass if needed.
+        They are also shut down when the ensemble is garbage collected.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._workers is not None:
+            for process, inputs, _ in self._workers:
+                inputs.put(None)
+                process.join()
+            self._workers = None
+        self._shared_input = None
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:  # coverage: ignore
+            # e.g. partially built or at interpreter shutdown
+            pass
+
+    def __getstate__(self):
+        # a copy, the executors of the original stay alive
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_workers"] = None
+        state["_shared_input"] = None
+        return state
+
+    def _functional_forward(self, x: Tensor) -> Tensor:
+        """Evaluate all the members in one vectorized call on their stacked
+        parameters and buffers.
+        """
+        params, buffers = self._stack_state()
+
+        def member_forward(params, buffers, x):
+            return functional_call(self.models[0], (params, buffers), (x,))
+
+        predictions = vmap(
+            member_forward, in_dims=(0, 0, None), randomness="different"
+        )(params, buffers, x)
+        return predictions.transpose(0, 1)
+
+    def _stack_state(self) -> Tuple[Dict[str, Tensor], Dict[str, Tensor]]:
+        """Stack the states of the members, differentiably. Without gradients,
+        the stacks are cached until a member tensor is replaced or modified in
+        place.
+        """
+        if torch.is_grad_enabled():
+            return self._stack()
+
+        versions = [
+            (tensor.data_ptr(), tensor._version)
+            for model in self.models
+            for tensor in [*model.parameters(), *model.buffers()]
+        ]
+        if versions != self._stacked_versions:
+            self._stacked_state = self._stack()
+            self._stacked_versions = versions
+        return self._stacked_state
+
+    def _stack(self) -> Tuple[Dict[str, Tensor], Dict[str, Tensor]]:
+        states = []
+        for named_tensors in ["named_parameters", "named_buffers"]:
+            members = [
+                dict(getattr(model, named_tensors)()) for model in self.models
+            ]
+            states.append(
+                {
+                    name: torch.stack([member[name] for member in members])
+                    for name in members[0]
+                }
+            )
+        return tuple(states)
+
+
+class _LazyDeepEnsembles(nn.Module):
+    def __init__(
+        self,
+        model: nn.Module,
+        checkpoints: List[Union[str, Path]],
+        max_resident: int = 1,
+    ) -> None:
+        super().__init__()
+        self.checkpoints = [Path(checkpoint) for checkpoint in checkpoints]
+        self.num_estimators = len(self.checkpoints)
+        self.max_resident = max_resident
+        # the slots hold the resident members, the first one is the template
+        self.slots = nn.ModuleList([model])
+        self._resident = OrderedDict()
+
+    def member(self, index: int) -> nn.Module:
+        """Get a member of the ensemble, loading its weights from its
+        memory-mapped checkpoint into the slot of the least recently used
+        member if it is not resident.
+
+        Args:
+            index (int): The index of the member.
+
+        Returns:
+            nn.Module: The member.
+        """
+        if index in self._resident:
+            self._resident.move_to_end(index)
+            return self.slots[self._resident[index]]
+
+        if len(self._resident) < self.max_resident:
+            slot = len(self._resident)
+            if slot == len(self.slots):
+                self.slots.append(copy.deepcopy(self.slots[0]))
+        else:
+            _, slot = self._resident.popitem(last=False)
+        self.slots[slot].load_state_dict(
+            load_mmap_state_dict(self.checkpoints[index])
+        )
+        self._resident[index] = slot
+        return self.slots[slot]
+
+    def forward(self, x: Tensor) -> Tensor:
+        """Return the logits of the ensemble, starting with the resident
+        members to limit the number of loads.
+
+        Warning:
+            With fewer resident members than members, each call reloads
+            members: it suits single batches only. Evaluate datasets with
+            :meth:`predict`, the supported entry point, which loads each
+            member once.
+
+        Args:
+            x (Tensor): The input of the model.
+
+        Returns:
+            Tensor: The output of the model with shape :math:`(B, N, C)`,
+                where :math:`B` is the batch size, :math:`N` is the number of
+                estimators, and :math:`C` is the number of classes.
+        """
+        order = list(self._resident)
+        order += [i for i in range(self.num_estimators) if i not in order]
+        predictions = [None] * self.num_estimators
+        for index in order:
+            predictions[index] = self.member(index).forward(x)
+        return torch.stack(predictions, dim=1)
+
+    @torch.no_grad()
+    def predict(
+        self, dataloader: Iterable, path: Union[str, Path], num_samples: int
+    ) -> Tensor:
+        """Evaluate the ensemble member-major: each member is loaded once and
+        run on the whole dataloader, and its probabilities are written to a
+        memory-mapped ``.npy`` file.
+
+        Args:
+            dataloader (Iterable): The batches, either inputs or tuples whose
+                first element is the input. It must yield the same samples
+                in the same order at each iteration.
+            path (Union[str, Path]): The path of the ``.npy`` file.
+            num_samples (int): The number of samples of the dataloader.
+
+        Returns:
+            Tensor: The probabilities of the members, backed by the file,
+                with shape :math:`(N, S, C)`, where :math:`S` is the number
+                of samples.
+
+        Raises:
+            ValueError: If :attr:`dataloader` yields no batch.
+        """
+        self.eval()
+        device = next(self.slots[0].parameters()).device
+        order = list(self._resident)
+        order += [i for i in range(self.num_estimators) if i not in order]
+        probs = None
+        for index in order:
+            model, start = self.member(index), 0
+            for batch in dataloader:
+                if isinstance(batch, (tuple, list)):
+                    batch = batch[0]
+                batch_probs = model(batch.to(device)).softmax(-1).cpu()
+                if probs is None:
+                    probs = np.lib.format.open_memmap(
+                        path,
+                        mode="w+",
+                        dtype=np.float32,
+                        shape=(
+                            self.num_estimators,
+                            num_samples,
+                            batch_probs.shape[-1],
+                        ),
+                    )
+                probs[
+                    index, start : start + batch_probs.shape[0]
+                ] = batch_probs.numpy()
+                start += batch_probs.shape[0]
+            if probs is None:
+                raise ValueError("The dataloader yields no batch.")
+        probs.flush()
+        return torch.from_numpy(probs)
+
 
 def deep_ensembles(
     models: Union[List[nn.Module], nn.Module],
     num_estimators: Optional[int] = None,
+    functional: bool = False,
+    executor: Literal["sequential", "threads", "processes"] = "sequential",
+    num_threads: Optional[int] = None,
 ) -> nn.Module:
     """
     Builds a Deep Ensembles out of the original models.
@@ -44,6 +468,17 @@ def deep_ensembles(
     Args:
         model (nn.Module): The model to be ensembled.
         num_estimators (int): The number of estimators in the ensemble.
+        functional (bool, optional): Whether to evaluate the members with one
+            vectorized call on their stacked parameters and buffers at
+            inference. Falls back to a loop over the members if they do not
+            share the same architecture. Defaults to False.
+        executor (str, optional): How to run the members at inference:
+            ``"sequential"``, ``"threads"`` (one thread per member) or
+            ``"processes"`` (one worker process per member, reading the inputs
+            from shared memory). Defaults to ``"sequential"``.
+        num_threads (int, optional): Intra-op threads of each member with the
+            ``"threads"`` and ``"processes"`` executors. Defaults to the
+            number of threads of torch divided by the number of members.
 
     Returns:
         nn.Module: The ensembled model.
@@ -55,6 +490,7 @@ def deep_ensembles(
             a module (or singleton list).
         ValueError: If :attr:num_estimators is defined while :attr:models is
             a (non-singleton) list.
+        ValueError: If :attr:executor is not a valid executor.
 
     References:
         Balaji Lakshminarayanan, Alexander Pritzel, and Charles Blundell.
@@ -88,4 +524,44 @@ def deep_ensembles(
             "num_estimators must be None if you provided a non-singleton list."
         )
 
-    return _DeepEnsembles(models=models)
+    return _DeepEnsembles(
+        models=models,
+        functional=functional,
+        executor=executor,
+        num_threads=num_threads,
+    )
+
+
+def lazy_deep_ensembles(
+    model: nn.Module,
+    checkpoints: List[Union[str, Path]],
+    max_resident: int = 1,
+) -> nn.Module:
+    """
+    Builds a Deep Ensembles whose members are streamed from memory-mapped
+    checkpoints, with at most :attr:max_resident members in memory.
+
+    Args:
+        model (nn.Module): The architecture of the members, whose weights are
+            overwritten by the ones of the checkpoints.
+        checkpoints (List[Union[str, Path]]): The state dicts of the members,
+            saved with :func:`torch_uncertainty.utils.save_mmap_state_dict`.
+        max_resident (int, optional): The maximum number of members in
+            memory, evicted in least recently used order. Defaults to 1.
+
+    Returns:
+        nn.Module: The ensembled model.
+
+    Raises:
+        ValueError: If :attr:checkpoints is empty.
+        ValueError: If :attr:max_resident is less than 1.
+    """
+    if not checkpoints:
+        raise ValueError("checkpoints must not be empty.")
+    if max_resident < 1:
+        raise ValueError(
+            f"max_resident must be at least 1. Got {max_resident}."
+        )
+    return _LazyDeepEnsembles(
+        model=model, checkpoints=checkpoints, max_resident=max_resident
+    )
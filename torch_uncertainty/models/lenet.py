@@ -5,7 +5,12 @@ import torch
 import torch.nn.functional as F
 from torch import Tensor, nn
 
-from ..layers.bayesian import BayesConv2d, BayesLinear
+from ..layers.bayesian import (
+    BayesConv2d,
+    BayesLinear,
+    FlipoutConv2d,
+    FlipoutLinear,
+)
 from ..layers.packed import PackedConv2d, PackedLinear
 from .utils import StochasticModel, toggle_dropout
 
@@ -35,37 +40,40 @@ class _LeNet(nn.Module):
         self.num_estimators = num_estimators
         self.last_layer_dropout = last_layer_dropout
 
+        # Packed layers keep the estimator-major layout from the first
+        # convolution to the last linear layer, which is the only one to
+        # rearrange its output.
+        conv1_args, linear_args, fc3_args = {}, {}, {}
+        if conv2d_layer == PackedConv2d:
+            conv1_args = {"first": True}
+        if linear_layer == PackedLinear:
+            linear_args = {"packed_layout": True}
+            fc3_args = {"last": True}
+
         self.conv1 = conv2d_layer(
-            in_channels, 6, (5, 5), groups=groups, **layer_args
+            in_channels, 6, (5, 5), groups=groups, **conv1_args, **layer_args
         )
         self.conv2 = conv2d_layer(6, 16, (5, 5), groups=groups, **layer_args)
         self.pooling = nn.AdaptiveAvgPool2d((4, 4))
-        self.fc1 = linear_layer(256, 120, **layer_args)
-        self.fc2 = linear_layer(120, 84, **layer_args)
-        self.fc3 = linear_layer(84, num_classes, **layer_args)
+        self.fc1 = linear_layer(256, 120, **linear_args, **layer_args)
+        self.fc2 = linear_layer(120, 84, **linear_args, **layer_args)
+        self.fc3 = linear_layer(
+            84, num_classes, **linear_args, **fc3_args, **layer_args
+        )
+        self.dropouts = nn.ModuleList(
+            [nn.Dropout(p=dropout_rate) for _ in range(4)]
+        )
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         x = self.handle_dropout(x)
-        out = F.dropout(
-            self.activation(self.norm(self.conv1(x))),
-            p=self.dropout_rate,
-        )
+        out = self.dropouts[0](self.activation(self.norm(self.conv1(x))))
         out = F.max_pool2d(out, 2)
-        out = F.dropout(
-            self.activation(self.norm(self.conv2(out))),
-            p=self.dropout_rate,
-        )
+        out = self.dropouts[1](self.activation(self.norm(self.conv2(out))))
         out = F.max_pool2d(out, 2)
         out = self.pooling(out)
         out = torch.flatten(out, 1)
-        out = F.dropout(
-            self.activation(self.norm(self.fc1(out))),
-            p=self.dropout_rate,
-        )
-        out = F.dropout(
-            self.activation(self.norm(self.fc2(out))),
-            p=self.dropout_rate,
-        )
+        out = self.dropouts[2](self.activation(self.norm(self.fc1(out))))
+        out = self.dropouts[3](self.activation(self.norm(self.fc2(out))))
         out = self.fc3(out)
         return out
 
@@ -180,6 +188,8 @@ def bayesian_lenet(
     prior_pi: Optional[float] = None,
     mu_init: Optional[float] = None,
     sigma_init: Optional[float] = None,
+    local_reparameterization: bool = False,
+    flipout: bool = False,
     activation: Callable = F.relu,
     norm: Type[nn.Module] = nn.Identity,
     groups: int = 1,
@@ -198,13 +208,15 @@ def bayesian_lenet(
         layers_args["mu_init"] = mu_init
     if sigma_init is not None:
         layers_args["sigma_init"] = sigma_init
+    if local_reparameterization:
+        layers_args["local_reparameterization"] = True
 
     return _lenet(
         stochastic=True,
         in_channels=in_channels,
         num_classes=num_classes,
-        linear_layer=BayesLinear,
-        conv2d_layer=BayesConv2d,
+        linear_layer=FlipoutLinear if flipout else BayesLinear,
+        conv2d_layer=FlipoutConv2d if flipout else BayesConv2d,
         norm=norm,
         layer_args=layers_args,
         activation=activation,
@@ -0,0 +1,139 @@
+# fmt: off
+from typing import List, Tuple
+
+from einops import rearrange
+from torch import Tensor, nn
+
+# fmt: on
+__all__ = ["mc_dropout"]
+
+
+def _dropout_names(model: nn.Module) -> List[str]:
+    """The names of the dropout layers of :attr:`model` with a positive
+    rate, in registration order.
+    """
+    return [
+        name
+        for name, module in model.named_modules()
+        if module.__class__.__name__.startswith("Dropout") and module.p > 0
+    ]
+
+
+def _tile_point(model: nn.Module, dropout: str) -> str:
+    """The name of the module at whose input the samples are tiled: the
+    outermost block of an :class:`nn.Sequential` containing the
+    :attr:`dropout` layer, such as a residual block whose shortcut must see
+    the tiled input too, or the dropout layer itself.
+    """
+    point, name = dropout, dropout
+    while name:
+        parent = name.rpartition(".")[0]
+        if isinstance(model.get_submodule(parent), nn.Sequential):
+            point = name
+        name = parent
+    return point
+
+
+class _MCDropout(nn.Module):
+    def __init__(
+        self,
+        model: nn.Module,
+        num_estimators: int,
+        last_layer_dropout: bool,
+    ) -> None:
+        super().__init__()
+        self.model = model
+        self.num_estimators = num_estimators
+        self.last_layer_dropout = last_layer_dropout
+
+        dropouts = _dropout_names(model)
+        self.dropouts = dropouts[-1:] if last_layer_dropout else dropouts
+        self.tile_point = _tile_point(model, self.dropouts[0])
+
+    def forward(self, x: Tensor) -> Tensor:
+        """Return the logits of the samples of the dropout masks at inference,
+        or of the model in training mode.
+
+        Args:
+            x (Tensor): The input of the model.
+
+        Returns:
+            Tensor: The output of the model in training mode, otherwise the
+                samples with shape :math:`(B, T, C)`, where :math:`B` is the
+                batch size, :math:`T` is the number of estimators, and
+                :math:`C` is the number of classes.
+        """
+        if self.training:
+            return self.model(x)
+
+        # the deterministic layers run once, the tiling hook runs once
+        def tile(module: nn.Module, inputs: Tuple[Tensor]) -> Tuple[Tensor]:
+            handle.remove()
+            (input,) = inputs
+            repeats = [self.num_estimators] + [1] * (input.dim() - 1)
+            return (input.repeat(*repeats),)
+
+        tile_point = self.model.get_submodule(self.tile_point)
+        handle = tile_point.register_forward_pre_hook(tile)
+        dropouts = [self.model.get_submodule(name) for name in self.dropouts]
+        for dropout in dropouts:
+            dropout.train()
+        try:
+            out = self.model(x)
+        finally:
+            handle.remove()
+            for dropout in dropouts:
+                dropout.eval()
+        return rearrange(out, "(t b) c -> b t c", t=self.num_estimators)
+
+
+def mc_dropout(
+    model: nn.Module, num_estimators: int, last_layer_dropout: bool = False
+) -> nn.Module:
+    """
+    Builds a Monte-Carlo Dropout model drawing :attr:`num_estimators` samples
+    of the dropout masks in a single batched forward at inference.
+
+    The layers preceding the first sampled dropout layer are deterministic:
+    they are evaluated once, and their output is tiled
+    :attr:`num_estimators` times before the rest of the model. The model must
+    chain its modules up to the first sampled dropout layer, which is the
+    case of the LeNet, MLP, ResNet, WideResNet and VGG models.
+
+    Args:
+        model (nn.Module): The model, with dropout layers and no
+            :attr:`num_estimators` of its own.
+        num_estimators (int): The number of samples of the dropout masks.
+        last_layer_dropout (bool, optional): Whether to only sample the last
+            dropout layer, such that the inference costs little more than a
+            single forward. Defaults to ``False``.
+
+    Returns:
+        nn.Module: The Monte-Carlo Dropout model.
+
+    Raises:
+        ValueError: If :attr:num_estimators is less than 1.
+        ValueError: If :attr:model has no dropout layer with a positive
+            rate.
+        ValueError: If :attr:model repeats its inputs itself.
+
+    References:
+        Yarin Gal and Zoubin Ghahramani. Dropout as a Bayesian approximation:
+        Representing model uncertainty in deep learning. In ICML, 2016.
+    """
+    if num_estimators < 1:
+        raise ValueError(
+            f"num_estimators must be at least 1. Got {num_estimators}."
+        )
+    if not _dropout_names(model):
+        raise ValueError("The model has no dropout layer with a positive rate.")
+    if getattr(model, "num_estimators", None) is not None:
+        raise ValueError(
+            "The model must not have its own num_estimators, it would repeat "
+            "its inputs."
+        )
+    return _MCDropout(
+        model=model,
+        num_estimators=num_estimators,
+        last_layer_dropout=last_layer_dropout,
+    )
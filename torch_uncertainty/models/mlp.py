@@ -4,7 +4,7 @@ from typing import Callable, Dict, List, Type, Union
 import torch.nn.functional as F
 from torch import Tensor, nn
 
-from ..layers.bayesian import BayesLinear
+from ..layers.bayesian import BayesLinear, FlipoutLinear
 from ..layers.packed import PackedLinear
 from ..models.utils import StochasticModel
 
@@ -75,11 +75,13 @@ class _MLP(nn.Module):
                 layers.append(layer(hidden_dims[-1], num_outputs, **layer_args))
 
         self.layers = layers
+        self.dropouts = nn.ModuleList(
+            [nn.Dropout(p=dropout) for _ in range(len(layers) - 1)]
+        )
 
     def forward(self, x: Tensor) -> Tensor:
-        for layer in self.layers[:-1]:
-            x = F.dropout(layer(x), p=self.dropout, training=self.training)
-            x = self.activation(x)
+        for layer, dropout in zip(self.layers[:-1], self.dropouts):
+            x = self.activation(dropout(layer(x)))
         out = self.layers[-1](x)
         return out
 
@@ -156,11 +158,33 @@ def packed_mlp(
     gamma: float = 1,
     activation: Callable = F.relu,
     dropout: float = 0.0,
+    packed_layout: bool = True,
 ) -> _MLP:
+    """Packed-Ensembles multi-layer perceptron.
+
+    Args:
+        in_features (int): Number of input features.
+        num_outputs (int): Number of output features.
+        hidden_dims (List[int]): Number of features in each hidden layer.
+        num_estimators (int, optional): Number of estimators. Defaults to 4.
+        alpha (float, optional): Width multiplier. Defaults to 2.
+        gamma (float, optional): Number of groups within each estimator.
+            Defaults to 1.
+        activation (Callable, optional): Activation function. Defaults to
+            F.relu.
+        dropout (float, optional): Dropout probability. Defaults to 0.0.
+        packed_layout (bool, optional): Keep the activations in the
+            estimator-major layout between the packed layers instead of
+            rearranging them in each layer. Defaults to ``True``.
+
+    Returns:
+        _MLP: A Packed-Ensembles Multi-Layer-Perceptron model.
+    """
     layer_args = {
         "num_estimators": num_estimators,
         "alpha": alpha,
         "gamma": gamma,
+        "packed_layout": packed_layout,
     }
     return _mlp(
         False,
@@ -180,13 +204,16 @@ def bayesian_mlp(
     hidden_dims: List[int] = [],
     activation: Callable = F.relu,
     dropout: float = 0.0,
+    local_reparameterization: bool = False,
+    flipout: bool = False,
 ) -> _StochasticMLP:
     return _mlp(
         True,
         in_features=in_features,
         num_outputs=num_outputs,
         hidden_dims=hidden_dims,
-        layer=BayesLinear,
+        layer=FlipoutLinear if flipout else BayesLinear,
+        layer_args={"local_reparameterization": local_reparameterization},
         activation=activation,
         dropout=dropout,
     )
@@ -7,6 +7,7 @@ Reference:
 # fmt: off
 from typing import List, Type, Union
 
+import torch
 import torch.nn.functional as F
 from torch import Tensor, nn
 
@@ -78,6 +79,31 @@ class BasicBlock(nn.Module):
         out = F.relu(out)
         return out
 
+    @torch.no_grad()
+    def fuse_for_inference(self) -> None:
+        self.conv1 = self.conv1.fold(self.bn1)
+        self.bn1 = nn.Identity()
+        self.conv2 = self.conv2.fold(self.bn2)
+        self.bn2 = nn.Identity()
+        if len(self.shortcut):
+            # the shortcut convolution is shared by the estimators
+            conv = self.shortcut[0]
+            shortcut = BatchConv2d(
+                conv.in_channels,
+                conv.out_channels,
+                kernel_size=conv.kernel_size,
+                num_estimators=self.conv1.num_estimators,
+                stride=conv.stride,
+                groups=conv.groups,
+                bias=False,
+                device=conv.weight.device,
+                dtype=conv.weight.dtype,
+            )
+            shortcut.conv = conv
+            nn.init.ones_(shortcut.R)
+            nn.init.ones_(shortcut.S)
+            self.shortcut = nn.Sequential(shortcut.fold(self.shortcut[1]))
+
 
 class Bottleneck(nn.Module):
     expansion = 4
@@ -144,6 +170,19 @@ class Bottleneck(nn.Module):
         out = F.relu(out)
         return out
 
+    @torch.no_grad()
+    def fuse_for_inference(self) -> None:
+        self.conv1 = self.conv1.fold(self.bn1)
+        self.bn1 = nn.Identity()
+        self.conv2 = self.conv2.fold(self.bn2)
+        self.bn2 = nn.Identity()
+        self.conv3 = self.conv3.fold(self.bn3)
+        self.bn3 = nn.Identity()
+        if len(self.shortcut):
+            self.shortcut = nn.Sequential(
+                self.shortcut[0].fold(self.shortcut[1])
+            )
+
 
 class _BatchedResNet(nn.Module):
     def __init__(
@@ -160,6 +199,7 @@ class _BatchedResNet(nn.Module):
         super().__init__()
         self.in_planes = 64 * width_multiplier
         self.num_estimators = num_estimators
+        self.fused = False
 
         self.width_multiplier = width_multiplier
         if style == "imagenet":
@@ -253,7 +293,10 @@ class _BatchedResNet(nn.Module):
         return nn.Sequential(*layers)
 
     def forward(self, x):
-        out = x.repeat(self.num_estimators, 1, 1, 1)
+        if self.fused:
+            out = x.repeat(1, self.num_estimators, 1, 1)
+        else:
+            out = x.repeat(self.num_estimators, 1, 1, 1)
         out = F.relu(self.bn1(self.conv1(out)))
         out = self.optional_pool(out)
         out = self.layer1(out)
@@ -265,6 +308,27 @@ class _BatchedResNet(nn.Module):
         out = self.linear(out)
         return out
 
+    @torch.no_grad()
+    def fuse_for_inference(self) -> None:
+        """Fold the BatchEnsemble layers and the BatchNorm layers into
+        grouped convolutions for inference.
+
+        The estimators are then evaluated as a single network processing the
+        channels of all estimators side by side. The outputs are unchanged
+        up to floating-point errors. The model is switched to eval mode and
+        cannot be trained afterwards.
+        """
+        if self.fused:
+            return
+        self.eval()
+        self.conv1 = self.conv1.fold(self.bn1)
+        self.bn1 = nn.Identity()
+        for layer in [self.layer1, self.layer2, self.layer3, self.layer4]:
+            for block in layer:
+                block.fuse_for_inference()
+        self.linear = self.linear.fold()
+        self.fused = True
+
 
 def batched_resnet18(
     in_channels: int,
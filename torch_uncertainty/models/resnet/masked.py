@@ -1,10 +1,12 @@
 # fmt: off
-from typing import List, Type, Union
+from itertools import repeat
+from typing import Iterator, List, Optional, Type, Union
 
 import torch.nn.functional as F
 from torch import Tensor, nn
 
 from ...layers import MaskedConv2d, MaskedLinear
+from ...layers.masksembles import layer_seeds
 
 # fmt: on
 __all__ = [
@@ -27,6 +29,7 @@ class BasicBlock(nn.Module):
         num_estimators: int = 4,
         scale: float = 2.0,
         groups: int = 1,
+        seeds: Iterator[Optional[int]] = repeat(None),
     ):
         super(BasicBlock, self).__init__()
 
@@ -36,6 +39,7 @@ class BasicBlock(nn.Module):
             kernel_size=3,
             num_estimators=num_estimators,
             scale=scale,
+            seed=next(seeds),
             groups=groups,
             stride=stride,
             padding=1,
@@ -48,6 +52,7 @@ class BasicBlock(nn.Module):
             kernel_size=3,
             num_estimators=num_estimators,
             scale=scale,
+            seed=next(seeds),
             stride=1,
             padding=1,
             groups=groups,
@@ -64,6 +69,7 @@ class BasicBlock(nn.Module):
                     kernel_size=1,
                     num_estimators=num_estimators,
                     scale=scale,
+                    seed=next(seeds),
                     stride=stride,
                     groups=groups,
                     bias=False,
@@ -90,6 +96,7 @@ class Bottleneck(nn.Module):
         num_estimators: int = 4,
         scale: float = 2.0,
         groups: int = 1,
+        seeds: Iterator[Optional[int]] = repeat(None),
     ):
         super(Bottleneck, self).__init__()
 
@@ -99,6 +106,7 @@ class Bottleneck(nn.Module):
             kernel_size=1,
             num_estimators=num_estimators,
             scale=scale,
+            seed=next(seeds),
             groups=groups,
             bias=False,
         )
@@ -109,6 +117,7 @@ class Bottleneck(nn.Module):
             kernel_size=3,
             num_estimators=num_estimators,
             scale=scale,
+            seed=next(seeds),
             stride=stride,
             padding=1,
             groups=groups,
@@ -121,6 +130,7 @@ class Bottleneck(nn.Module):
             kernel_size=1,
             num_estimators=num_estimators,
             scale=scale,
+            seed=next(seeds),
             groups=groups,
             bias=False,
         )
@@ -135,6 +145,7 @@ class Bottleneck(nn.Module):
                     kernel_size=1,
                     num_estimators=num_estimators,
                     scale=scale,
+                    seed=next(seeds),
                     stride=stride,
                     groups=groups,
                     bias=False,
@@ -162,6 +173,7 @@ class _MaskedResNet(nn.Module):
         scale: float = 2.0,
         groups: int = 1,
         style: str = "imagenet",
+        seed: Optional[int] = None,
     ) -> None:
         super().__init__()
 
@@ -201,6 +213,7 @@ class _MaskedResNet(nn.Module):
         else:
             self.optional_pool = nn.Identity()
 
+        seeds = layer_seeds(seed)
         self.layer1 = self._make_layer(
             block,
             block_planes,
@@ -209,6 +222,7 @@ class _MaskedResNet(nn.Module):
             num_estimators=num_estimators,
             scale=scale,
             groups=groups,
+            seeds=seeds,
         )
         self.layer2 = self._make_layer(
             block,
@@ -218,6 +232,7 @@ class _MaskedResNet(nn.Module):
             num_estimators=num_estimators,
             scale=scale,
             groups=groups,
+            seeds=seeds,
         )
         self.layer3 = self._make_layer(
             block,
@@ -227,6 +242,7 @@ class _MaskedResNet(nn.Module):
             num_estimators=num_estimators,
             scale=scale,
             groups=groups,
+            seeds=seeds,
         )
         self.layer4 = self._make_layer(
             block,
@@ -236,6 +252,7 @@ class _MaskedResNet(nn.Module):
             num_estimators=num_estimators,
             scale=scale,
             groups=groups,
+            seeds=seeds,
         )
 
         self.pool = nn.AdaptiveAvgPool2d(output_size=1)
@@ -246,6 +263,7 @@ class _MaskedResNet(nn.Module):
             num_classes,
             num_estimators,
             scale=scale,
+            seed=next(seeds),
         )
 
     def _make_layer(
@@ -257,6 +275,7 @@ class _MaskedResNet(nn.Module):
         num_estimators: int,
         scale: float,
         groups: int,
+        seeds: Iterator[Optional[int]],
     ) -> nn.Module:
         strides = [stride] + [1] * (num_blocks - 1)
         layers = []
@@ -269,6 +288,7 @@ class _MaskedResNet(nn.Module):
                     num_estimators,
                     scale=scale,
                     groups=groups,
+                    seeds=seeds,
                 )
             )
             self.in_planes = planes * block.expansion
@@ -296,6 +316,7 @@ def masked_resnet18(
     groups: int,
     num_classes: int,
     style: str = "imagenet",
+    seed: Optional[int] = None,
 ) -> _MaskedResNet:
     """Masksembles of ResNet-18 from `Deep Residual Learning for Image
     Recognition <https://arxiv.org/pdf/1512.03385.pdf>`_.
@@ -305,6 +326,9 @@ def masked_resnet18(
         num_estimators (int): Number of estimators in the ensemble.
         groups (int): Number of groups within each estimator.
         num_classes (int): Number of classes to predict.
+        seed (int, optional): Base seed of the masks generation, offset by
+            the index of each masked layer. If set, the masks are cached on
+            disk and reused by later constructions. Defaults to ``None``.
 
     Returns:
         _MaskedResNet: A Masksembles-style ResNet-18.
@@ -318,6 +342,7 @@ def masked_resnet18(
         groups=groups,
         num_classes=num_classes,
         style=style,
+        seed=seed,
     )
 
 
@@ -328,6 +353,7 @@ def masked_resnet34(
     groups: int,
     num_classes: int,
     style: str = "imagenet",
+    seed: Optional[int] = None,
 ) -> _MaskedResNet:
     """Masksembles of ResNet-34 from `Deep Residual Learning for Image
     Recognition <https://arxiv.org/pdf/1512.03385.pdf>`_.
@@ -337,6 +363,9 @@ def masked_resnet34(
         num_estimators (int): Number of estimators in the ensemble.
         groups (int): Number of groups within each estimator.
         num_classes (int): Number of classes to predict.
+        seed (int, optional): Base seed of the masks generation, offset by
+            the index of each masked layer. If set, the masks are cached on
+            disk and reused by later constructions. Defaults to ``None``.
 
     Returns:
         _MaskedResNet: A Masksembles-style ResNet-34.
@@ -350,6 +379,7 @@ def masked_resnet34(
         groups=groups,
         num_classes=num_classes,
         style=style,
+        seed=seed,
     )
 
 
@@ -360,6 +390,7 @@ def masked_resnet50(
     groups: int,
     num_classes: int,
     style: str = "imagenet",
+    seed: Optional[int] = None,
 ) -> _MaskedResNet:
     """Masksembles of ResNet-50 from `Deep Residual Learning for Image
     Recognition <https://arxiv.org/pdf/1512.03385.pdf>`_.
@@ -369,6 +400,9 @@ def masked_resnet50(
         num_estimators (int): Number of estimators in the ensemble.
         groups (int): Number of groups within each estimator.
         num_classes (int): Number of classes to predict.
+        seed (int, optional): Base seed of the masks generation, offset by
+            the index of each masked layer. If set, the masks are cached on
+            disk and reused by later constructions. Defaults to ``None``.
 
     Returns:
         _MaskedResNet: A Masksembles-style ResNet-50.
@@ -382,6 +416,7 @@ def masked_resnet50(
         groups=groups,
         num_classes=num_classes,
         style=style,
+        seed=seed,
     )
 
 
@@ -392,6 +427,7 @@ def masked_resnet101(
     groups: int,
     num_classes: int,
     style: str = "imagenet",
+    seed: Optional[int] = None,
 ) -> _MaskedResNet:
     """Masksembles of ResNet-101 from `Deep Residual Learning for Image
     Recognition <https://arxiv.org/pdf/1512.03385.pdf>`_.
@@ -401,6 +437,9 @@ def masked_resnet101(
         num_estimators (int): Number of estimators in the ensemble.
         groups (int): Number of groups within each estimator.
         num_classes (int): Number of classes to predict.
+        seed (int, optional): Base seed of the masks generation, offset by
+            the index of each masked layer. If set, the masks are cached on
+            disk and reused by later constructions. Defaults to ``None``.
 
     Returns:
         _MaskedResNet: A Masksembles-style ResNet-101.
@@ -414,6 +453,7 @@ def masked_resnet101(
         groups=groups,
         num_classes=num_classes,
         style=style,
+        seed=seed,
     )
 
 
@@ -424,6 +464,7 @@ def masked_resnet152(
     groups: int,
     num_classes: int,
     style: str = "imagenet",
+    seed: Optional[int] = None,
 ) -> _MaskedResNet:  # coverage: ignore
     """Masksembles of ResNet-152 from `Deep Residual Learning for Image
     Recognition <https://arxiv.org/pdf/1512.03385.pdf>`_.
@@ -434,6 +475,9 @@ def masked_resnet152(
         scale (float): Expansion factor affecting the width of the estimators.
         groups (int): Number of groups within each estimator.
         num_classes (int): Number of classes to predict.
+        seed (int, optional): Base seed of the masks generation, offset by
+            the index of each masked layer. If set, the masks are cached on
+            disk and reused by later constructions. Defaults to ``None``.
 
     Returns:
         _MaskedResNet: A Masksembles-style ResNet-152.
@@ -447,4 +491,5 @@ def masked_resnet152(
         groups=groups,
         num_classes=num_classes,
         style=style,
+        seed=seed,
     )
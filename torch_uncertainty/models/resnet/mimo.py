@@ -4,6 +4,7 @@ from typing import List, Type, Union
 import torch
 from einops import rearrange
 
+from ..utils import mimo_shared_input_conv
 from .std import BasicBlock, Bottleneck, _ResNet
 
 # fmt: on
@@ -41,11 +42,15 @@ class _MIMOResNet(_ResNet):
         self.num_estimators = num_estimators
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
-        if not self.training:
-            x = x.repeat(self.num_estimators, 1, 1, 1)
-
-        out = rearrange(x, "(m b) c h w -> b (m c) h w", m=self.num_estimators)
-        out = super().forward(out)
+        if self.training:
+            out = rearrange(
+                x, "(m b) c h w -> b (m c) h w", m=self.num_estimators
+            )
+            out = self.conv1(out)
+        else:
+            # all the subnetworks see the same input at inference
+            out = mimo_shared_input_conv(self.conv1, x, self.num_estimators)
+        out = self._forward_after_conv1(out)
         out = rearrange(out, "b (m d) -> (m b) d", m=self.num_estimators)
         return out
 
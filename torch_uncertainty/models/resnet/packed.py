@@ -1,12 +1,15 @@
 # fmt: off
 from typing import Any, Dict, List, Type, Union
 
+import torch
 import torch.nn.functional as F
 from einops import rearrange
 from torch import Tensor, nn
 
 from ...layers import PackedConv2d, PackedLinear
 from ...utils import load_hf
+from ..deep_ensembles import _is_homogeneous
+from . import std
 
 # fmt: on
 __all__ = [
@@ -15,6 +18,7 @@ __all__ = [
     "packed_resnet50",
     "packed_resnet101",
     "packed_resnet152",
+    "packed_resnet_from_ensemble",
 ]
 
 weight_ids = {
@@ -590,3 +594,73 @@ def packed_resnet152(
             )
         net.load_state_dict(state_dict)
     return net
+
+
+def packed_resnet_from_ensemble(models: List[nn.Module]) -> _PackedResNet:
+    r"""Convert a Deep Ensembles of trained standard ResNets into a single
+    Packed-Ensembles ResNet computing the same logits.
+
+    The packed model has :math:`\alpha = \text{num_estimators} = M` and
+    :math:`\gamma = 1`: the first convolution stacks the filters of the
+    members and the other layers hold their weights block-diagonally in
+    grouped convolutions.
+
+    Args:
+        models (List[nn.Module]): The :math:`M` members, standard ResNets
+            sharing the same architecture.
+
+    Returns:
+        _PackedResNet: The Packed-Ensembles ResNet whose output of shape
+            :math:`(M \times B, C)` holds the logits of the members in
+            order.
+
+    Raises:
+        ValueError: If the members are not standard ResNets with the same
+            architecture, or if they use Monte-Carlo Dropout.
+    """
+    if not all(isinstance(model, std._ResNet) for model in models):
+        raise ValueError("The members must be standard ResNets.")
+    if not _is_homogeneous(models):
+        raise ValueError("The members must share the same architecture.")
+    reference = models[0]
+    if reference.num_estimators is not None:
+        raise ValueError("Members using MC Dropout cannot be converted.")
+
+    num_estimators = len(models)
+    std_block = type(reference.layer1[0])
+    net = _PackedResNet(
+        block=BasicBlock if std_block is std.BasicBlock else Bottleneck,
+        num_blocks=[
+            len(layer)
+            for layer in [
+                reference.layer1,
+                reference.layer2,
+                reference.layer3,
+                reference.layer4,
+            ]
+        ],
+        in_channels=reference.conv1.in_channels,
+        num_classes=reference.linear.out_features,
+        num_estimators=num_estimators,
+        alpha=num_estimators,
+        gamma=1,
+        groups=reference.layer1[0].conv1.groups,
+        style="imagenet"
+        if isinstance(reference.optional_pool, nn.MaxPool2d)
+        else "cifar",
+    )
+
+    # the packed tensors are the concatenations of the tensors of the members
+    # along the output channels, the packed layers wrap the standard ones
+    states = [model.state_dict() for model in models]
+    state_dict = {}
+    for name, tensor in net.state_dict().items():
+        key = name.replace(".conv.", ".").replace(".conv1x1.", ".")
+        if tensor.dim() == 0:
+            state_dict[name] = states[0][key]
+        else:
+            state_dict[name] = torch.cat(
+                [state[key] for state in states]
+            ).view_as(tensor)
+    net.load_state_dict(state_dict)
+    return net.to(reference.conv1.weight.device).train(reference.training)
@@ -1,7 +1,8 @@
 # fmt: off
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
-from torch import nn
+from torch import Tensor, nn
+from torch.func import functional_call, vmap
 
 from ..layers.bayesian import bayesian_modules
 
@@ -44,50 +45,152 @@ def toggle_dropout(
                 m.eval()
 
 
+def mimo_shared_input_conv(
+    conv: nn.Conv2d, x: Tensor, num_estimators: int
+) -> Tensor:
+    """Apply the first convolution of a MIMO model to :attr:`x` fed to all
+    its :attr:`num_estimators` subnetworks, as at inference.
+
+    Since the input slots are identical, the kernels of the slots are summed
+    and the convolution is computed once on :attr:`x`, without building the
+    repeated input. Grouped convolutions fall back to a single copy of the
+    input.
+
+    Args:
+        conv (nn.Conv2d): The first convolution, whose input channels are
+            the channels of the :attr:`num_estimators` slots.
+        x (Tensor): The input of shape :math:`(B, C, H, W)`.
+        num_estimators (int): The number of subnetworks.
+
+    Returns:
+        Tensor: The output of the convolution.
+    """
+    if conv.groups == 1:
+        weight = conv.weight.unflatten(1, (num_estimators, -1)).sum(1)
+        return conv._conv_forward(x, weight, conv.bias)
+    x = x.unsqueeze(1).expand(-1, num_estimators, -1, -1, -1)
+    return conv(x.flatten(1, 2))
+
+
 # fmt: on
 def StochasticModel(model: nn.Module) -> nn.Module:
     """Decorator for stochastic models. When applied to a model, it adds the
-    sample, freeze and unfreeze methods to the model. Use freeze to obtain
-    deterministic outputs. Use unfreeze to obtain stochastic outputs. Samples
-    provide samples of the estimated posterior distribution.
+    sample, sample_posterior, forward_samples, freeze and unfreeze methods to
+    the model. Use freeze to obtain deterministic outputs. Use unfreeze to
+    obtain stochastic outputs. Samples provide samples of the estimated
+    posterior distribution, and forward_samples evaluates a stack of samples
+    in a single vectorized call.
     """
 
+    def _bayesian_modules(self) -> List[Tuple[str, nn.Module]]:
+        return [
+            (name, module)
+            for name, module in self.named_modules()
+            if isinstance(module, bayesian_modules)
+        ]
+
+    setattr(model, "_bayesian_modules", _bayesian_modules)
+
+    def sample_posterior(self, num_samples: int = 1) -> Dict[str, Tensor]:
+        """Draw :attr:`num_samples` independent samples of the weights of
+        the Bayesian layers, stacked along a new first dimension.
+
+        Args:
+            num_samples (int, optional): Number of samples. Defaults to 1.
+
+        Returns:
+            Dict[str, Tensor]: The samples of shape :math:`(S, ...)` of each
+                ``<layer>.weight`` and ``<layer>.bias`` of the Bayesian layers.
+        """
+        samples = {}
+        for name, module in self._bayesian_modules():
+            weight, bias = module.sample(num_samples)
+            samples[name + ".weight"] = weight
+            if bias is not None:
+                samples[name + ".bias"] = bias
+        return samples
+
+    setattr(model, "sample_posterior", sample_posterior)
+
     def sample(self, num_samples: int = 1) -> List[Dict]:
-        sampled_models = [{}] * num_samples
-        for module_name in self._modules:
-            module = self._modules[module_name]
-            if isinstance(module, bayesian_modules):
-                for model in sampled_models:
-                    weight, bias = module.sample()
-                    model[module_name + ".weight"] = weight
-                    if bias is not None:
-                        model[module_name + ".bias"] = bias
-            else:
-                for model in sampled_models:
-                    state = module.state_dict()
-                    if not len(state):  # no parameter
-                        break
+        samples = self.sample_posterior(num_samples)
+        sampled_models = [{} for _ in range(num_samples)]
+        bayesian = dict(self._bayesian_modules())
+        for name, module in self.named_modules():
+            prefix = name + "." if name else ""
+            if name in bayesian:
+                keys = [prefix + "weight", prefix + "bias"]
+                for i, model in enumerate(sampled_models):
                     model |= {
-                        module_name + "." + key: val
-                        for key, val in module.state_dict().items()
+                        key: samples[key][i] for key in keys if key in samples
                     }
+            elif not any(name.startswith(key + ".") for key in bayesian):
+                # the state of the other modules is shared by the samples
+                state = {
+                    **dict(module.named_parameters(recurse=False)),
+                    **{
+                        key: val
+                        for key, val in module.named_buffers(recurse=False)
+                        if key not in module._non_persistent_buffers_set
+                    },
+                }
+                for model in sampled_models:
+                    model |= {prefix + key: val for key, val in state.items()}
         return sampled_models
 
     setattr(model, "sample", sample)
 
+    def forward_samples(
+        self,
+        x: Tensor,
+        samples: Optional[Dict[str, Tensor]] = None,
+        num_samples: int = 1,
+    ) -> Tensor:
+        """Evaluate a stack of samples of the posterior in a single
+        vectorized call.
+
+        Args:
+            x (Tensor): The input of the model.
+            samples (Dict[str, Tensor], optional): The stacked samples of the
+                weights of the Bayesian layers, as returned by
+                :meth:`sample_posterior`. Defaults to None, to draw
+                :attr:`num_samples` new samples.
+            num_samples (int, optional): Number of samples to draw if
+                :attr:`samples` is None. Defaults to 1.
+
+        Returns:
+            Tensor: The outputs of the samples of shape :math:`(B, S, C)`.
+        """
+        if samples is None:
+            samples = self.sample_posterior(num_samples)
+        # the frozen layers use the mean weights, replaced by the samples
+        params = {name + "_mu": val for name, val in samples.items()}
+        layers = [module for _, module in self._bayesian_modules()]
+        frozen = [layer.frozen for layer in layers]
+        for layer in layers:
+            layer.freeze()
+        try:
+            out = vmap(
+                lambda p, x: functional_call(self, p, (x,)),
+                in_dims=(0, None),
+                randomness="different",
+            )(params, x)
+        finally:
+            for layer, was_frozen in zip(layers, frozen):
+                layer.frozen = was_frozen
+        return out.transpose(0, 1)
+
+    setattr(model, "forward_samples", forward_samples)
+
     def freeze(self) -> None:
-        for module_name in self._modules:
-            module = self._modules[module_name]
-            if isinstance(module, bayesian_modules):
-                module.freeze()
+        for _, module in self._bayesian_modules():
+            module.freeze()
 
     setattr(model, "freeze", freeze)
 
     def unfreeze(self) -> None:
-        for module_name in self._modules:
-            module = self._modules[module_name]
-            if isinstance(module, bayesian_modules):
-                module.unfreeze()
+        for _, module in self._bayesian_modules():
+            module.unfreeze()
 
     setattr(model, "unfreeze", unfreeze)
 
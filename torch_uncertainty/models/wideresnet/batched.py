@@ -1,6 +1,7 @@
 # fmt: off
 from typing import Type
 
+import torch
 import torch.nn.functional as F
 from torch import Tensor, nn
 
@@ -67,6 +68,27 @@ class WideBasicBlock(nn.Module):
         out = F.relu(self.bn2(out))
         return out
 
+    @torch.no_grad()
+    def fuse_for_inference(self) -> None:
+        num_estimators = self.conv1.num_estimators
+        self.conv1 = self.conv1.fold(self.bn1)
+        self.bn1 = nn.Identity()
+        self.conv2 = self.conv2.fold()
+        if len(self.shortcut):
+            self.shortcut = nn.Sequential(self.shortcut[0].fold())
+        # bn2 follows the residual sum: repeat it for the packed channels
+        bn2 = nn.BatchNorm2d(
+            self.bn2.num_features * num_estimators,
+            eps=self.bn2.eps,
+            device=self.bn2.weight.device,
+            dtype=self.bn2.weight.dtype,
+        ).eval()
+        bn2.weight.copy_(self.bn2.weight.repeat(num_estimators))
+        bn2.bias.copy_(self.bn2.bias.repeat(num_estimators))
+        bn2.running_mean.copy_(self.bn2.running_mean.repeat(num_estimators))
+        bn2.running_var.copy_(self.bn2.running_var.repeat(num_estimators))
+        self.bn2 = bn2
+
 
 class _BatchedWide(nn.Module):
     def __init__(
@@ -83,6 +105,7 @@ class _BatchedWide(nn.Module):
         super().__init__()
         self.num_estimators = num_estimators
         self.in_planes = 16
+        self.fused = False
 
         assert (depth - 4) % 6 == 0, "Wide-resnet depth should be 6n+4."
         n = (depth - 4) // 6
@@ -188,7 +211,10 @@ class _BatchedWide(nn.Module):
         return nn.Sequential(*layers)
 
     def forward(self, x: Tensor) -> Tensor:
-        out = x.repeat(self.num_estimators, 1, 1, 1)
+        if self.fused:
+            out = x.repeat(1, self.num_estimators, 1, 1)
+        else:
+            out = x.repeat(self.num_estimators, 1, 1, 1)
         out = F.relu(self.bn1(self.conv1(out)))
         out = self.optional_pool(out)
         out = self.layer1(out)
@@ -199,6 +225,27 @@ class _BatchedWide(nn.Module):
         out = self.linear(out)
         return out
 
+    @torch.no_grad()
+    def fuse_for_inference(self) -> None:
+        """Fold the BatchEnsemble layers and the BatchNorm layers into
+        grouped convolutions for inference.
+
+        The estimators are then evaluated as a single network processing the
+        channels of all estimators side by side. The outputs are unchanged
+        up to floating-point errors. The model is switched to eval mode and
+        cannot be trained afterwards.
+        """
+        if self.fused:
+            return
+        self.eval()
+        self.conv1 = self.conv1.fold(self.bn1)
+        self.bn1 = nn.Identity()
+        for layer in [self.layer1, self.layer2, self.layer3]:
+            for block in layer:
+                block.fuse_for_inference()
+        self.linear = self.linear.fold()
+        self.fused = True
+
 
 def batched_wideresnet28x10(
     in_channels: int,
@@ -1,10 +1,12 @@
 # fmt: off
-from typing import Type
+from itertools import repeat
+from typing import Iterator, Optional, Type
 
 import torch.nn.functional as F
 from torch import Tensor, nn
 
 from ...layers import MaskedConv2d, MaskedLinear
+from ...layers.masksembles import layer_seeds
 
 # fmt: on
 __all__ = [
@@ -22,6 +24,7 @@ class WideBasicBlock(nn.Module):
         num_estimators: int = 4,
         scale: float = 2.0,
         groups: int = 1,
+        seeds: Iterator[Optional[int]] = repeat(None),
     ) -> None:
         super().__init__()
         self.conv1 = MaskedConv2d(
@@ -32,6 +35,7 @@ class WideBasicBlock(nn.Module):
             padding=1,
             bias=False,
             scale=scale,
+            seed=next(seeds),
             groups=groups,
         )
         self.dropout = nn.Dropout(p=dropout_rate)
@@ -45,6 +49,7 @@ class WideBasicBlock(nn.Module):
             padding=1,
             bias=False,
             scale=scale,
+            seed=next(seeds),
             groups=groups,
         )
         self.shortcut = nn.Sequential()
@@ -58,6 +63,7 @@ class WideBasicBlock(nn.Module):
                     stride=stride,
                     bias=True,
                     scale=scale,
+                    seed=next(seeds),
                     groups=groups,
                 ),
             )
@@ -83,6 +89,7 @@ class _MaskedWide(nn.Module):
         groups: int = 1,
         dropout_rate: float = 0.0,
         style: str = "imagenet",
+        seed: Optional[int] = None,
     ) -> None:
         super().__init__()
         self.num_estimators = num_estimators
@@ -124,6 +131,7 @@ class _MaskedWide(nn.Module):
         else:
             self.optional_pool = nn.Identity()
 
+        seeds = layer_seeds(seed)
         self.layer1 = self._wide_layer(
             WideBasicBlock,
             nStages[1],
@@ -133,6 +141,7 @@ class _MaskedWide(nn.Module):
             num_estimators=self.num_estimators,
             scale=scale,
             groups=groups,
+            seeds=seeds,
         )
         self.layer2 = self._wide_layer(
             WideBasicBlock,
@@ -143,6 +152,7 @@ class _MaskedWide(nn.Module):
             num_estimators=self.num_estimators,
             scale=scale,
             groups=groups,
+            seeds=seeds,
         )
         self.layer3 = self._wide_layer(
             WideBasicBlock,
@@ -153,13 +163,18 @@ class _MaskedWide(nn.Module):
             num_estimators=self.num_estimators,
             scale=scale,
             groups=groups,
+            seeds=seeds,
         )
 
         self.pool = nn.AdaptiveAvgPool2d(output_size=1)
         self.flatten = nn.Flatten(1)
 
         self.linear = MaskedLinear(
-            nStages[3], num_classes, num_estimators, scale=scale
+            nStages[3],
+            num_classes,
+            num_estimators,
+            scale=scale,
+            seed=next(seeds),
         )
 
     def _wide_layer(
@@ -172,6 +187,7 @@ class _MaskedWide(nn.Module):
         num_estimators: int,
         scale: float = 2.0,
         groups: int = 1,
+        seeds: Iterator[Optional[int]] = repeat(None),
     ) -> nn.Module:
         strides = [stride] + [1] * (int(num_blocks) - 1)
         layers = []
@@ -186,6 +202,7 @@ class _MaskedWide(nn.Module):
                     num_estimators,
                     scale=scale,
                     groups=groups,
+                    seeds=seeds,
                 )
             )
             self.in_planes = planes
@@ -212,6 +229,7 @@ def masked_wideresnet28x10(
     groups: int,
     num_classes: int,
     style: str = "imagenet",
+    seed: Optional[int] = None,
 ) -> _MaskedWide:
     """Masksembles of Wide-ResNet-28x10 from `Wide Residual Networks
     <https://arxiv.org/pdf/1605.07146.pdf>`_.
@@ -224,6 +242,9 @@ def masked_wideresnet28x10(
         num_classes (int): Number of classes to predict.
         style (bool, optional): Whether to use the ImageNet
             structure. Defaults to ``True``.
+        seed (int, optional): Base seed of the masks generation, offset by
+            the index of each masked layer. If set, the masks are cached on
+            disk and reused by later constructions. Defaults to ``None``.
 
     Returns:
         _MaskedWide: A Masksembles-style Wide-ResNet-28x10.
@@ -238,4 +259,5 @@ def masked_wideresnet28x10(
         scale=scale,
         groups=groups,
         style=style,
+        seed=seed,
     )
@@ -187,7 +187,10 @@ class _Wide(nn.Module):
 
     def forward(self, x: Tensor) -> Tensor:
         x = self.handle_dropout(x)
-        out = F.relu(self.bn1(self.conv1(x)))
+        return self._forward_after_conv1(self.conv1(x))
+
+    def _forward_after_conv1(self, out: Tensor) -> Tensor:
+        out = F.relu(self.bn1(out))
         out = self.optional_pool(out)
         out = self.layer1(out)
         out = self.layer2(out)
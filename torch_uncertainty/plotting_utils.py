@@ -1,16 +1,22 @@
 # fmt: off
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import matplotlib.pyplot as plt
 import torch
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
+from .metrics import BinnedCalibrationError
+
 
 # fmt: on
 class CalibrationPlot:
     """A class for plotting calibration figures for classification models.
 
+    The predictions are accumulated in the bins of a
+    :class:`~torch_uncertainty.metrics.BinnedCalibrationError`, in memory
+    independent of their number.
+
     Args:
         mode (str, optional): The mode of the calibration plot. One of
             "top_label" (default).
@@ -21,7 +27,6 @@ class CalibrationPlot:
 
     Raises:
         NotImplementedError: If ``mode`` is not "top_label".
-        NotImplementedError: If ``adaptive`` is ``True``.
         TypeError: If ``num_bins`` is not an ``int``.
         ValueError: If ``num_bins`` is not strictly positive.
     """
@@ -36,11 +41,6 @@ class CalibrationPlot:
         if mode != "top_label":
             raise NotImplementedError(f"Mode {mode} is not yet implemented.")
 
-        if adaptive:
-            raise NotImplementedError(
-                "Adaptive binning is not yet implemented."
-            )
-
         if not isinstance(num_bins, int):
             raise TypeError(f"num_bins should be int. Got {type(num_bins)}.")
         if num_bins < 1:
@@ -49,12 +49,13 @@ class CalibrationPlot:
             )
 
         self.num_bins = num_bins
-        self.bin_width = 1 / num_bins
+        self.adaptive = adaptive
 
         self.figsize = figsize
 
-        self.conf = []
-        self.acc = []
+        self.calibration = BinnedCalibrationError(
+            num_bins=num_bins, adaptive=adaptive
+        )
 
     def update(
         self,
@@ -67,15 +68,9 @@ class CalibrationPlot:
             preds (torch.Tensor): The prediction likelihoods (<1).
             targets (torch.Tensor): The targets.
         """
-        if preds.ndim == 1:  # binary classification
-            self.conf.append(preds)
-        else:
-            self.conf.append(preds.max(-1).values.cpu())
-
-        if preds.ndim == 1:  # binary classification
-            self.acc.append((preds.round() == targets).cpu())
-        else:
-            self.acc.append((preds.argmax(-1) == targets).cpu())
+        if preds.ndim == 1:  # binary classification, as top-label
+            preds = torch.stack([1 - preds, preds], dim=-1)
+        self.calibration.update(preds, targets)
 
     def compute(self) -> Tuple[Figure, Axes]:
         """Compute and plot the calibration figure.
@@ -83,46 +78,29 @@ class CalibrationPlot:
         Returns:
             Tuple[Figure, Axes]: The figure and axes of the plot.
         """
-        confidence = torch.cat(self.conf)
-        acc = torch.cat(self.acc)
-
-        bin_ids = torch.round(
-            torch.clamp(confidence * self.num_bins, 0, self.num_bins - 1 - 1e-5)
-        )
-        val, inverse, counts = bin_ids.unique(
-            return_inverse=True, return_counts=True
-        )
-        val_oh = torch.nn.functional.one_hot(val.long(), num_classes=10)
-
-        # add 1e-6 to avoid division NaNs
-        values = (
-            val_oh.T.float()
-            @ torch.sum(
-                acc.unsqueeze(1) * torch.nn.functional.one_hot(inverse).float(),
-                0,
-            )
-            / (val_oh.T @ counts + 1e-6).float()
+        counts, _, values, edges = (
+            value.cpu() for value in self.calibration.bins()
         )
-        counts_all = (val_oh.T @ counts).float()
-        total = torch.sum(counts)
+        total = counts.sum()
 
         plt.rc("axes", axisbelow=True)
         fig, ax = plt.subplots(1, figsize=self.figsize)
         ax.hist(
-            x=[self.bin_width * i * 100 for i in range(self.num_bins)],
+            x=edges[:-1] * 100,
             weights=values * 100,
-            bins=[self.bin_width * i * 100 for i in range(self.num_bins + 1)],
+            bins=edges * 100,
             alpha=0.7,
             linewidth=1,
             edgecolor="#0d559f",
             color="#1f77b4",
         )
-        for i, count in enumerate(counts_all):
+        for i, count in enumerate(counts):
             ax.text(
-                3.0 + 9.9 * i,
+                (edges[i] + edges[i + 1]).item() * 50,
                 1,
                 f"{int(count/total*100)}%",
                 fontsize=8,
+                horizontalalignment="center",
             )
 
         ax.plot([0, 100], [0, 100], "--", color="#0d559f")
@@ -151,8 +129,26 @@ class CalibrationPlot:
         return self.compute()
 
 
+def _coarsen(
+    counts: torch.Tensor, edges: torch.Tensor, bins: int
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Merge the fine bins of a histogram spanning its non-empty range into
+    at most :attr:`bins` bins.
+    """
+    nonzero = counts.nonzero().flatten()
+    if nonzero.numel() == 0:
+        return counts[:1], edges[:2]
+    first, last = nonzero[0].item(), nonzero[-1].item() + 1
+    chunks = torch.arange(first, last).tensor_split(min(bins, last - first))
+    coarse = torch.stack([counts[chunk].sum() for chunk in chunks])
+    coarse_edges = torch.tensor(
+        [edges[chunk[0]].item() for chunk in chunks] + [edges[last].item()]
+    )
+    return coarse, coarse_edges
+
+
 def plot_hist(
-    conf: List[torch.Tensor],
+    conf: List[Union[torch.Tensor, Tuple[torch.Tensor, torch.Tensor]]],
     bins: int = 20,
     title: str = "Histogram with 'auto' bins",
     dpi: int = 60,
@@ -160,7 +156,9 @@ def plot_hist(
     """Plot a confidence histogram.
 
     Args:
-        conf (Any): The confidence values.
+        conf (Any): The confidence values, or their histograms as the counts
+            and edges of fine bins, e.g. computed by
+            :class:`~torch_uncertainty.metrics.Histogram`.
         bins (int, optional): The number of bins. Defaults to 20.
         title (str, optional): The title of the plot. Defaults to "Histogram
             with 'auto' bins".
@@ -172,9 +170,17 @@ def plot_hist(
     plt.rc("axes", axisbelow=True)
     fig, ax = plt.subplots(1, figsize=(7, 5), dpi=dpi)
     for i in [1, 0]:
+        if isinstance(conf[i], tuple):
+            counts, edges = _coarsen(*conf[i], bins)
+            values = {
+                "x": edges[:-1].cpu(),
+                "bins": edges.cpu(),
+                "weights": counts.cpu(),
+            }
+        else:
+            values = {"x": conf[i], "bins": bins}
         ax.hist(
-            conf[i],
-            bins=bins,
+            **values,
             density=True,
             label=["In-distribution", "Out-of-Distribution"][i],
             alpha=0.4,
@@ -1,4 +1,5 @@
 # fmt: off
+import math
 from argparse import ArgumentParser, Namespace
 from functools import partial
 from typing import Any, List, Optional, Tuple, Type, Union
@@ -12,29 +13,51 @@ from pytorch_lightning.utilities.memory import get_model_size_mb
 from pytorch_lightning.utilities.types import EPOCH_OUTPUT, STEP_OUTPUT
 from timm.data import Mixup
 from torch import Tensor, nn
-from torchmetrics import Accuracy, CalibrationError, MetricCollection
-from torchmetrics.classification import (
-    BinaryAccuracy,
-    BinaryAUROC,
-    BinaryAveragePrecision,
-    BinaryCalibrationError,
-)
+from torchmetrics import Accuracy, MetricCollection
+from torchmetrics.classification import BinaryAccuracy
 
 from torch_uncertainty.losses import ELBOLoss
 
 from ..metrics import (
-    FPR95,
+    BinnedCalibrationError,
+    BinnedOODCurve,
     BrierScore,
     Disagreement,
     Entropy,
+    Histogram,
     MutualInformation,
     NegativeLogLikelihood,
-    VariationRatio,
+    OODCurve,
+    ood_criteria,
+    ood_scores,
 )
+from ..models.deep_ensembles import _LazyDeepEnsembles
 from ..plotting_utils import CalibrationPlot, plot_hist
 
 
 # fmt:on
+def _ood_metrics(
+    criterion: str, num_classes: int, ood_bins: Optional[int]
+) -> MetricCollection:
+    """The OOD metrics of :attr:`criterion`, exact or approximated from
+    histograms of :attr:`ood_bins` bins spanning the range of its values.
+    """
+    if ood_bins is None:
+        return MetricCollection({"ood": OODCurve(pos_label=1)})
+
+    if criterion == "msp":
+        bounds = (-1.0, 0.0)
+    elif criterion == "logit":
+        bounds = (-100.0, 100.0)
+    elif criterion == "variation_ratio":
+        bounds = (0.0, 1.0)
+    else:  # entropies
+        bounds = (0.0, math.log(max(num_classes, 2)))
+    return MetricCollection(
+        {"ood": BinnedOODCurve(ood_bins, *bounds, pos_label=1)}
+    )
+
+
 class ClassificationSingle(pl.LightningModule):
     """
     Args:
@@ -44,6 +67,10 @@ class ClassificationSingle(pl.LightningModule):
             values as the OOD criterion or not. Defaults to ``False``.
         use_logits (bool, optional): Indicates whether to use the logits as the
             OOD criterion or not. Defaults to ``False``.
+        ood_bins (int, optional): The number of bins of the histograms of the
+            OOD criterion approximating the OOD metrics in memory independent
+            of the number of samples, see :class:`BinnedOODCurve`, or
+            ``None`` to compute them exactly. Defaults to ``None``.
 
     Note:
         The default OOD criterion is the softmax confidence score.
@@ -66,6 +93,7 @@ class ClassificationSingle(pl.LightningModule):
         ood_detection: bool = False,
         use_entropy: bool = False,
         use_logits: bool = False,
+        ood_bins: Optional[int] = None,
         **kwargs,
     ) -> None:
         super().__init__()
@@ -73,6 +101,7 @@ class ClassificationSingle(pl.LightningModule):
         self.save_hyperparameters(
             ignore=[
                 "model",
+                "teacher",
                 "loss",
                 "optimization_procedure",
                 "format_batch_fn",
@@ -86,6 +115,14 @@ class ClassificationSingle(pl.LightningModule):
         self.ood_detection = ood_detection
         self.use_logits = use_logits
         self.use_entropy = use_entropy
+        self.ood_bins = ood_bins
+
+        if self.use_logits:
+            self.ood_criterion = "logit"
+        elif self.use_entropy:
+            self.ood_criterion = "entropy"
+        else:
+            self.ood_criterion = "msp"
 
         self.binary_cls = num_classes == 1
 
@@ -100,7 +137,7 @@ class ClassificationSingle(pl.LightningModule):
             cls_metrics = MetricCollection(
                 {
                     "acc": BinaryAccuracy(),
-                    "ece": BinaryCalibrationError(),
+                    "ece": BinnedCalibrationError(),
                     "brier": BrierScore(num_classes=1),
                 },
                 compute_groups=False,
@@ -112,9 +149,7 @@ class ClassificationSingle(pl.LightningModule):
                     "acc": Accuracy(
                         task="multiclass", num_classes=self.num_classes
                     ),
-                    "ece": CalibrationError(
-                        task="multiclass", num_classes=self.num_classes
-                    ),
+                    "ece": BinnedCalibrationError(),
                     "brier": BrierScore(num_classes=self.num_classes),
                 },
                 compute_groups=False,
@@ -126,17 +161,21 @@ class ClassificationSingle(pl.LightningModule):
         self.test_entropy_id = Entropy()
 
         if self.ood_detection:
-            ood_metrics = MetricCollection(
-                {
-                    "fpr95": FPR95(pos_label=1),
-                    "auroc": BinaryAUROC(),
-                    "aupr": BinaryAveragePrecision(),
-                },
-                compute_groups=[["auroc", "aupr"], ["fpr95"]],
-            )
-            self.test_ood_metrics = ood_metrics.clone(prefix="hp/test_")
+            self.test_ood_metrics = _ood_metrics(
+                self.ood_criterion, num_classes, ood_bins
+            ).clone(prefix="hp/test_")
             self.test_entropy_ood = Entropy()
 
+            # streaming histograms of the maximum logits and likelihoods
+            self.test_id_logit_hist = Histogram(
+                num_bins=2000, min=-100, max=100
+            )
+            self.test_ood_logit_hist = Histogram(
+                num_bins=2000, min=-100, max=100
+            )
+            self.test_id_prob_hist = Histogram()
+            self.test_ood_prob_hist = Histogram()
+
         if mixup_alpha < 0 or cutmix_alpha < 0:
             raise ValueError(
                 "Cutmix alpha and Mixup alpha must be positive."
@@ -185,6 +224,8 @@ class ClassificationSingle(pl.LightningModule):
                     "hp/test_entropy_id": 0,
                     "hp/test_entropy_ood": 0,
                     "hp/test_aupr": 0,
+                    "hp/test_aupr_in": 0,
+                    "hp/test_detection_error": 0,
                     "hp/test_auroc": 0,
                     "hp/test_fpr95": 0,
                 },
@@ -233,7 +274,7 @@ class ClassificationSingle(pl.LightningModule):
         batch: Tuple[Tensor, Tensor],
         batch_idx: int,
         dataloader_idx: Optional[int] = 0,
-    ) -> Tensor:
+    ) -> None:
         inputs, targets = batch
         logits = self.forward(inputs)
 
@@ -252,6 +293,13 @@ class ClassificationSingle(pl.LightningModule):
         else:
             ood_values = -confs
 
+        if self.ood_detection:
+            self._update_hists(
+                logits.max(dim=-1)[0],
+                probs if self.binary_cls else confs,
+                dataloader_idx,
+            )
+
         if dataloader_idx == 0:
             self.test_cls_metrics.update(probs, targets)
             self.test_entropy_id(probs)
@@ -274,7 +322,50 @@ class ClassificationSingle(pl.LightningModule):
                 on_epoch=True,
                 add_dataloader_idx=False,
             )
-        return logits
+
+    def _update_hists(
+        self, max_logits: Tensor, max_probs: Tensor, dataloader_idx: int
+    ) -> None:
+        if dataloader_idx == 0:
+            self.test_id_logit_hist.update(max_logits)
+            self.test_id_prob_hist.update(max_probs)
+        elif dataloader_idx == 1:
+            self.test_ood_logit_hist.update(max_logits)
+            self.test_ood_prob_hist.update(max_probs)
+
+    def _log_hists(self) -> None:
+        """Plot the histograms of the maximum logits and likelihoods if the
+        logger is a TensorBoardLogger, and reset them.
+        """
+        if isinstance(self.logger, TensorBoardLogger):
+            self._plot_hists()
+        for hist in [
+            self.test_id_logit_hist,
+            self.test_ood_logit_hist,
+            self.test_id_prob_hist,
+            self.test_ood_prob_hist,
+        ]:
+            hist.reset()
+
+    def _plot_hists(self) -> None:
+        logits_fig = plot_hist(
+            [
+                self.test_id_logit_hist.compute(),
+                self.test_ood_logit_hist.compute(),
+            ],
+            20,
+            "Histogram of the logits",
+        )[0]
+        probs_fig = plot_hist(
+            [
+                self.test_id_prob_hist.compute(),
+                self.test_ood_prob_hist.compute(),
+            ],
+            20,
+            "Histogram of the likelihoods",
+        )[0]
+        self.logger.experiment.add_figure("Logit Histogram", logits_fig)
+        self.logger.experiment.add_figure("Likelihood Histogram", probs_fig)
 
     def test_epoch_end(
         self, outputs: Union[EPOCH_OUTPUT, List[EPOCH_OUTPUT]]
@@ -295,27 +386,8 @@ class ClassificationSingle(pl.LightningModule):
                 "Calibration Plot", self.cal_plot.compute()[0]
             )
 
-            if self.ood_detection:
-                id_logits = torch.cat(outputs[0], 0).float().cpu()
-                ood_logits = torch.cat(outputs[1], 0).float().cpu()
-
-                id_probs = F.softmax(id_logits, dim=-1)
-                ood_probs = F.softmax(ood_logits, dim=-1)
-
-                logits_fig = plot_hist(
-                    [id_logits.max(-1).values, ood_logits.max(-1).values],
-                    20,
-                    "Histogram of the logits",
-                )[0]
-                probs_fig = plot_hist(
-                    [id_probs.max(-1).values, ood_probs.max(-1).values],
-                    20,
-                    "Histogram of the likelihoods",
-                )[0]
-                self.logger.experiment.add_figure("Logit Histogram", logits_fig)
-                self.logger.experiment.add_figure(
-                    "Likelihood Histogram", probs_fig
-                )
+        if self.ood_detection:
+            self._log_hists()
 
     @staticmethod
     def add_model_specific_args(
@@ -327,6 +399,7 @@ class ClassificationSingle(pl.LightningModule):
         - ``--cutmix``: sets :attr:`cutmix_alpha` for Cutmix
         - ``--entropy``: sets :attr:`use_entropy` to ``True``.
         - ``--logits``: sets :attr:`use_logits` to ``True``.
+        - ``--ood_bins``: sets :attr:`ood_bins`.
         """
         parent_parser.add_argument(
             "--mixup", dest="mixup_alpha", type=float, default=0
@@ -340,6 +413,7 @@ class ClassificationSingle(pl.LightningModule):
         parent_parser.add_argument(
             "--logits", dest="use_logits", action="store_true"
         )
+        parent_parser.add_argument("--ood_bins", type=int, default=None)
         return parent_parser
 
 
@@ -356,6 +430,14 @@ class ClassificationEnsemble(ClassificationSingle):
             information as the OOD criterion or not. Defaults to ``False``.
         use_variation_ratio (bool, optional): Indicates whether to use the
             variation ratio as the OOD criterion or not. Defaults to ``False``.
+        all_ood_criteria (bool, optional): Indicates whether to also evaluate
+            the OOD detection performance of every criterion of
+            :data:`ood_criteria`, logged as ``hp/test_<criterion>_<metric>``.
+            Defaults to ``False``.
+        ood_bins (int, optional): The number of bins of the histograms of the
+            OOD criteria approximating the OOD metrics in memory independent
+            of the number of samples, see :class:`BinnedOODCurve`, or
+            ``None`` to compute them exactly. Defaults to ``None``.
 
     Note:
         The default OOD criterion is the averaged softmax confidence score.
@@ -364,6 +446,11 @@ class ClassificationEnsemble(ClassificationSingle):
         Make sure at most only one of :attr:`use_entropy`, :attr:`use_logits`
         , :attr:`use_mi`, and :attr:`use_variation_ratio` attributes is set to
         ``True``. Otherwise a :class:`ValueError()` will be raised.
+
+    Warning:
+        The lazy Deep Ensembles are rejected with a :class:`ValueError()`:
+        the routine evaluates batch by batch, which would reload their
+        members on every batch. Use their ``predict()`` method instead.
     """
 
     def __init__(
@@ -381,6 +468,8 @@ class ClassificationEnsemble(ClassificationSingle):
         use_logits: bool = False,
         use_mi: bool = False,
         use_variation_ratio: bool = False,
+        all_ood_criteria: bool = False,
+        ood_bins: Optional[int] = None,
         **kwargs,
     ) -> None:
         super().__init__(
@@ -394,9 +483,16 @@ class ClassificationEnsemble(ClassificationSingle):
             ood_detection=ood_detection,
             use_entropy=use_entropy,
             use_logits=use_logits,
+            ood_bins=ood_bins,
             **kwargs,
         )
 
+        if isinstance(model, _LazyDeepEnsembles):
+            raise ValueError(
+                "Lazy Deep Ensembles are evaluated member-major with their "
+                "predict() method, not batch by batch by the routine."
+            )
+
         self.num_estimators = num_estimators
 
         self.use_mi = use_mi
@@ -410,6 +506,31 @@ class ClassificationEnsemble(ClassificationSingle):
         ) > 1:
             raise ValueError("You cannot choose more than one OOD criterion.")
 
+        if self.use_logits:
+            self.ood_criterion = "logit"
+        elif self.use_entropy:
+            self.ood_criterion = "expected_entropy"
+        elif self.use_mi:
+            self.ood_criterion = "mutual_information"
+        elif self.use_variation_ratio:
+            self.ood_criterion = "variation_ratio"
+        else:
+            self.ood_criterion = "msp"
+
+        if self.ood_detection and ood_bins is not None:
+            # the range of the histograms depends on the ensemble criterion
+            self.test_ood_metrics = _ood_metrics(
+                self.ood_criterion, num_classes, ood_bins
+            ).clone(prefix="hp/test_")
+
+        # OOD metrics of every criterion, computed in the same pass
+        self.test_criteria_ood_metrics = nn.ModuleDict()
+        if self.ood_detection and all_ood_criteria:
+            for criterion in ood_criteria:
+                self.test_criteria_ood_metrics[criterion] = _ood_metrics(
+                    criterion, num_classes, ood_bins
+                ).clone(prefix=f"hp/test_{criterion}_")
+
         # metrics for ensembles only
         ens_metrics = MetricCollection(
             {
@@ -441,6 +562,8 @@ class ClassificationEnsemble(ClassificationSingle):
                     "hp/test_entropy_id": 0,
                     "hp/test_entropy_ood": 0,
                     "hp/test_aupr": 0,
+                    "hp/test_aupr_in": 0,
+                    "hp/test_detection_error": 0,
                     "hp/test_auroc": 0,
                     "hp/test_fpr95": 0,
                     "hp/test_id_ens_disagreement": 0,
@@ -478,7 +601,11 @@ class ClassificationEnsemble(ClassificationSingle):
     ) -> None:
         inputs, targets = batch
         logits = self.forward(inputs)
-        logits = rearrange(logits, "(m b) c -> b m c", m=self.num_estimators)
+        # the models may also return the estimators in their own dimension
+        if logits.dim() == 2:
+            logits = rearrange(
+                logits, "(m b) c -> b m c", m=self.num_estimators
+            )
         if self.binary_cls:
             probs_per_est = torch.sigmoid(logits).squeeze(-1)
         else:
@@ -492,10 +619,13 @@ class ClassificationEnsemble(ClassificationSingle):
         batch: Tuple[Tensor, Tensor],
         batch_idx: int,
         dataloader_idx: Optional[int] = 0,
-    ) -> Tensor:
+    ) -> None:
         inputs, targets = batch
         logits = self.forward(inputs)
-        logits = rearrange(logits, "(n b) c -> b n c", n=self.num_estimators)
+        if logits.dim() == 2:
+            logits = rearrange(
+                logits, "(n b) c -> b n c", n=self.num_estimators
+            )
 
         if self.binary_cls:
             probs_per_est = torch.sigmoid(logits)
@@ -504,22 +634,15 @@ class ClassificationEnsemble(ClassificationSingle):
 
         probs = probs_per_est.mean(dim=1)
         self.cal_plot.update(probs, targets)
-        confs = probs.max(-1)[0]
 
-        if self.use_logits:
-            ood_values = -logits.mean(dim=1).max(dim=-1)[0]
-        elif self.use_entropy:
-            ood_values = (
-                torch.special.entr(probs_per_est).sum(dim=-1).mean(dim=1)
+        if self.ood_detection:
+            scores = ood_scores(logits)
+            ood_values = scores[self.ood_criterion]
+            self._update_hists(
+                logits.mean(dim=1).max(dim=-1)[0],
+                probs.max(dim=-1)[0],
+                dataloader_idx,
             )
-        elif self.use_mi:
-            mi_metric = MutualInformation(reduction="none")
-            ood_values = mi_metric(probs_per_est)
-        elif self.use_variation_ratio:
-            vr_metric = VariationRatio(reduction="none", probabilistic=False)
-            ood_values = vr_metric(probs_per_est.transpose(0, 1))
-        else:
-            ood_values = -confs
 
         if dataloader_idx == 0:
             # squeeze if binary classification only for binary metrics
@@ -541,8 +664,12 @@ class ClassificationEnsemble(ClassificationSingle):
                 self.test_ood_metrics.update(
                     ood_values, torch.zeros_like(targets)
                 )
+                for name, metrics in self.test_criteria_ood_metrics.items():
+                    metrics.update(scores[name], torch.zeros_like(targets))
         elif self.ood_detection and dataloader_idx == 1:
             self.test_ood_metrics.update(ood_values, torch.ones_like(targets))
+            for name, metrics in self.test_criteria_ood_metrics.items():
+                metrics.update(scores[name], torch.ones_like(targets))
             self.test_entropy_ood(probs)
             self.test_ood_ens_metrics.update(probs_per_est)
             self.log(
@@ -551,7 +678,6 @@ class ClassificationEnsemble(ClassificationSingle):
                 on_epoch=True,
                 add_dataloader_idx=False,
             )
-        return logits
 
     def test_epoch_end(
         self, outputs: Union[EPOCH_OUTPUT, List[EPOCH_OUTPUT]]
@@ -577,40 +703,17 @@ class ClassificationEnsemble(ClassificationSingle):
             )
             self.test_ood_ens_metrics.reset()
 
+            for metrics in self.test_criteria_ood_metrics.values():
+                self.log_dict(metrics.compute())
+                metrics.reset()
+
         if isinstance(self.logger, TensorBoardLogger):
             self.logger.experiment.add_figure(
                 "Calibration Plot", self.cal_plot.compute()[0]
             )
 
-            if self.ood_detection:
-                id_logits = torch.cat(outputs[0], 0).float().cpu()
-                ood_logits = torch.cat(outputs[1], 0).float().cpu()
-
-                print(id_logits.shape)
-
-                id_probs = F.softmax(id_logits, dim=-1)
-                ood_probs = F.softmax(ood_logits, dim=-1)
-
-                logits_fig = plot_hist(
-                    [
-                        id_logits.mean(1).max(-1).values,
-                        ood_logits.mean(1).max(-1).values,
-                    ],
-                    20,
-                    "Histogram of the logits",
-                )[0]
-                probs_fig = plot_hist(
-                    [
-                        id_probs.mean(1).max(-1).values,
-                        ood_probs.mean(1).max(-1).values,
-                    ],
-                    20,
-                    "Histogram of the likelihoods",
-                )[0]
-                self.logger.experiment.add_figure("Logit Histogram", logits_fig)
-                self.logger.experiment.add_figure(
-                    "Likelihood Histogram", probs_fig
-                )
+        if self.ood_detection:
+            self._log_hists()
 
     @staticmethod
     def add_model_specific_args(
@@ -622,6 +725,7 @@ class ClassificationEnsemble(ClassificationSingle):
         - ``--logits``: sets :attr:`use_logits` to ``True``.
         - ``--mutual_information``: sets :attr:`use_mi` to ``True``.
         - ``--variation_ratio``: sets :attr:`use_variation_ratio` to ``True``.
+        - ``--all_ood_criteria``: sets :attr:`all_ood_criteria` to ``True``.
         - ``--num_estimators``: sets :attr:`num_estimators`.
         """
         parent_parser = ClassificationSingle.add_model_specific_args(
@@ -643,6 +747,11 @@ class ClassificationEnsemble(ClassificationSingle):
             action="store_true",
             default=False,
         )
+        parent_parser.add_argument(
+            "--all_ood_criteria",
+            action="store_true",
+            default=False,
+        )
         parent_parser.add_argument(
             "--num_estimators",
             type=int,
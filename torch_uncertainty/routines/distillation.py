@@ -0,0 +1,301 @@
+# fmt: off
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any, Literal, Tuple, Type, Union
+
+import torch
+import torch.nn.functional as F
+from einops import rearrange
+from pytorch_lightning.utilities.types import STEP_OUTPUT
+from timm.data import Mixup
+from torch import Tensor, nn
+from torch.utils.data import DataLoader, Dataset
+
+import numpy as np
+
+from .classification import ClassificationSingle
+
+# fmt: on
+matchings = ("probs", "logits")
+
+
+def teacher_targets(
+    logits: Tensor,
+    batch_size: int,
+    matching: Literal["probs", "logits"] = "probs",
+    temperature: float = 1.0,
+) -> Tensor:
+    """Aggregate the outputs of an ensemble teacher into the targets of its
+    student.
+
+    Args:
+        logits (Tensor): The logits of the teacher, of shape :math:`(B, N, C)`
+            like Deep Ensembles, :math:`((N B), C)` like Packed-Ensembles and
+            BatchEnsemble, or :math:`(B, C)` for a single model.
+        batch_size (int): The batch size :math:`B`.
+        matching (str, optional): ``"probs"`` for the mean of the tempered
+            probabilities of the members, ``"logits"`` for the mean of their
+            logits. Defaults to ``"probs"``.
+        temperature (float, optional): The temperature of the probabilities.
+            Defaults to 1.0.
+
+    Returns:
+        Tensor: The targets of shape :math:`(B, C)`.
+    """
+    if logits.dim() == 2:
+        logits = rearrange(logits, "(n b) c -> b n c", b=batch_size)
+    if matching == "logits":
+        return logits.mean(dim=1)
+    return F.softmax(logits / temperature, dim=-1).mean(dim=1)
+
+
+class _TeacherTargetsDataset(Dataset):
+    """Wrap a classification dataset to also return the cached targets of
+    the teacher, read from a memory-mapped ``.npy`` file.
+    """
+
+    def __init__(self, dataset: Dataset, path: Path) -> None:
+        self.dataset = dataset
+        self.path = path
+        self._targets = None
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    def __getitem__(self, index: int) -> Tuple[Any, Any, Tensor]:
+        # opened lazily, once per dataloader worker
+        if self._targets is None:
+            self._targets = np.load(self.path, mmap_mode="r")
+        input, target = self.dataset[index]
+        return input, target, torch.from_numpy(np.array(self._targets[index]))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_targets"] = None
+        return state
+
+
+@torch.no_grad()
+def cache_teacher_targets(
+    teacher: nn.Module,
+    dataset: Dataset,
+    path: Union[str, Path],
+    matching: Literal["probs", "logits"] = "probs",
+    temperature: float = 1.0,
+    batch_size: int = 128,
+) -> Dataset:
+    """Compute the targets of the teacher on a dataset once, store them in a
+    memory-mapped ``.npy`` file and return the dataset yielding them along
+    with its samples, for :class:`ClassificationDistillation`.
+
+    The targets are computed on the samples as transformed at caching time:
+    they are exact for deterministic transforms only.
+
+    Args:
+        teacher (nn.Module): The ensemble.
+        dataset (Dataset): The training dataset.
+        path (Union[str, Path]): The path of the ``.npy`` file.
+        matching (str, optional): See :func:`teacher_targets`. Must match
+            the routine's. Defaults to ``"probs"``.
+        temperature (float, optional): See :func:`teacher_targets`. Must
+            match the routine's. Defaults to 1.0.
+        batch_size (int, optional): The batch size. Defaults to 128.
+
+    Returns:
+        Dataset: The dataset yielding ``(input, target, teacher_target)``.
+
+    Raises:
+        ValueError: If :attr:`dataset` is empty.
+    """
+    if len(dataset) == 0:
+        raise ValueError("Cannot cache the targets of an empty dataset.")
+    teacher.eval()
+    device = next(teacher.parameters()).device
+    targets, start = None, 0
+    for inputs, _ in DataLoader(dataset, batch_size=batch_size):
+        batch_targets = teacher_targets(
+            teacher(inputs.to(device)), inputs.size(0), matching, temperature
+        ).cpu()
+        if targets is None:
+            targets = np.lib.format.open_memmap(
+                path,
+                mode="w+",
+                dtype=np.float32,
+                shape=(len(dataset), batch_targets.size(-1)),
+            )
+        targets[start : start + inputs.size(0)] = batch_targets.numpy()
+        start += inputs.size(0)
+    targets.flush()
+    return _TeacherTargetsDataset(dataset, Path(path))
+
+
+class ClassificationDistillation(ClassificationSingle):
+    """
+    Distill an ensemble into a single student model. The student is trained
+    to match the mean tempered probabilities or the mean logits of the
+    members of the teacher, and evaluated as a :class:`ClassificationSingle`.
+
+    Args:
+        teacher (nn.Module): The trained ensemble, e.g. a Deep Ensembles or a
+            :class:`ClassificationEnsemble`. It is neither trained nor saved
+            in the checkpoints of the student.
+        matching (str, optional): ``"probs"`` to minimize the KL divergence
+            between the tempered probabilities of the teacher and of the
+            student, ``"logits"`` to minimize the squared error between their
+            logits. Defaults to ``"probs"``.
+        temperature (float, optional): The temperature of the probabilities.
+            Defaults to 1.0.
+        distill_weight (float, optional): The weight of the distillation loss,
+            the loss on the labels being weighted by ``1 - distill_weight``.
+            Defaults to 1.0.
+        ood_detection (bool, optional): Indicates whether to evaluate the OOD
+            detection performance or not. Defaults to ``False``.
+        use_entropy (bool, optional): Indicates whether to use the entropy
+            values as the OOD criterion or not. Defaults to ``False``.
+        use_logits (bool, optional): Indicates whether to use the logits as the
+            OOD criterion or not. Defaults to ``False``.
+
+    Note:
+        The teacher is run on each training batch, unless the batches also
+        contain its targets, as the datasets returned by
+        :func:`cache_teacher_targets`. Mixup and CutMix are applied before
+        the teacher, and hence require it to run online.
+
+    Reference:
+        Geoffrey Hinton, Oriol Vinyals, and Jeff Dean. Distilling the
+        knowledge in a neural network. In NeurIPS Workshops, 2014.
+    """
+
+    def __init__(
+        self,
+        num_classes: int,
+        model: nn.Module,
+        teacher: nn.Module,
+        loss: Type[nn.Module],
+        optimization_procedure: Any,
+        format_batch_fn: nn.Module = nn.Identity(),
+        matching: Literal["probs", "logits"] = "probs",
+        temperature: float = 1.0,
+        distill_weight: float = 1.0,
+        ood_detection: bool = False,
+        use_entropy: bool = False,
+        use_logits: bool = False,
+        **kwargs,
+    ) -> None:
+        super().__init__(
+            num_classes=num_classes,
+            model=model,
+            loss=loss,
+            optimization_procedure=optimization_procedure,
+            format_batch_fn=format_batch_fn,
+            ood_detection=ood_detection,
+            use_entropy=use_entropy,
+            use_logits=use_logits,
+            **kwargs,
+        )
+
+        if self.binary_cls:
+            raise ValueError("Distillation requires at least two classes.")
+        if matching not in matchings:
+            raise ValueError(
+                f"matching must be one of {matchings}. Got {matching}."
+            )
+        if temperature <= 0:
+            raise ValueError(
+                f"temperature must be positive. Got {temperature}."
+            )
+        if not 0 <= distill_weight <= 1:
+            raise ValueError(
+                f"distill_weight must be in [0, 1]. Got {distill_weight}."
+            )
+
+        # out of the module tree: neither optimized, saved, nor measured
+        self._teacher = [teacher.requires_grad_(False)]
+        self.matching = matching
+        self.temperature = temperature
+        self.distill_weight = distill_weight
+
+    @property
+    def teacher(self) -> nn.Module:
+        return self._teacher[0]
+
+    def _teacher_to_device(self) -> None:
+        # out of the module tree, the teacher is not moved with the student
+        self.teacher.to(self.device)
+
+    def on_fit_start(self) -> None:
+        self._teacher_to_device()
+
+    def on_validation_start(self) -> None:
+        self._teacher_to_device()
+
+    def on_test_start(self) -> None:
+        self._teacher_to_device()
+
+    def distillation_loss(self, logits: Tensor, targets: Tensor) -> Tensor:
+        """The loss between the logits of the student and the targets of the
+        teacher, scaled by the squared temperature for probabilities.
+        """
+        if self.matching == "logits":
+            return F.mse_loss(logits, targets)
+        log_probs = F.log_softmax(logits / self.temperature, dim=-1)
+        return (
+            F.kl_div(log_probs, targets, reduction="batchmean")
+            * self.temperature**2
+        )
+
+    def training_step(
+        self,
+        batch: Union[Tuple[Tensor, Tensor], Tuple[Tensor, Tensor, Tensor]],
+        batch_idx: int,
+    ) -> STEP_OUTPUT:
+        if len(batch) == 3:
+            if isinstance(self.mixup, Mixup):
+                raise ValueError(
+                    "Mixup and CutMix require the online teacher: the cached "
+                    "targets are those of the unmixed inputs."
+                )
+            inputs, targets = self.format_batch_fn(tuple(batch[:2]))
+            distill_targets = batch[2]
+        else:
+            inputs, targets = self.format_batch_fn(self.mixup(*batch))
+            self.teacher.eval()
+            with torch.no_grad():
+                distill_targets = teacher_targets(
+                    self.teacher(inputs),
+                    inputs.size(0),
+                    self.matching,
+                    self.temperature,
+                )
+
+        logits = self.forward(inputs)
+        loss = self.distill_weight * self.distillation_loss(
+            logits, distill_targets
+        )
+        if self.distill_weight < 1:
+            loss = loss + (1 - self.distill_weight) * self.criterion(
+                logits, targets
+            )
+        self.log("train_loss", loss)
+        return loss
+
+    @staticmethod
+    def add_model_specific_args(
+        parent_parser: ArgumentParser,
+    ) -> ArgumentParser:
+        """Defines the routine's attributes via command-line options, those
+        of :meth:`ClassificationSingle.add_model_specific_args` and:
+
+        - ``--matching``: sets :attr:`matching`.
+        - ``--temperature``: sets :attr:`temperature`.
+        - ``--distill_weight``: sets :attr:`distill_weight`.
+        """
+        parent_parser = ClassificationSingle.add_model_specific_args(
+            parent_parser
+        )
+        parent_parser.add_argument(
+            "--matching", type=str, choices=matchings, default="probs"
+        )
+        parent_parser.add_argument("--temperature", type=float, default=1.0)
+        parent_parser.add_argument("--distill_weight", type=float, default=1.0)
+        return parent_parser
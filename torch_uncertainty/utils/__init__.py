@@ -1,3 +1,9 @@
 # flake8: noqa
-from .checkpoints import get_version
+from .checkpoints import (
+    checkpoint_to_mmap,
+    get_version,
+    load_mmap_state_dict,
+    load_state_dicts,
+    save_mmap_state_dict,
+)
 from .hub import load_hf
@@ -1,9 +1,19 @@
 # fmt: off
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
+import torch
+from torch import Tensor, nn
 
 # fmt: on
+_MMAP_ALIGNMENT = 64
+
+
 def get_version(
     root: Union[str, Path], version: int, checkpoint: Union[int, None] = None
 ) -> Tuple[Path, Path]:
@@ -11,6 +21,9 @@ def get_version(
     Find a compute the path to the checkpoint corresponding to the input
         parameters
 
+    If several checkpoints match, the one of the latest epoch (and step) is
+    chosen, and ``last.ckpt`` only if there is no epoch checkpoint.
+
     Args:
         root (Union[str, Path]): The root of the dataset containing the
             checkpoints.
@@ -19,7 +32,7 @@ def get_version(
             to None.
 
     Raises:
-        Exception: if the checkpoint cannot be found.
+        Exception: if the version or the checkpoint cannot be found.
 
     Returns:
         Tuple[Path, Path]: The path to the checkpoints and to its parameters.
@@ -39,5 +52,166 @@ def get_version(
             f"The directory {root}/version_{version} does not exist."
         )
 
-    file = ckpts[0]
+    if not ckpts:
+        raise Exception(f"No checkpoint found in {ckpt_folder}.")
+    file = max(ckpts, key=_checkpoint_order)
     return (file.resolve(), (version_folder / "hparams.yaml").resolve())
+
+
+def _checkpoint_order(path: Path) -> Tuple[int, ...]:
+    """Sort key of the checkpoints: epoch checkpoints by epoch and step, after
+    the other ones.
+    """
+    match = re.match(r"epoch=(\d+)(?:-step=(\d+))?", path.stem)
+    if match is None:
+        return (0,)
+    return (1, int(match.group(1)), int(match.group(2) or 0))
+
+
+def _load_state_dict(
+    checkpoint: Union[str, Path], prefix: str
+) -> Dict[str, Tensor]:
+    """Read the state dict of a Lightning checkpoint, keeping the keys
+    starting with :attr:`prefix` and stripping it.
+    """
+    state_dict = torch.load(checkpoint, map_location="cpu")["state_dict"]
+    return {
+        name[len(prefix) :]: tensor
+        for name, tensor in state_dict.items()
+        if name.startswith(prefix)
+    }
+
+
+def load_state_dicts(
+    models: List[nn.Module],
+    checkpoints: List[Union[str, Path]],
+    prefix: str = "model.",
+    num_workers: Optional[int] = None,
+) -> List[float]:
+    """Load the state dicts of Lightning checkpoints into already built
+    models, in parallel threads, without instantiating the LightningModules.
+
+    Args:
+        models (List[nn.Module]): The models to load.
+        checkpoints (List[Union[str, Path]]): The paths to the Lightning
+            checkpoints, one per model.
+        prefix (str, optional): The prefix of the keys of the models in the
+            state dicts of the checkpoints. Defaults to ``"model."``.
+        num_workers (int, optional): The number of threads. Defaults to the
+            default of :class:`concurrent.futures.ThreadPoolExecutor`.
+
+    Raises:
+        ValueError: If there are not as many checkpoints as models.
+
+    Returns:
+        List[float]: The loading time of each model, in seconds.
+    """
+    if len(models) != len(checkpoints):
+        raise ValueError(
+            f"Got {len(checkpoints)} checkpoints for {len(models)} models."
+        )
+
+    def load(model: nn.Module, checkpoint: Union[str, Path]) -> float:
+        start = time.perf_counter()
+        model.load_state_dict(_load_state_dict(checkpoint, prefix))
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(num_workers) as pool:
+        return list(pool.map(load, models, checkpoints))
+
+
+def save_mmap_state_dict(
+    state_dict: Dict[str, Tensor], path: Union[str, Path]
+) -> None:
+    """Save a state dict in a flat file that can be memory-mapped by
+    :func:`load_mmap_state_dict`.
+
+    The file starts with the length of a JSON header giving the dtype, the
+    shape and the offset of each tensor, followed by the raw tensor data
+    aligned on 64 bytes.
+
+    Args:
+        state_dict (Dict[str, Tensor]): The tensors to save.
+        path (Union[str, Path]): The path of the file.
+    """
+    tensors, header, end = [], {}, 0
+    for name, tensor in state_dict.items():
+        tensor = tensor.detach().cpu().contiguous()
+        offset = -(-end // _MMAP_ALIGNMENT) * _MMAP_ALIGNMENT
+        header[name] = (str(tensor.dtype), list(tensor.shape), offset)
+        tensors.append((offset, tensor))
+        end = offset + tensor.numel() * tensor.element_size()
+    header = json.dumps(header).encode()
+    start = -(-(8 + len(header)) // _MMAP_ALIGNMENT) * _MMAP_ALIGNMENT
+
+    path = Path(path)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for offset, tensor in tensors:
+            f.seek(start + offset)
+            f.write(tensor.reshape(-1).view(torch.uint8).numpy().tobytes())
+        f.truncate(start + end)
+    os.replace(tmp_path, path)
+
+
+def load_mmap_state_dict(path: Union[str, Path]) -> Dict[str, Tensor]:
+    """Memory-map a state dict saved by :func:`save_mmap_state_dict`.
+
+    The tensors are views of a private, copy-on-write mapping of the file:
+    their pages are only read from the disk when accessed and are released
+    with the tensors.
+
+    Args:
+        path (Union[str, Path]): The path of the file.
+
+    Returns:
+        Dict[str, Tensor]: The memory-mapped state dict.
+    """
+    size = os.path.getsize(path)
+    storage = torch.from_file(
+        str(path), shared=False, size=size, dtype=torch.uint8
+    )
+    header_size = int.from_bytes(storage[:8].numpy().tobytes(), "little")
+    header = json.loads(storage[8 : 8 + header_size].numpy().tobytes())
+    start = -(-(8 + header_size) // _MMAP_ALIGNMENT) * _MMAP_ALIGNMENT
+
+    state_dict = {}
+    for name, (dtype, shape, offset) in header.items():
+        dtype = getattr(torch, dtype.split(".")[-1])
+        numel = 1
+        for dim in shape:
+            numel *= dim
+        nbytes = numel * torch.empty(0, dtype=dtype).element_size()
+        data = storage[start + offset : start + offset + nbytes]
+        state_dict[name] = data.view(dtype).view(shape)
+    return state_dict
+
+
+def checkpoint_to_mmap(
+    checkpoint: Union[str, Path],
+    path: Union[str, Path, None] = None,
+    prefix: str = "model.",
+) -> Path:
+    """Convert the state dict of a Lightning checkpoint to a file that can be
+    memory-mapped by :func:`load_mmap_state_dict`. The conversion is skipped
+    if the converted file is more recent than the checkpoint.
+
+    Args:
+        checkpoint (Union[str, Path]): The path to the Lightning checkpoint.
+        path (Union[str, Path], optional): The path of the converted file.
+            Defaults to the path of the checkpoint with a ``.mmap`` suffix.
+        prefix (str, optional): The prefix of the keys to keep, which is
+            stripped from the keys. Defaults to ``"model."``.
+
+    Returns:
+        Path: The path of the converted file.
+    """
+    checkpoint = Path(checkpoint)
+    path = checkpoint.with_suffix(".mmap") if path is None else Path(path)
+    if path.exists() and path.stat().st_mtime >= checkpoint.stat().st_mtime:
+        return path
+
+    save_mmap_state_dict(_load_state_dict(checkpoint, prefix), path)
+    return path